@@ -0,0 +1,70 @@
+"""
+Benchmark scanning game updates stored as Parquet against re-parsing them from NDJSON.
+
+Run from the repository root (requires pyarrow):
+
+    python -m benchmarks.bench_columnar [count]
+"""
+import random
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import pyarrow.compute as pc
+
+from blaseball_mike.chronicler import read_ndjson, write_ndjson
+from blaseball_mike.chronicler import columnar
+
+
+def game_updates(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        game = f"game-{i // 300}"
+        yield {
+            "gameId": game,
+            "timestamp": f"2021-03-{1 + i // 100000:02d}T16:00:{i % 60:02d}.000Z",
+            "hash": f"hash-{i}",
+            "data": {
+                "id": game,
+                "season": 11,
+                "day": i // 3000,
+                "inning": rng.randrange(9),
+                "homeScore": rng.randrange(12),
+                "awayScore": rng.randrange(12),
+                "homeTeam": f"team-{rng.randrange(24)}",
+                "awayTeam": f"team-{rng.randrange(24)}",
+                "lastUpdate": "Someone hits a Single! " * rng.randrange(1, 3),
+                "baseRunners": [f"player-{rng.randrange(500)}" for _ in range(rng.randrange(4))],
+                "topOfInning": rng.random() < 0.5,
+                "homeOdds": rng.random(),
+                "state": {"holidayInning": False},
+            },
+        }
+
+
+def main(count=200000, repeat=3):
+    with tempfile.TemporaryDirectory() as tmp:
+        ndjson = Path(tmp) / "updates.ndjson.gz"
+        parquet = Path(tmp) / "updates"
+        write_ndjson(ndjson, game_updates(count))
+        columnar.write_parquet(game_updates(count), parquet)
+
+        def scan_json():
+            return max(u["data"]["homeScore"] for u in read_ndjson(ndjson))
+
+        def scan_parquet():
+            return pc.max(columnar.read_parquet(parquet, columns=["home_score"])["home_score"]).as_py()
+
+        def best(func):
+            return min(timeit.repeat(func, number=1, repeat=repeat))
+
+        assert scan_json() == scan_parquet()
+        size = sum(p.stat().st_size for p in parquet.rglob("*.parquet"))
+        print(f"{count} game updates (best of {repeat})")
+        print(f"  NDJSON max(home_score):   {best(scan_json) * 1000:.1f}ms ({ndjson.stat().st_size / 1e6:.1f}MB)")
+        print(f"  Parquet max(home_score):  {best(scan_parquet) * 1000:.1f}ms ({size / 1e6:.1f}MB)")
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]])
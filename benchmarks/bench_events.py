@@ -0,0 +1,82 @@
+"""
+Benchmark applying event stream deltas with `blaseball_mike.events.apply_patch` against `jsonpatch`.
+
+Run from the repository root, with a `FrameRecorder` file, or without one to generate game updates for the stream data
+recorded in the test cassettes:
+
+    python -m benchmarks.bench_events [frames.gz]
+"""
+import copy
+import random
+import sys
+import time
+
+import jsonpatch
+
+from blaseball_mike import events
+
+
+def game_frames(value, count, seed=0):
+    """Deltas like those sent while games are in progress, updating every game in the schedule each frame"""
+    rng = random.Random(seed)
+    games = value["games"]["schedule"]
+    runners = [list(game["baseRunners"]) for game in games]
+    for i in range(count):
+        ops = []
+        for index, game in enumerate(games):
+            path = f"/games/schedule/{index}"
+            ops.extend({"op": "replace", "path": f"{path}/{field}", "value": rng.randrange(10)}
+                       for field in ("awayScore", "homeScore", "halfInningOuts", "atBatBalls", "atBatStrikes"))
+            ops.append({"op": "replace", "path": f"{path}/lastUpdate", "value": f"Update {i}"})
+            ops.append({"op": "replace", "path": f"{path}/playCount", "value": i})
+            ops.append({"op": "replace", "path": f"{path}/topOfInning", "value": i % 2 == 0})
+            if runners[index] and rng.random() < 0.3:
+                runners[index].pop()
+                ops.append({"op": "remove", "path": f"{path}/baseRunners/{len(runners[index])}"})
+            elif len(runners[index]) < 3:
+                runners[index].append(f"player-{i}")
+                ops.append({"op": "add", "path": f"{path}/baseRunners/-", "value": f"player-{i}"})
+        ops.append({"op": "replace", "path": "/games/sim/nextPhaseTime", "value": f"2021-03-01T16:{i % 60:02d}:00Z"})
+        yield {"delta": ops}
+
+
+def generated_frames(count=500):
+    from tests.helpers import load_stream_value
+    value = load_stream_value()
+    return [{"value": value}] + list(game_frames(copy.deepcopy(value), count))
+
+
+def recorded_frames(path):
+    frames = [frame for _, frame in events.read_frames(path)]
+    start = next(i for i, frame in enumerate(frames) if "value" in frame)
+    return frames[start:]
+
+
+def main(path=None, repeat=3):
+    frames = recorded_frames(path) if path else generated_frames()
+
+    def run(apply):
+        best = None
+        for _ in range(repeat):
+            docs = [copy.deepcopy(frame["value"]) if "value" in frame else None for frame in frames]
+            start = time.perf_counter()
+            doc = None
+            for frame, value in zip(frames, docs):
+                doc = value if value is not None else apply(doc, frame["delta"])
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return doc, best
+
+    expected, library = run(lambda doc, ops: jsonpatch.apply_patch(doc, ops, in_place=True))
+    result, fast = run(events.apply_patch)
+    assert result == expected
+
+    deltas = [frame["delta"] for frame in frames if "delta" in frame]
+    ops = sum(len(delta) for delta in deltas)
+    print(f"{len(deltas)} delta frames, {ops} operations (best of {repeat})")
+    print(f"  jsonpatch.apply_patch:  {library * 1000:.1f}ms ({library / ops * 1e6:.2f}us/op)")
+    print(f"  events.apply_patch:     {fast * 1000:.1f}ms ({fast / ops * 1e6:.2f}us/op)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,56 @@
+"""
+Benchmark league-wide rating calculations with `PlayerFrame` against per-player calculations.
+
+Run from the repository root (requires NumPy):
+
+    python -m benchmarks.bench_frames [count]
+"""
+import sys
+import timeit
+
+from blaseball_mike.frames import PlayerFrame
+from blaseball_mike.models import Player
+
+from .bench_models import player_dump
+
+
+def per_player(players):
+    return [(p.get_hitting_stars(), p.get_pitching_stars(), p.get_baserunning_stars(), p.get_defense_stars())
+            for p in players]
+
+
+def main(count=30000, repeat=5):
+    records = player_dump(count)
+    players = [Player(x) for x in records]
+    frame = PlayerFrame.from_records(records)
+
+    def best(func):
+        return min(timeit.repeat(func, number=1, repeat=repeat))
+
+    print(f"{count} player versions (best of {repeat})")
+    print(f"  Player stars:       {best(lambda: per_player(players)) * 1000:.1f}ms")
+    print(f"  PlayerFrame stars:  {best(frame.stars) * 1000:.1f}ms")
+    print(f"  PlayerFrame build:  {best(lambda: PlayerFrame.from_records(records)) * 1000:.1f}ms")
+
+    days = range(1, 100)
+    sample = players[:1000]
+    print(f"{len(sample)} players x {len(days)} days of vibes (best of {repeat})")
+    print(f"  Player.get_vibe:    {best(lambda: [[p.get_vibe(d) for d in days] for p in sample]) * 1000:.1f}ms")
+    sample_frame = PlayerFrame.from_players(sample)
+    print(f"  PlayerFrame vibes:  {best(lambda: sample_frame.get_vibes(days)) * 1000:.1f}ms")
+
+    scenarios = [{"multipliers": {"overall_rating": m / 100}} for m in range(1, 21)] + \
+                [{"buffs": {"batting_rating": b / 100}, "reroll": {"cinnamon": True}} for b in range(1, 21)]
+    sample = players[:250]
+    sample_frame = PlayerFrame.from_players(sample)
+
+    def copies():
+        return [[p.simulated_copy(**x).get_hitting_rating() for p in sample] for x in scenarios]
+
+    print(f"{len(sample)} players x {len(scenarios)} scenarios (best of {repeat})")
+    print(f"  simulated_copy:     {best(copies) * 1000:.1f}ms")
+    print(f"  simulate_scenarios: {best(lambda: sample_frame.simulate_scenarios(scenarios, seed=1)) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]])
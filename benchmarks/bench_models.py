@@ -0,0 +1,59 @@
+"""
+Benchmark model construction and serialization on a full player dump.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_models [count]
+"""
+import sys
+import timeit
+import tracemalloc
+
+from blaseball_mike.models import Player, enable_compact_models, disable_compact_models
+
+
+def player_dump(count):
+    """Generate `count` player records shaped like a `/database/players` response"""
+    records = []
+    for i in range(count):
+        data = Player.make_random(name=f"Player {i}", seed=i + 1).json()
+        data.update({
+            "permAttr": ["FIREPROOF"], "seasAttr": [], "weekAttr": [], "gameAttr": [], "itemAttr": [],
+            "leagueTeamId": "8d87c468-699a-47a8-b40d-cfb73a5660ad", "tournamentTeamId": None,
+            "items": [], "state": {}, "hitStreak": 0, "consecutiveHits": 0,
+        })
+        records.append(data)
+    return records
+
+
+def model_memory(records):
+    """Bytes allocated to hold models built from `records`"""
+    tracemalloc.start()
+    players = [Player(x) for x in records]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del players
+    return size
+
+
+def main(count=20000, repeat=5):
+    records = player_dump(count)
+    players = [Player(x) for x in records]
+
+    load = min(timeit.repeat(lambda: [Player(x) for x in records], number=1, repeat=repeat))
+    dump = min(timeit.repeat(lambda: [p.json() for p in players], number=1, repeat=repeat))
+    print(f"{count} players, {len(records[0])} fields each (best of {repeat})")
+    print(f"  construct: {load:.3f}s ({load / count * 1e6:.1f}us per player)")
+    print(f"  json():    {dump:.3f}s ({dump / count * 1e6:.1f}us per player)")
+
+    default = model_memory(records)
+    enable_compact_models()
+    try:
+        compact = model_memory(records)
+    finally:
+        disable_compact_models()
+    print(f"  memory:    {default / count:.0f} bytes per player, {compact / count:.0f} bytes compact")
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]])
@@ -0,0 +1,875 @@
+"""
+Asyncio wrappers for the Official Blaseball API
+
+Every function mirrors its counterpart in `blaseball_mike.database`, taking the same arguments and returning the same
+data, but is a coroutine that shares a single pooled `aiohttp.ClientSession`. This makes it cheap to fan out many
+requests at once:
+
+>>> players, team = await asyncio.gather(get_player(player_ids), get_team(team_id))
+
+Lists of IDs are split into batches the same way as in `blaseball_mike.database`, with the batches requested
+concurrently. Call `close()` before the event loop shuts down to release pooled connections.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from json.decoder import JSONDecodeError
+
+import aiohttp
+
+from blaseball_mike import database, metrics, ratelimit
+from blaseball_mike.database import BASE_URL, BASE_GITHUB, CONFIG_S3_URL
+from blaseball_mike.session import cache_expiry, TIMESTAMP_FORMAT
+
+_SESSION = None
+_SESSION_LOOP = None
+_SESSION_CONFIG = {"limit": 20, "limit_per_host": 0, "timeout": 60, "cache_size": 1024}
+_RESPONSE_CACHE = OrderedDict()
+_IN_FLIGHT = {}
+
+
+def configure(limit=20, limit_per_host=0, timeout=60, cache_size=1024):
+    """
+    Configure the pooled session. Takes effect the next time a session is created, so call this before making any
+    requests (or after `close()`).
+
+    Args:
+        limit: maximum number of simultaneous connections, or 0 for unlimited
+        limit_per_host: maximum number of simultaneous connections to a single host, or 0 for unlimited
+        timeout: total timeout for a single request in seconds
+        cache_size: maximum number of responses to cache, least recently used responses are evicted first
+    """
+    _SESSION_CONFIG["limit"] = limit
+    _SESSION_CONFIG["limit_per_host"] = limit_per_host
+    _SESSION_CONFIG["timeout"] = timeout
+    _SESSION_CONFIG["cache_size"] = cache_size
+
+
+async def session():
+    """Get the pooled HTTP session for the running event loop"""
+    global _SESSION, _SESSION_LOOP
+
+    loop = asyncio.get_running_loop()
+    if _SESSION is None or _SESSION.closed or _SESSION_LOOP is not loop:
+        connector = aiohttp.TCPConnector(limit=_SESSION_CONFIG["limit"],
+                                         limit_per_host=_SESSION_CONFIG["limit_per_host"])
+        timeout = aiohttp.ClientTimeout(total=_SESSION_CONFIG["timeout"])
+        _SESSION = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        _SESSION_LOOP = loop
+    return _SESSION
+
+
+async def close():
+    """Close the pooled HTTP session and clear the response cache"""
+    global _SESSION
+
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+    _RESPONSE_CACHE.clear()
+
+
+def _parse_json(text):
+    try:
+        return json.loads(text)
+    except JSONDecodeError:
+        raise ValueError("Network response is not valid JSON")
+
+
+def _cache_lookup(key):
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is None:
+        return None
+    expires, text = entry
+    if expires is not None and expires <= time.monotonic():
+        del _RESPONSE_CACHE[key]
+        return None
+    _RESPONSE_CACHE.move_to_end(key)
+    return text
+
+
+def _cache_store(key, text, cache_time):
+    expires = None if cache_time is None else time.monotonic() + cache_time
+    _RESPONSE_CACHE[key] = (expires, text)
+    _RESPONSE_CACHE.move_to_end(key)
+    while len(_RESPONSE_CACHE) > _SESSION_CONFIG["cache_size"]:
+        _RESPONSE_CACHE.popitem(last=False)
+
+
+async def _request(s, url, params):
+    start = time.perf_counter()
+    try:
+        async with s.get(url, params=params) as res:
+            body = await res.read()
+    except Exception as e:
+        metrics.record("GET", url, None, time.perf_counter() - start, 0, error=type(e).__name__)
+        raise
+    return res, body, start
+
+
+async def _fetch(url, params):
+    s = await session()
+    limit = ratelimit.rate_limit_for(url)
+    if limit is None:
+        res, body, start = await _request(s, url, params)
+    else:
+        async with limit.limit_async():
+            res, body, start = await _request(s, url, params)
+
+    metrics.record("GET", str(res.url), res.status, time.perf_counter() - start, len(body))
+    res.raise_for_status()
+    return body.decode(res.get_encoding())
+
+
+async def _get(url, params=None, cache_time=5):
+    """
+    GET a JSON response, serving it from the response cache if possible. Concurrent requests for the same URL share
+    a single network request. Responses are cached as text so every caller gets its own copy of the data.
+    """
+    cache_time = cache_expiry(cache_time)
+
+    key = (url, tuple(sorted((params or {}).items())))
+    if cache_time != 0:
+        text = _cache_lookup(key)
+        if text is not None:
+            metrics.record("GET", url, 200, 0.0, len(text), from_cache=True)
+            return _parse_json(text)
+
+    task = _IN_FLIGHT.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch(url, params))
+        _IN_FLIGHT[key] = task
+
+        def done(t):
+            if _IN_FLIGHT.get(key) is t:
+                del _IN_FLIGHT[key]
+        task.add_done_callback(done)
+
+    text = await asyncio.shield(task)
+    if cache_time != 0:
+        _cache_store(key, text, cache_time)
+    return _parse_json(text)
+
+
+async def _get_by_ids(path, ids, cache_time, unique=False):
+    """
+    Request an endpoint taking a list of IDs in concurrent batches, returning the combined list of results. `unique`
+    drops duplicate IDs, as in `blaseball_mike.database`.
+    """
+    results = await asyncio.gather(*(_get(f'{BASE_URL}{path}?ids={batch}', cache_time=cache_time)
+                                     for batch in database._id_batches(ids, unique)))
+    if len(results) == 1:
+        return results[0]
+    return [x for result in results for x in result]
+
+
+async def get_global_events(*, cache_time=5):
+    """
+    Get Current Global Events (Ticker Text).
+
+    Args:
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/globalEvents', cache_time=cache_time)
+
+
+async def get_all_teams(*, cache_time=5):
+    """
+    Get All Teams, including Tournament teams and Hall Stars. Returns dictionary keyed by team ID.
+
+    Args:
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get(f'{BASE_URL}/database/allTeams', cache_time=cache_time)
+    return {t['id']: t for t in res}
+
+
+async def get_all_divisions(*, cache_time=5):
+    """
+    Get list of all divisions, including removed divisions. Returns dictionary keyed by division ID.
+
+    Args:
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get(f'{BASE_URL}/database/allDivisions', cache_time=cache_time)
+    return {d['id']: d for d in res}
+
+
+async def get_league(id_='d8545021-e9fc-48a3-af74-48685950a183', cache_time=5):
+    """
+    Get league by ID.
+
+    Args:
+        id_: league ID, defaults to current league (Internet League Blaseball)
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/league?id={id_}', cache_time=cache_time)
+
+
+async def get_subleague(id_, cache_time=5):
+    """
+    Get subleague by ID (eg: Mild, Evil, etc).
+
+    Args:
+        id_: subleague ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/subleague?id={id_}', cache_time=cache_time)
+
+
+async def get_division(id_, cache_time=5):
+    """
+    Get division by ID.
+
+    Args:
+        id_: division ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/division?id={id_}', cache_time=cache_time)
+
+
+async def get_team(id_, cache_time=5):
+    """
+    Get team by ID.
+
+    Args:
+        id_: team ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/team?id={id_}', cache_time=cache_time)
+
+
+async def get_player(id_, cache_time=5):
+    """
+    Get players by ID. Returns a dictionary with player ID as key
+
+    Args:
+        id_: player ID(s). Can be single string id_, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    if len(id_) == 0:
+        return {}
+    res = await _get_by_ids('/database/players', id_, cache_time, unique=True)
+    return {p['id']: p for p in res}
+
+
+async def get_games(season, day, cache_time=5):
+    """
+    Get games by season and day. Returns as dictionary with game ID as key.
+
+    Args:
+        season: Season, 1 indexed
+        day: Day, 1 indexed
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get(f'{BASE_URL}/database/games?season={season - 1}&day={day - 1}', cache_time=cache_time)
+    return {g['id']: g for g in res}
+
+
+async def get_tournament(tournament, day, cache_time=5):
+    """
+    Get games by tournament and day. Returns as dictionary with game ID as key.
+
+    Args:
+        tournament: Tournament ID
+        day: Day, 1 indexed
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get(f'{BASE_URL}/database/games?tournament={tournament}&day={day - 1}', cache_time=cache_time)
+    return {g['id']: g for g in res}
+
+
+async def get_game_by_id(id_, cache_time=5):
+    """
+    Get game by ID.
+
+    Args:
+        id_: game ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/gameById/{id_}', cache_time=cache_time)
+
+
+async def get_offseason_election_details(*, cache_time=5):
+    """
+    Get current Election ballot.
+
+    Args:
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/offseasonSetup', cache_time=cache_time)
+
+
+async def get_offseason_recap(season, cache_time=5):
+    """
+    Get Election results by season.
+
+    Args:
+        season: Season, 1 indexed
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/offseasonRecap?season={season - 1}', cache_time=cache_time)
+
+
+async def get_offseason_bonus_results(id_, cache_time=5):
+    """
+    Get blessing results by ID.
+
+    Args:
+        id: blessing ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get_by_ids('/database/bonusResults', id_, cache_time, unique=True)
+    return {g['id']: g for g in res}
+
+
+async def get_offseason_decree_results(id_, cache_time=5):
+    """
+    Get decree results by ID.
+
+    Args:
+        id: blessing ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get_by_ids('/database/decreeResults', id_, cache_time, unique=True)
+    return {g['id']: g for g in res}
+
+
+async def get_offseason_event_results(id_, cache_time=5):
+    """
+    Get tiding results by ID.
+
+    Args:
+        id: blessing ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get_by_ids('/database/eventResults', id_, cache_time, unique=True)
+    return {g['id']: g for g in res}
+
+
+async def get_playoff_details(season, cache_time=5):
+    """
+    Get playoff information by season.
+
+    Args:
+        season: season, 1 indexed.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/playoffs?number={season - 1}', cache_time=cache_time)
+
+
+async def get_playoff_round(id_, cache_time=5):
+    """
+    Get playoff round by ID
+
+    Args:
+        id_: playoff round ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/playoffRound?id={id_}', cache_time=cache_time)
+
+
+async def get_playoff_matchups(id_, cache_time=5):
+    """
+    Get playoff matchups (one team vs one team) by ID
+
+    Args:
+        id: playoff matchup ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get_by_ids('/database/playoffMatchups', id_, cache_time, unique=True)
+    return {g['id']: g for g in res}
+
+
+async def get_standings(id_, cache_time=5):
+    """
+    Get league standings by ID
+
+    Args:
+        id_: standings ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/standings?id={id_}', cache_time=cache_time)
+
+
+async def get_season(season_number, cache_time=5):
+    """
+    Get season info by season number
+
+    Args:
+        season_number: season, 1 indexed
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/season?number={season_number - 1}', cache_time=cache_time)
+
+
+async def get_tiebreakers(id, cache_time=5):
+    """
+    Get tiebreakers (Divine Favor) by ID
+
+    Args:
+        id_: tiebreaker ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get(f'{BASE_URL}/database/tiebreakers?id={id}', cache_time=cache_time)
+    return {g['id']: g for g in res}
+
+
+async def get_game_statsheets(ids, cache_time=5):
+    """
+    Get statsheets for a game by statsheet ID
+
+    Args:
+        id: game statsheet ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get_by_ids('/database/gameStatsheets', ids, cache_time, unique=True)
+    return {s['id']: s for s in res}
+
+
+async def get_player_statsheets(ids, cache_time=5):
+    """
+    Get statsheets for a player by statsheet ID
+
+    Args:
+        id: player statsheet ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get_by_ids('/database/playerStatsheets', ids, cache_time, unique=True)
+    return {s['id']: s for s in res}
+
+
+async def get_season_statsheets(ids, cache_time=5):
+    """
+    Get statsheets for a season by statsheet ID
+
+    Args:
+        id: season statsheet ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get_by_ids('/database/seasonStatsheets', ids, cache_time, unique=True)
+    return {s['id']: s for s in res}
+
+
+async def get_team_statsheets(ids, cache_time=5):
+    """
+    Get statsheets for a team by statsheet ID
+
+    Args:
+        id: team statsheet ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    res = await _get_by_ids('/database/teamStatsheets', ids, cache_time, unique=True)
+    return {s['id']: s for s in res}
+
+
+async def get_tributes(*, cache_time=5):
+    """
+    Get current Hall of Flame
+
+    Args:
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/api/getTribute', cache_time=cache_time)
+
+
+async def get_simulation_data(*, cache_time=5):
+    """
+    Get current simulation state
+
+    Args:
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/simulationData', cache_time=cache_time)
+
+
+async def get_attributes(ids, cache_time=5):
+    """
+    Get modification by ID
+
+    Args:
+        ids: modification ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get_by_ids('/database/mods', ids, cache_time)
+
+
+async def get_items(ids, cache_time=5):
+    """
+    Get item by ID
+
+    Args:
+        ids: item ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get_by_ids('/database/items', ids, cache_time)
+
+
+async def get_weather(*, cache_time=5):
+    """
+    Get weather by ID
+
+    Args:
+        ids: weather ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_GITHUB}/weather.json', cache_time=cache_time)
+
+
+async def get_blood(ids, cache_time=5):
+    """
+    Get blood type by ID
+
+    Args:
+        ids: blood ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get_by_ids('/database/blood', ids, cache_time)
+
+
+async def get_coffee(ids, cache_time=5):
+    """
+    Get coffee preference by ID
+
+    Args:
+        ids: coffee ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get_by_ids('/database/coffee', ids, cache_time)
+
+
+async def get_feed_global(limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None, cache_time=5):
+    """
+    Get Global Feed
+
+    Args:
+        limit: Number of entries to return
+        sort: 0 - Newest to Oldest, 1 - Oldest to Newest
+        category: 0 - Game, 1 - Changes, 2 - Abilities, 3 - Outcomes, 4 - Narrative
+        start: timestamp
+        type_: event type ID
+        season: season, 1-indexed
+        sim: sim ID
+        season_start: return items after this season (inclusive)
+        season_end: return items before this season (inclusive)
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    if isinstance(start, datetime):
+        start = start.strftime(TIMESTAMP_FORMAT)
+
+    params = {"limit": limit}
+    if sort is not None:
+        params["sort"] = sort
+    if category is not None:
+        params["category"] = category
+    if start is not None:
+        params["start"] = start
+    if type_ is not None:
+        params["type"] = type_
+    if season is not None:
+        params["season"] = season - 1
+    if sim is not None:
+        params["sim"] = sim
+    if season_start is not None:
+        params["seasonStart"] = season_start - 1
+    if season_end is not None:
+        params["seasonEnd"] = season_end - 1
+
+    return await _get(f'{BASE_URL}/database/feed/global', params=params, cache_time=cache_time)
+
+
+async def get_feed_game(id_, limit=50, sort=None, category=None, start=None, type_=None, sim=None, season_start=None, season_end=None, cache_time=5):
+    """
+    Get Game Feed
+
+    Args:
+        id_: Game ID
+        limit: Number of entries to return
+        sort: 0 - Newest to Oldest, 1 - Oldest to Newest
+        category: 0 - Game, 1 - Changes, 2 - Abilities, 3 - Outcomes, 4 - Narrative
+        start: timestamp
+        type_: event type ID
+        sim: sim ID
+        season_start: return items after this season (inclusive)
+        season_end: return items before this season (inclusive)
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    if isinstance(start, datetime):
+        start = start.strftime(TIMESTAMP_FORMAT)
+
+    params = {"id": id_, "limit": limit}
+    if sort is not None:
+        params["sort"] = sort
+    if category is not None:
+        params["category"] = category
+    if start is not None:
+        params["start"] = start
+    if type_ is not None:
+        params["type"] = type_
+    if sim is not None:
+        params["sim"] = sim
+    if season_start is not None:
+        params["seasonStart"] = season_start - 1
+    if season_end is not None:
+        params["seasonEnd"] = season_end - 1
+
+    return await _get(f'{BASE_URL}/database/feed/game', params=params, cache_time=cache_time)
+
+
+async def get_feed_team(id_, limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None, cache_time=5):
+    """
+    Get Team Feed
+
+    Args:
+        id_: Team ID
+        limit: Number of entries to return
+        sort: 0 - Newest to Oldest, 1 - Oldest to Newest
+        category: 0 - Game, 1 - Changes, 2 - Abilities, 3 - Outcomes, 4 - Narrative
+        start: timestamp
+        type_: event type ID
+        season: 1-indexed
+        sim: sim ID
+        season_start: return items after this season (inclusive)
+        season_end: return items before this season (inclusive)
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    if isinstance(start, datetime):
+        start = start.strftime(TIMESTAMP_FORMAT)
+
+    params = {"id": id_, "limit": limit}
+    if sort is not None:
+        params["sort"] = sort
+    if category is not None:
+        params["category"] = category
+    if start is not None:
+        params["start"] = start
+    if type_ is not None:
+        params["type"] = type_
+    if season is not None:
+        params["season"] = season - 1
+    if sim is not None:
+        params["sim"] = sim
+    if season_start is not None:
+        params["seasonStart"] = season_start - 1
+    if season_end is not None:
+        params["seasonEnd"] = season_end - 1
+
+    return await _get(f'{BASE_URL}/database/feed/team', params=params, cache_time=cache_time)
+
+
+async def get_feed_player(id_, limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None,  cache_time=5):
+    """
+    Get Player Feed
+
+    Args:
+        id_: Player ID
+        limit: Number of entries to return
+        sort: 0 - Newest to Oldest, 1 - Oldest to Newest
+        category: 0 - Game, 1 - Changes, 2 - Abilities, 3 - Outcomes, 4 - Narrative
+        start: timestamp
+        type_: event type ID
+        season: season, 1-indexed
+        sim: sim ID
+        season_start: return items after this season (inclusive)
+        season_end: return items before this season (inclusive)
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    if isinstance(start, datetime):
+        start = start.strftime(TIMESTAMP_FORMAT)
+
+    params = {"id": id_, "limit": limit}
+    if sort is not None:
+        params["sort"] = sort
+    if category is not None:
+        params["category"] = category
+    if start is not None:
+        params["start"] = start
+    if type_ is not None:
+        params["type"] = type_
+    if season is not None:
+        params["season"] = season - 1
+    if sim is not None:
+        params["sim"] = sim
+    if season_start is not None:
+        params["seasonStart"] = season_start - 1
+    if season_end is not None:
+        params["seasonEnd"] = season_end - 1
+
+    return await _get(f'{BASE_URL}/database/feed/player', params=params, cache_time=cache_time)
+
+
+async def get_feed_phase(season, phase, cache_time=5):
+    """
+    Get Feed by Phase
+
+    Args:
+        season: season, 1 indexed
+        phase: sim phase number
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/feedbyphase?season={season-1}&phase={phase}', cache_time=cache_time)
+
+
+async def get_feed_story(id_, cache_time=5):
+    """
+    Get Feed story item by ID
+
+    Args:
+        id_: Event ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/feed/story?id={id_}', cache_time=cache_time)
+
+
+async def get_renovations(ids, cache_time=5):
+    """
+    Get stadium renovation by ID
+
+    Args:
+        ids: renovation ID(s). Can be a single string ID, comma separated string, or list.
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get_by_ids('/database/renovations', ids, cache_time)
+
+
+async def get_renovation_progress(id_, cache_time=5):
+    """
+    Get stadium renovation progress by stadium ID
+
+    Args:
+        id_: stadium ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/renovationProgress?id={id_}', cache_time=cache_time)
+
+
+async def get_season_day_count(season, cache_time=5):
+    """
+    Get number of days in a season, by season
+
+    Args:
+        season: season, 1 indexed
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/seasondaycount?season={season - 1}', cache_time=cache_time)
+
+
+async def get_team_election_stats(team_id, cache_time=5):
+    """
+    Get will contribution percentage by team ID
+
+    Args:
+        team_id: team ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/teamElectionStats?id={team_id}', cache_time=cache_time)
+
+
+async def get_players_by_item(item, cache_time=5):
+    """
+    Get player holding an item
+
+    Args:
+        item: item ID
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/playersByItemId?id={item}', cache_time=cache_time)
+
+
+async def get_gift_progress(*, cache_time=5):
+    """
+    Get league-wide gift shop progress
+
+    Args:
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/giftProgress', cache_time=cache_time)
+
+
+async def get_all_players(*, cache_time=5):
+    """
+    Get list of player names and IDs
+
+    Args:
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/database/playerNamesIds', cache_time=cache_time)
+
+
+async def get_days_since_incineration(*, cache_time=5):
+    """
+    Get the timestamp of the most recent incineration
+
+    Args:
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    return await _get(f'{BASE_URL}/api/daysSinceLastIncineration', cache_time=cache_time)
+
+
+async def get_schedule(season=None, sim=None, day=None, start_day=None, end_day=None, cache_time=5):
+    """
+    Get the list of list of games for a particular season/sim
+    By default will return the full schedule for the current season/sim
+
+    Args:
+        season: filter by season number, if omitted defaults to current season
+        sim: filter by sim ID, if omitted defaults to current sim
+        day: filter by single day. If set, returns a list of games rather than a list of lists
+        start_day: return schedule after this day (inclusive)
+        end_day: return schedule before this day (inclusive)
+        cache_time: response cache lifetime in seconds, or `None` for infinite cache
+    """
+    params = {}
+    if start_day is not None and end_day is None:
+        raise ValueError("Must set both start_day and end_day")
+
+    if season is not None:
+        params["season"] = season - 1
+    if sim is not None:
+        params["sim"] = sim
+    if day is not None:
+        params["day"] = day - 1
+    if start_day is not None:
+        params["startDay"] = start_day - 1
+    if end_day is not None:
+        params["endDay"] = end_day - 1
+
+    return await _get(f'{BASE_URL}/api/games/schedule', params=params, cache_time=cache_time)
+
+
+async def get_season_sim_map(cache_time=5):
+    return await _get(f'{CONFIG_S3_URL}/feed_season_list.json', cache_time=cache_time)
+
+
+async def get_glossary(cache_time=5):
+    return await _get(f'{CONFIG_S3_URL}/glossary_words.json', cache_time=cache_time)
+
+
+async def get_book(cache_time=5):
+    return await _get(f'{CONFIG_S3_URL}/the_book.json', cache_time=cache_time)
+
+
+async def get_library(cache_time=5):
+    return await _get(f'{CONFIG_S3_URL}/library.json', cache_time=cache_time)
+
+
+async def get_sponsor(cache_time=5):
+    return await _get(f'{CONFIG_S3_URL}/sponsor_data.json', cache_time=cache_time)
+
+
+async def get_all_attributes(cache_time=5):
+    return await _get(f'{CONFIG_S3_URL}/attributes.json', cache_time=cache_time)
+
+
+async def get_stadium_prefabs(cache_time=5):
+    return await _get(f'{CONFIG_S3_URL}/stadium_prefabs.json', cache_time=cache_time)
+
+
+async def get_blaseball_beat(cache_time=5):
+    return await _get(f'{CONFIG_S3_URL}/the_beat.json', cache_time=cache_time)
+
+
+async def get_fanart(cache_time=5):
+    return await _get(f'{CONFIG_S3_URL}/fanart.json', cache_time=cache_time)
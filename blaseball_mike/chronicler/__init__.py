@@ -4,6 +4,7 @@ Wrappers for the Chronicler API endpoints for historical data
 from .chron_helpers import *
 from .v1 import *
 from .v2 import *
+from .spool import read_ndjson, write_ndjson
 
 # Make pdoc happy
 __all__ = [x for x in [*dir(v1), *dir(v2)] if str(x).startswith("get")]
@@ -1,3 +1,10 @@
+import queue
+import random
+import threading
+import time
+
+import requests
+
 from blaseball_mike.session import check_network_response
 
 
@@ -13,69 +20,222 @@ def prepare_id(id_):
         raise ValueError(f'Incorrect ID type: {type(id_)}')
 
 
-def paged_get(url, params, session, total_count=None, page_size=250, lazy=False):
+# Retry settings for page requests, set at runtime with `configure_retries`
+_RETRY_CONFIG = {
+    "retries": 4,
+    "backoff": 0.5,
+    "max_backoff": 30,
+}
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def configure_retries(retries=4, backoff=0.5, max_backoff=30):
     """
-    Combine paged URL responses
+    Configure how paged Chronicler requests are retried after a connection error, timeout, or a 429 or 5xx response.
+
+    Retries wait a random time of up to `backoff * 2 ** attempt` seconds (capped at `max_backoff`), or longer if the
+    server asked for a longer delay with a `Retry-After` header.
+
+    Args:
+        retries: number of times to retry a page before raising the error, 0 to disable retrying
+        backoff: base delay in seconds
+        max_backoff: longest delay between attempts in seconds
     """
-    if lazy:
-        return paged_get_lazy(url, params, session, total_count, page_size)
+    _RETRY_CONFIG.update(retries=retries, backoff=backoff, max_backoff=max_backoff)
 
-    if total_count is not None and total_count < page_size:
-        page_size = total_count
 
-    params["count"] = page_size
-    data = []
-    while True:
-        out = check_network_response(session.get(url, params=params))
-        if "items" in out:
-            d = out["items"]
-        else:
-            d = out.get("data", [])
-        page = out.get("nextPage")
+class PageCursor:
+    """
+    Position within a paged Chronicler query, which can be saved and used to resume the query later.
 
-        data.extend(d)
-        if page is None or len(d) == 0 or len(d) < page_size:
-            break
+    Pass a cursor to a paged `get_*` function as `cursor` and it is updated as each page is consumed. If the query
+    is interrupted, calling the function again with the same arguments and cursor continues from the first page that
+    was not fully consumed. Queries returning a list only move the cursor once the whole list has been fetched.
+    Cursors can be persisted with `json()` and restored with `PageCursor(**data)`.
 
-        if total_count is not None:
-            total_count -= len(d)
-            if total_count <= 0:
-                break
-            if total_count < page_size:
-                page_size = total_count
-                params["count"] = page_size
+    Args:
+        page: `nextPage` token of the next page to fetch, or `None` to start from the beginning
+        count: number of items consumed so far
+        done: whether the query has been fully consumed
+    """
 
-        params["page"] = page
+    def __init__(self, page=None, count=0, done=False):
+        self.page = page
+        self.count = count
+        self.done = done
 
+    def __repr__(self):
+        return f"<PageCursor: page={self.page!r} count={self.count} done={self.done}>"
+
+    def json(self):
+        return {"page": self.page, "count": self.count, "done": self.done}
+
+    def _advance(self, count, page):
+        self.count += count
+        self.page = page
+        self.done = page is None
+
+
+def paged_get(url, params, session, total_count=None, page_size=250, lazy=False, prefetch=0, cursor=None):
+    """
+    Combine paged URL responses
+
+    If `prefetch` is set, up to that many pages are requested ahead of the caller on a background thread.
+    If `cursor` is set, the query resumes from its position. It is updated as pages are consumed when `lazy`, and
+    otherwise only once the whole list has been fetched, since a partial list is lost if a later page fails.
+    """
+    if lazy:
+        return paged_get_lazy(url, params, session, total_count, page_size, prefetch, cursor)
+
+    data = []
+    page = None
+    for d, page in _page_tokens(url, params, session, total_count, page_size, prefetch, cursor):
+        data.extend(d)
+    if cursor is not None:
+        cursor._advance(len(data), page)
     return data
 
 
-def paged_get_lazy(url, params, session, total_count=None, page_size=250):
+def paged_get_lazy(url, params, session, total_count=None, page_size=250, prefetch=0, cursor=None):
     """
     Combine paged URL responses; returns a generator
     """
+    for d in _pages(url, params, session, total_count, page_size, prefetch, cursor):
+        yield from d
+
+
+def _page_tokens(url, params, session, total_count, page_size, prefetch, cursor=None):
+    pages = _fetch_pages(url, params, session, total_count, page_size, cursor)
+    if prefetch:
+        pages = _prefetch_pages(pages, prefetch)
+    return pages
+
+
+def _pages(url, params, session, total_count, page_size, prefetch, cursor=None):
+    pages = _page_tokens(url, params, session, total_count, page_size, prefetch, cursor)
+    if cursor is not None:
+        return _track_pages(pages, cursor)
+    return (d for d, _ in pages)
+
+
+def _track_pages(pages, cursor):
+    # The cursor only moves once the caller asks for the next page, so pages buffered by prefetching are not skipped
+    for d, page in pages:
+        yield d
+        cursor._advance(len(d), page)
+
+
+def _retry_delay(attempt, response=None):
+    delay = random.uniform(0, min(_RETRY_CONFIG["max_backoff"], _RETRY_CONFIG["backoff"] * 2 ** attempt))
+    retry_after = getattr(response, "headers", {}).get("Retry-After")
+    if retry_after is not None:
+        try:
+            delay = max(delay, min(float(retry_after), _RETRY_CONFIG["max_backoff"]))
+        except ValueError:
+            pass
+    return delay
+
+
+def _get_page(url, params, session):
+    """Request a single page, retrying transient errors"""
+    attempt = 0
+    while True:
+        try:
+            return check_network_response(session.get(url, params=params))
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            response = getattr(e, "response", None)
+            if isinstance(e, requests.HTTPError) and getattr(response, "status_code", None) not in _RETRY_STATUSES:
+                raise
+            if attempt >= _RETRY_CONFIG["retries"]:
+                raise
+            time.sleep(_retry_delay(attempt, response))
+            attempt += 1
+
+
+def _fetch_pages(url, params, session, total_count=None, page_size=250, cursor=None):
+    """
+    Generator of the item list of each page in a paged URL response, along with the `nextPage` token to continue
+    from after it (`None` for the last page)
+    """
+    if cursor is not None:
+        if cursor.done:
+            return
+        if cursor.page is not None:
+            params["page"] = cursor.page
+        if total_count is not None:
+            total_count -= cursor.count
+            if total_count <= 0:
+                return
+
     if total_count is not None and total_count < page_size:
         page_size = total_count
 
     params["count"] = page_size
     while True:
-        out = check_network_response(session.get(url, params=params))
+        out = _get_page(url, params, session)
         if "items" in out:
             d = out["items"]
         else:
             d = out.get("data", [])
         page = out.get("nextPage")
 
-        yield from d
-        if page is None or len(d) == 0 or len(d) < page_size:
+        last = page is None or len(d) == 0 or len(d) < page_size
+        if not last and total_count is not None:
+            total_count -= len(d)
+            last = total_count <= 0
+
+        yield d, None if last else page
+        if last:
             break
 
-        if total_count is not None:
-            total_count -= len(d)
-            if total_count <= 0:
-                break
-            if total_count < page_size:
-                page_size = total_count
-                params["count"] = page_size
+        if total_count is not None and total_count < page_size:
+            page_size = total_count
+            params["count"] = page_size
 
         params["page"] = page
+
+
+_PAGE, _DONE, _ERROR = range(3)
+
+
+def _prefetch_pages(pages, depth):
+    """
+    Drive a page generator on a background thread, keeping up to `depth` pages buffered ahead of the consumer.
+    Pages are returned in order, and errors are re-raised in the consuming thread.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        # Give up if the consumer went away, rather than blocking forever on a full buffer
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker():
+        try:
+            for page in pages:
+                if not put((_PAGE, page)):
+                    return
+            put((_DONE, None))
+        except Exception as e:
+            put((_ERROR, e))
+        finally:
+            pages.close()
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+            yield value
+    finally:
+        stop.set()
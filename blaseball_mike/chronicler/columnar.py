@@ -0,0 +1,179 @@
+"""
+Columnar export of Chronicler game updates, entities, and versions.
+
+Records are flattened into one row each, with column names converted the same way model attributes are:
+`homeScore` becomes `home_score`, and nested objects are flattened with `__` (`state__holiday_inning`). Chronicler's
+envelope fields (`game_id`, `entity_id`, `timestamp`, `valid_from`, ...) are kept alongside the payload fields, with
+timestamps stored as UTC timestamps. Lists of objects are stored as JSON strings.
+
+Requires `pyarrow` (install with the `columnar` extra).
+
+>>> from blaseball_mike import chronicler
+>>> from blaseball_mike.chronicler import columnar
+>>> updates = chronicler.get_game_updates(season=12, lazy=True)
+>>> columnar.write_parquet(updates, "game_updates")
+>>> table = columnar.read_parquet("game_updates", columns=["game_id", "home_score"], filter=("day", "<", 10))
+"""
+import json
+from itertools import islice
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from blaseball_mike.models.base import Base
+
+SEPARATOR = "__"
+"""Separator between the names of nested objects and their fields"""
+
+TIME_COLUMNS = ("timestamp", "valid_from", "valid_to")
+"""Columns stored as UTC timestamps"""
+
+_TIME_TYPE = pa.timestamp("us", tz="UTC")
+
+
+def flatten_record(record):
+    """
+    Flatten a Chronicler record (or a bare payload) into a dictionary of column names and values.
+    """
+    row = {}
+    if isinstance(record.get("data"), dict):
+        _flatten(record["data"], "", row)
+        for key, value in record.items():
+            if key == "data":
+                continue
+            name = Base._from_api_conversion(key)
+            # Envelope fields give way to payload fields with the same name
+            row["chronicler_" + name if name in row else name] = value
+    else:
+        _flatten(record, "", row)
+    return row
+
+
+def _flatten(data, prefix, row):
+    for key, value in data.items():
+        name = prefix + Base._from_api_conversion(key)
+        if isinstance(value, dict):
+            _flatten(value, name + SEPARATOR, row)
+        elif isinstance(value, list) and any(isinstance(x, (dict, list)) for x in value):
+            row[name] = json.dumps(value, separators=(",", ":"))
+        else:
+            row[name] = value
+
+
+def _column(name, values):
+    if name in TIME_COLUMNS:
+        try:
+            return pa.array(values, type=pa.string()).cast(_TIME_TYPE)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Values of mixed types are kept as text
+        return pa.array([x if x is None or isinstance(x, str) else json.dumps(x) for x in values], type=pa.string())
+
+
+def _merge_schemas(schema, other):
+    fields = []
+    names = set(schema.names)
+    for field in schema:
+        if field.name in other.names:
+            try:
+                merged = pa.unify_schemas([pa.schema([field]), pa.schema([other.field(field.name)])],
+                                          promote_options="permissive")
+                field = merged.field(0)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                field = pa.field(field.name, pa.string())
+        fields.append(field)
+    fields.extend(field for field in other if field.name not in names)
+    return pa.schema(fields)
+
+
+def _conform(table, schema):
+    columns = []
+    for field in schema:
+        if field.name in table.column_names:
+            columns.append(table[field.name].cast(field.type))
+        else:
+            columns.append(pa.nulls(len(table), field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def to_table(records, schema=None):
+    """
+    Convert Chronicler records to an Arrow table.
+
+    Args:
+        records: iterable of game updates, entities, versions, or bare payloads
+        schema: schema of previously converted records. Column types are widened to fit both (integers to floats,
+            or anything to strings), and columns missing from either are added.
+
+    Returns:
+        `pyarrow.Table`
+    """
+    rows = [flatten_record(record) for record in records]
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    table = pa.Table.from_arrays([_column(name, [row.get(name) for row in rows]) for name in names], names=names)
+    if schema is not None:
+        table = _conform(table, _merge_schemas(schema, table.schema))
+    return table
+
+
+def write_parquet(records, root, partition_cols=("season", "day"), batch_size=50000, schema=None):
+    """
+    Write Chronicler records to a Parquet dataset, in batches so any number of records can be written.
+
+    Args:
+        records: iterable of game updates, entities, versions, or bare payloads, such as a lazy Chronicler query
+        root: directory to write the dataset to. Files are added to any already in it.
+        partition_cols: columns to partition the dataset by, in Hive layout (`season=11/day=98/...`). Game updates
+            are partitioned by their season and day (0-indexed, as in the API) by default; use `None` for versions.
+        batch_size: number of records to convert and write at a time
+        schema: schema of data previously written to the dataset, to keep column types consistent with it
+
+    Returns:
+        schema of the written data
+    """
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return schema
+        table = to_table(batch, schema)
+        schema = table.schema
+
+        if partition_cols:
+            missing = [name for name in partition_cols if name not in table.column_names]
+            if missing:
+                raise ValueError(f"Records have no {', '.join(missing)} field to partition by")
+        pq.write_to_dataset(table, root, partition_cols=list(partition_cols) if partition_cols else None)
+
+
+def read_parquet(root, columns=None, filter=None):
+    """
+    Read a Parquet dataset written by `write_parquet`.
+
+    Files written with different column sets or types are combined, with missing columns read as null.
+
+    Args:
+        root: dataset directory
+        columns: list of columns to read, or `None` for all columns
+        filter: `pyarrow.dataset` filter expression, or a `(column, op, value)` tuple (or list of tuples, which are
+            all applied) in `pyarrow.parquet` filter form
+
+    Returns:
+        `pyarrow.Table`
+    """
+    dataset = ds.dataset(root, format="parquet", partitioning="hive")
+    # Files written before a column was widened keep its narrower type, so widen it the same way when reading
+    schema = dataset.schema
+    for fragment in dataset.get_fragments():
+        schema = _merge_schemas(schema, fragment.physical_schema)
+    dataset = ds.dataset(root, format="parquet", partitioning="hive", schema=schema)
+
+    if isinstance(filter, tuple):
+        filter = [filter]
+    if isinstance(filter, list):
+        filter = pq.filters_to_expression(filter)
+    return dataset.to_table(columns=columns, filter=filter)
@@ -0,0 +1,231 @@
+"""
+Local Chronicler Replica
+
+Mirrors Chronicler V2 versions for selected entity types into a local SQLite database. Once synced, `get_versions` and
+`get_entities` queries can be answered locally, returning the same shapes as the Chronicler V2 wrappers.
+
+>>> from blaseball_mike.chronicler.replica import Replica
+>>> with Replica("chronicler.sqlite") as replica:
+...     replica.sync("player")
+...     players = list(replica.get_entities("player", at="2021-03-01T00:00:00Z"))
+
+Syncs are incremental: only versions newer than the most recent stored version of a type are requested.
+"""
+import sqlite3
+from datetime import timedelta, timezone
+
+import ujson
+from dateutil.parser import parse
+
+from . import v2
+from blaseball_mike.session import TIMESTAMP_FORMAT
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    type TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    valid_from TEXT NOT NULL,
+    valid_to TEXT,
+    valid_from_raw TEXT NOT NULL,
+    valid_to_raw TEXT,
+    hash TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (type, entity_id, valid_from)
+);
+CREATE INDEX IF NOT EXISTS versions_by_time ON versions (type, valid_from);
+CREATE INDEX IF NOT EXISTS versions_open ON versions (type, entity_id, valid_to);
+"""
+
+
+def _normalize_timestamp(timestamp):
+    """
+    Convert a timestamp string or datetime to a fixed-width UTC string, so timestamps compare correctly as text.
+    Chronicler timestamps vary in their number of fractional digits.
+    """
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, str):
+        timestamp = parse(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp.strftime(TIMESTAMP_FORMAT)
+
+
+def _split_ids(id_):
+    if id_ is None:
+        return None
+    if isinstance(id_, str):
+        return id_.split(",")
+    return list(id_)
+
+
+class Replica:
+    """
+    Local SQLite mirror of Chronicler V2 entity versions.
+
+    Args:
+        path: path to the SQLite database, created if it does not exist
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def types(self):
+        """List entity types stored in the replica"""
+        return [row[0] for row in self._conn.execute("SELECT DISTINCT type FROM versions ORDER BY type")]
+
+    def latest_timestamp(self, type_):
+        """Return the `validFrom` of the newest stored version of a type, or `None` if it has never been synced"""
+        row = self._conn.execute("SELECT valid_from_raw FROM versions WHERE type = ? ORDER BY valid_from DESC LIMIT 1",
+                                 (type_,)).fetchone()
+        return row[0] if row else None
+
+    def sync(self, type_, page_size=1000, prefetch=1, cache_time=0):
+        """
+        Fetch versions of a type newer than the most recent stored version and store them.
+        Returns the number of versions stored.
+
+        Args:
+            type_: type of entity to sync (player, team, etc)
+            page_size: number of versions to request per-page
+            prefetch: number of pages to request ahead on a background thread
+            cache_time: response cache lifetime in seconds, or `None` for infinite cache
+        """
+        after = self.latest_timestamp(type_)
+        latest = None
+        seen = set()
+        if after is not None:
+            # `after` is exclusive, and an interrupted sync may have stored only some of the versions sharing the
+            # latest timestamp, so step back a tick and skip the ones already stored
+            latest = _normalize_timestamp(after)
+            seen = {row[0] for row in self._conn.execute(
+                "SELECT entity_id FROM versions WHERE type = ? AND valid_from = ?", (type_, latest))}
+            after = _normalize_timestamp(parse(latest) - timedelta(microseconds=1))
+        versions = v2.get_versions(type_, after=after, order="asc", page_size=page_size, prefetch=prefetch,
+                                   cache_time=cache_time)
+
+        stored = 0
+        batch = []
+        for version in versions:
+            if version["entityId"] in seen and _normalize_timestamp(version["validFrom"]) == latest:
+                continue
+            batch.append(version)
+            if len(batch) >= page_size:
+                stored += self.store(type_, batch)
+                batch = []
+        if batch:
+            stored += self.store(type_, batch)
+        return stored
+
+    def store(self, type_, versions):
+        """
+        Store a list of Chronicler V2 versions of a type, in ascending `validFrom` order.
+        Returns the number of versions stored.
+        """
+        with self._conn:
+            for version in versions:
+                valid_from = _normalize_timestamp(version["validFrom"])
+                valid_to = _normalize_timestamp(version.get("validTo"))
+
+                # Close out the previous open version of this entity, since Chronicler will not resend it
+                self._conn.execute(
+                    "UPDATE versions SET valid_to = ?, valid_to_raw = ? "
+                    "WHERE type = ? AND entity_id = ? AND valid_to IS NULL AND valid_from < ?",
+                    (valid_from, version["validFrom"], type_, version["entityId"], valid_from)
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (type_, version["entityId"], valid_from, valid_to, version["validFrom"], version.get("validTo"),
+                     version.get("hash"), ujson.dumps(version["data"]))
+                )
+        return len(versions)
+
+    def get_versions(self, type_, id_=None, before=None, after=None, order=None, count=None):
+        """
+        Local equivalent of `blaseball_mike.chronicler.get_versions`
+
+        Args:
+            type_: type of entity to filter by (player, team, etc)
+            id_: id or list of ids to filter type by
+            before: return elements before this string or datetime timestamp (ISO string or python `datetime`).
+            after: return elements after this string or datetime timestamp (ISO string or python `datetime`).
+            order: sort in ascending ('asc') or descending ('desc') order.
+            count: number of entries to return.
+
+        Returns:
+             generator of changes to entities over time
+        """
+        if order is None:
+            order = "asc"
+        if order.lower() not in ('asc', 'desc'):
+            raise ValueError("Order must be 'asc' or 'desc'")
+
+        clauses, args = self._filters(type_, id_)
+        if before is not None:
+            clauses.append("valid_from < ?")
+            args.append(_normalize_timestamp(before))
+        if after is not None:
+            clauses.append("valid_from > ?")
+            args.append(_normalize_timestamp(after))
+
+        return self._query(clauses, args, f"valid_from {order.upper()}, entity_id", count)
+
+    def get_entities(self, type_, id_=None, at=None, count=None):
+        """
+        Local equivalent of `blaseball_mike.chronicler.get_entities`
+
+        Args:
+            type_: type of entity to filter by (player, team, etc)
+            id_: id or list of ids to filter type by
+            at: return entities at this timestamp (ISO string or python `datetime`)
+            count: number of entries to return.
+
+        Returns:
+            generator of all entities of a certain type at one point in time
+        """
+        clauses, args = self._filters(type_, id_)
+        if at is None:
+            clauses.append("valid_to IS NULL")
+        else:
+            at = _normalize_timestamp(at)
+            clauses.append("valid_from <= ? AND (valid_to IS NULL OR valid_to > ?)")
+            args.extend([at, at])
+
+        return self._query(clauses, args, "entity_id", count)
+
+    @staticmethod
+    def _filters(type_, id_):
+        clauses = ["type = ?"]
+        args = [type_]
+        ids = _split_ids(id_)
+        if ids:
+            clauses.append(f"entity_id IN ({','.join('?' * len(ids))})")
+            args.extend(ids)
+        return clauses, args
+
+    def _query(self, clauses, args, order_by, count):
+        sql = ("SELECT entity_id, hash, valid_from_raw, valid_to_raw, data FROM versions "
+               f"WHERE {' AND '.join(clauses)} ORDER BY {order_by}")
+        if count is not None:
+            sql += " LIMIT ?"
+            args.append(count)
+
+        for entity_id, hash_, valid_from, valid_to, data in self._conn.execute(sql, args):
+            yield {
+                "entityId": entity_id,
+                "hash": hash_,
+                "validFrom": valid_from,
+                "validTo": valid_to,
+                "data": ujson.loads(data),
+            }
@@ -0,0 +1,77 @@
+"""
+Spool Chronicler query results to disk as newline-delimited JSON, and read them back.
+
+Records are written one at a time as they are received, so a lazily fetched query can be saved with constant memory
+use no matter how large it is:
+
+>>> from blaseball_mike import chronicler
+>>> updates = chronicler.get_game_updates(season=12, lazy=True)
+>>> chronicler.write_ndjson("season12.ndjson.gz", updates)
+>>> for game in chronicler.read_ndjson("season12.ndjson.gz", model=Game):
+...     print(game.last_update)
+
+An interrupted query can be continued by passing the same `PageCursor` to the query again, and appending the rest
+of the results to the same file.
+"""
+import gzip
+import json
+import os
+
+
+def _open(path, mode, compress):
+    if compress is None:
+        compress = os.fspath(path).endswith(".gz")
+    if compress:
+        # Appending adds a new gzip member, which readers handle transparently
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+
+def write_ndjson(path, records, append=False, compress=None):
+    """
+    Write records to a newline-delimited JSON file, one line per record.
+
+    Args:
+        path: file to write to
+        records: iterable of JSON-serializable records, such as a lazy Chronicler query
+        append: add to the end of an existing file instead of replacing it
+        compress: gzip the file. By default, files are compressed if `path` ends in `.gz`
+
+    Returns:
+        number of records written
+    """
+    count = 0
+    with _open(path, "a" if append else "w", compress) as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def read_ndjson(path, model=None, compress=None):
+    """
+    Iterate over the records of a newline-delimited JSON file.
+
+    Args:
+        path: file to read from
+        model: model class (or other callable) to convert each record with. Chronicler records are unwrapped first:
+            the record's `data` is passed, with its `validFrom` time added as `timestamp` for versions and entities.
+        compress: whether the file is gzipped. By default, files are treated as compressed if `path` ends in `.gz`
+
+    Returns:
+        generator of records, or of models if `model` is set
+    """
+    with _open(path, "r", compress) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if model is None:
+                yield record
+            elif "validFrom" in record:
+                yield model(dict(record["data"], timestamp=record["validFrom"]))
+            elif "data" in record:
+                yield model(record["data"])
+            else:
+                yield model(record)
@@ -2,10 +2,13 @@
 
 API Reference (out of date): https://astrid.stoplight.io/docs/sibr/reference/Chronicler.v1.yaml
 """
+import time
+from bisect import bisect_right
+from datetime import datetime, timezone
+
 from .chron_helpers import paged_get, prepare_id
-from datetime import datetime
 from dateutil.parser import parse
-from blaseball_mike.session import session, check_network_response, TIMESTAMP_FORMAT
+from blaseball_mike.session import session, cache_expiry, check_network_response, TIMESTAMP_FORMAT
 
 BASE_URL = 'https://api.sibr.dev/chronicler/v1'
 
@@ -80,7 +83,8 @@ def get_games(season=None, tournament=None, day=None, team_ids=None, pitcher_ids
 
 
 def get_game_updates(season=None, tournament=None, day=None, game_ids=None, started=None, search=None, sim=None,
-                     order=None, count=None, before=None, after=None, page_size=1000, lazy=False, cache_time=5):
+                     order=None, count=None, before=None, after=None, page_size=1000, lazy=False, prefetch=0,
+                     cursor=None, cache_time=5):
     """
     Get Game Updates
 
@@ -98,6 +102,8 @@ def get_game_updates(season=None, tournament=None, day=None, game_ids=None, star
         after: return elements after this string or datetime timestamp.
         page_size: number of elements to get per-page
         lazy: whether to return a list or a generator
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if isinstance(before, datetime):
@@ -137,7 +143,8 @@ def get_game_updates(season=None, tournament=None, day=None, game_ids=None, star
         params["sim"] = sim
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL}/games/updates', params=params, session=s, total_count=count, page_size=page_size, lazy=lazy)
+    return paged_get(f'{BASE_URL}/games/updates', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=lazy, prefetch=prefetch, cursor=cursor)
 
 
 def get_players(forbidden=None, incinerated=None, cache_time=5):
@@ -170,7 +177,8 @@ def get_player_names(*, cache_time=5):
     return check_network_response(s.get(f'{BASE_URL}/players/names'))
 
 
-def get_player_updates(ids=None, before=None, after=None, order=None, count=None, page_size=1000, lazy=False, cache_time=5):
+def get_player_updates(ids=None, before=None, after=None, order=None, count=None, page_size=1000,
+                       lazy=False, prefetch=0, cursor=None, cache_time=5):
     """
     Get player at time
 
@@ -182,6 +190,8 @@ def get_player_updates(ids=None, before=None, after=None, order=None, count=None
         count: number of entries to return.
         page_size: number of elements to get per-page
         lazy: whether to return a list or a generator
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if isinstance(before, datetime):
@@ -206,7 +216,8 @@ def get_player_updates(ids=None, before=None, after=None, order=None, count=None
         params["player"] = prepare_id(ids)
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL}/players/updates', params=params, session=s, total_count=count, page_size=page_size, lazy=lazy)
+    return paged_get(f'{BASE_URL}/players/updates', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=lazy, prefetch=prefetch, cursor=cursor)
 
 
 def get_teams(*, cache_time=5):
@@ -220,7 +231,8 @@ def get_teams(*, cache_time=5):
     return check_network_response(s.get(f'{BASE_URL}/teams')).get("data", [])
 
 
-def get_team_updates(ids=None, before=None, after=None, order=None, count=None, page_size=250, lazy=False, cache_time=5):
+def get_team_updates(ids=None, before=None, after=None, order=None, count=None, page_size=250,
+                     lazy=False, prefetch=0, cursor=None, cache_time=5):
     """
     Get team at time
 
@@ -232,6 +244,8 @@ def get_team_updates(ids=None, before=None, after=None, order=None, count=None,
         count: number of entries to return.
         page_size: number of elements to get per-page
         lazy: whether to return a list or a generator
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if isinstance(before, datetime):
@@ -256,11 +270,12 @@ def get_team_updates(ids=None, before=None, after=None, order=None, count=None,
         params["team"] = prepare_id(ids)
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL}/teams/updates', params=params, session=s, total_count=count, page_size=page_size, lazy=lazy)
+    return paged_get(f'{BASE_URL}/teams/updates', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=lazy, prefetch=prefetch, cursor=cursor)
 
 
 def get_roster_updates(team_ids=None, player_ids=None, before=None, after=None, order=None, count=None, page_size=1000,
-                       lazy=False, cache_time=5):
+                       lazy=False, prefetch=0, cursor=None, cache_time=5):
     """
     Get roster changes
 
@@ -273,6 +288,8 @@ def get_roster_updates(team_ids=None, player_ids=None, before=None, after=None,
         count: number of entries to return.
         page_size: number of elements to get per-page
         lazy: whether to return a list or a generator
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if isinstance(before, datetime):
@@ -299,10 +316,12 @@ def get_roster_updates(team_ids=None, player_ids=None, before=None, after=None,
         params["team"] = prepare_id(team_ids)
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL}/roster/updates', params=params, session=s, total_count=count, page_size=page_size, lazy=lazy)
+    return paged_get(f'{BASE_URL}/roster/updates', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=lazy, prefetch=prefetch, cursor=cursor)
 
 
-def get_tribute_updates(before=None, after=None, order=None, count=None, page_size=1000, lazy=False, cache_time=5):
+def get_tribute_updates(before=None, after=None, order=None, count=None, page_size=1000,
+                        lazy=False, prefetch=0, cursor=None, cache_time=5):
     """
     Get Hall of Flame at time
 
@@ -313,6 +332,8 @@ def get_tribute_updates(before=None, after=None, order=None, count=None, page_si
         count: number of entries to return.
         page_size: number of elements to get per-page
         lazy: whether to return a list or a generator
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if isinstance(before, datetime):
@@ -335,7 +356,130 @@ def get_tribute_updates(before=None, after=None, order=None, count=None, page_si
         params["count"] = page_size
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL}/tributes/updates', params=params, session=s, total_count=count, page_size=page_size, lazy=lazy)
+    return paged_get(f'{BASE_URL}/tributes/updates', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=lazy, prefetch=prefetch, cursor=cursor)
+
+
+_PARSED_TIME_DATA = {}
+_OPEN_ENDED = datetime.max.replace(tzinfo=timezone.utc)
+
+
+def _load_time_data(path, time_keys, cache_time, factory=list):
+    """
+    Fetch a Chronicler time endpoint and parse its timestamps. The parsed result is kept for `cache_time` seconds so
+    repeated lookups do not re-download and re-parse the whole response.
+    """
+    expiry = cache_expiry(cache_time)
+    now = time.monotonic()
+    cached = _PARSED_TIME_DATA.get(path)
+    if cached is not None and expiry != 0 and (expiry is None or now - cached[0] < expiry):
+        return cached[1]
+
+    s = session(cache_time)
+    results = check_network_response(s.get(f'{BASE_URL}{path}')).get('data', [])
+
+    # Convert time strings into datetime objects
+    for result in results:
+        for key in time_keys:
+            if result.get(key) is not None:
+                result[key] = parse(result[key])
+
+    value = factory(results)
+    _PARSED_TIME_DATA[path] = (now, value)
+    return value
+
+
+class TimeMap:
+    """
+    Parsed and indexed copy of the Chronicler time map, for mapping between seasons/days and real-life timestamps.
+    Use `TimeMap.load()` to get a shared, cached instance.
+    """
+    _GAME_TYPES = ('season', 'tournament', 'postseason')
+
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda x: x['startTime'])
+        self._starts = [row['startTime'] for row in self.rows]
+
+        # Latest end time of any row up to each index, so reverse lookups know when to stop searching backwards
+        self._max_ends = []
+        max_end = None
+        for row in self.rows:
+            end = row['endTime'] or _OPEN_ENDED
+            max_end = end if max_end is None else max(max_end, end)
+            self._max_ends.append(max_end)
+
+        self._index = {}
+        for row in self.rows:
+            if row['tournament'] == -1:
+                keys = [('season', row['season']), ('season', row['season'], row['day'])]
+            else:
+                keys = []
+            keys += [('tournament', row['tournament']), ('tournament', row['tournament'], row['day']),
+                     ('day', row['day'])]
+            for key in keys:
+                self._index.setdefault(key, []).append(row)
+
+    @classmethod
+    def load(cls, cache_time=3600):
+        """
+        Get the current time map
+
+        Args:
+            cache_time: lifetime in seconds of the downloaded and parsed time map, or `None` for infinite cache
+        """
+        return _load_time_data('/time/map', ('startTime', 'endTime'), cache_time, factory=cls)
+
+    def query(self, season=None, tournament=None, day=None, include_nongame=True):
+        """
+        Get time map entries, with the same arguments as `blaseball_mike.chronicler.time_map`.
+        """
+        if season is not None and tournament is not None:
+            raise ValueError("Cannot set both Season and Tournament")
+
+        if tournament is not None:
+            # Season is not always -1 if a tournament is active, so ignore it
+            key = ('tournament', tournament)
+        elif season is not None:
+            key = ('season', season - 1)
+        else:
+            key = ('day',)
+
+        if day is not None:
+            key += (day - 1,)
+
+        if key == ('day',):
+            results = self.rows
+        else:
+            results = self._index.get(key, [])
+
+        # Optionally filter out phase-change events
+        if not include_nongame:
+            results = [x for x in results if x['type'] in self._GAME_TYPES]
+
+        return [dict(x) for x in results]
+
+    def lookup(self, timestamp, include_nongame=True):
+        """
+        Find the time map entry that a timestamp falls within, or `None` if there is no matching entry.
+        If multiple entries overlap, the one that started most recently is returned.
+
+        Args:
+            timestamp: ISO string or python `datetime`. Naive datetimes are assumed to be UTC.
+            include_nongame: if True, include timestamps for phase changes, such as pre & post elections.
+        """
+        if isinstance(timestamp, str):
+            timestamp = parse(timestamp)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+        i = bisect_right(self._starts, timestamp) - 1
+        while i >= 0 and self._max_ends[i] > timestamp:
+            row = self.rows[i]
+            if (row['endTime'] is None or timestamp < row['endTime']) and \
+                    (include_nongame or row['type'] in self._GAME_TYPES):
+                return dict(row)
+            i -= 1
+        return None
 
 
 def time_map(season=None, tournament=None, day=None, include_nongame=True, cache_time=3600):
@@ -361,38 +505,8 @@ def time_map(season=None, tournament=None, day=None, include_nongame=True, cache
       }
     ]
     """
-    if season is not None and tournament is not None:
-        raise ValueError("Cannot set both Season and Tournament")
-    if season is not None:
-        season = season - 1
-    if day is not None:
-        day = day - 1
-
-    s = session(cache_time)
-    results = check_network_response(s.get(f'{BASE_URL}/time/map'))['data']
-
-    # Filter out desired events
-    if tournament is not None:
-        # Season is not always -1 if a tournament is active, so ignore it
-        results = list(filter(lambda x: x['tournament'] == tournament, results))
-
-    if season is not None:
-        results = list(filter(lambda x: x['tournament'] == -1 and x['season'] == season, results))
-
-    if day is not None:
-        results = list(filter(lambda x: x['day'] == day, results))
-
-    # Optionally filter out phase-change events
-    if not include_nongame:
-        results = list(filter(lambda x: x['type'] in ('season', 'tournament', 'postseason'), results))
-
-    # Convert time strings into datetime objects
-    for result in results:
-        result["startTime"] = parse(result["startTime"])
-        if result["endTime"] is not None:
-            result["endTime"] = parse(result["endTime"])
-
-    return results
+    return TimeMap.load(cache_time).query(season=season, tournament=tournament, day=day,
+                                          include_nongame=include_nongame)
 
 
 def time_season(season=None, tournament=None, cache_time=3600):
@@ -422,27 +536,17 @@ def time_season(season=None, tournament=None, cache_time=3600):
     if season is not None:
         season = season - 1
 
-    s = session(cache_time)
-    results = check_network_response(s.get(f'{BASE_URL}/time/seasons')).get('data', [])
+    results = _load_time_data('/time/seasons', ('startTime', 'seasonStartTime', 'postseasonStartTime', 'endTime'),
+                              cache_time)
 
     # Filter out desired events
     if tournament is not None:
         # Season is not always -1 if a tournament is active, so ignore it
-        results = list(filter(lambda x: x['tournament'] == tournament, results))
+        results = [x for x in results if x['tournament'] == tournament]
     if season is not None:
-        results = list(filter(lambda x: x['tournament'] == -1 and x['season'] == season, results))
-
-    # Convert time strings into datetime objects
-    for result in results:
-        result["startTime"] = parse(result["startTime"])
-        if result["seasonStartTime"] is not None:
-            result["seasonStartTime"] = parse(result["seasonStartTime"])
-        if result["postseasonStartTime"] is not None:
-            result["postseasonStartTime"] = parse(result["postseasonStartTime"])
-        if result["endTime"] is not None:
-            result["endTime"] = parse(result["endTime"])
+        results = [x for x in results if x['tournament'] == -1 and x['season'] == season]
 
-    return results
+    return [dict(x) for x in results]
 
 
 def get_fights(id_=None, season=0, cache_time=3600):
@@ -466,7 +570,8 @@ def get_fights(id_=None, season=0, cache_time=3600):
     return data
 
 
-def get_fight_updates(game_ids=None, before=None, after=None, order=None, count=None, page_size=1000, lazy=False, cache_time=5):
+def get_fight_updates(game_ids=None, before=None, after=None, order=None, count=None, page_size=1000,
+                      lazy=False, prefetch=0, cursor=None, cache_time=5):
     """
     Return a list of boss fight event updates
 
@@ -478,6 +583,8 @@ def get_fight_updates(game_ids=None, before=None, after=None, order=None, count=
         count: number of entries to return.
         page_size: number of elements to get per-page
         lazy: whether to return a list or a generator
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if isinstance(before, datetime):
@@ -502,7 +609,8 @@ def get_fight_updates(game_ids=None, before=None, after=None, order=None, count=
         params["fight"] = prepare_id(game_ids)
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL}/fights/updates', params=params, session=s, total_count=count, page_size=page_size, lazy=lazy)
+    return paged_get(f'{BASE_URL}/fights/updates', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=lazy, prefetch=prefetch, cursor=cursor)
 
 
 def get_stadiums(*, cache_time=3600):
@@ -513,7 +621,8 @@ def get_stadiums(*, cache_time=3600):
     return s.get(f'{BASE_URL}/stadiums').json()['data']
 
 
-def get_temporal_updates(before=None, after=None, order=None, count=None, page_size=1000, lazy=False, cache_time=5):
+def get_temporal_updates(before=None, after=None, order=None, count=None, page_size=1000,
+                         lazy=False, prefetch=0, cursor=None, cache_time=5):
     """
     Return a list of temporal object updates
     This is generally used for God Speak (Coin, Monitor, etc)
@@ -525,6 +634,8 @@ def get_temporal_updates(before=None, after=None, order=None, count=None, page_s
         count: number of entries to return.
         page_size: number of elements to get per-page
         lazy: whether to return a list or a generator
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if isinstance(before, datetime):
@@ -547,10 +658,12 @@ def get_temporal_updates(before=None, after=None, order=None, count=None, page_s
         params["count"] = page_size
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL}/temporal/updates', params=params, session=s, total_count=count, page_size=page_size, lazy=lazy)
+    return paged_get(f'{BASE_URL}/temporal/updates', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=lazy, prefetch=prefetch, cursor=cursor)
 
 
-def get_sim_updates(before=None, after=None, order=None, count=None, page_size=1000, lazy=False, cache_time=5):
+def get_sim_updates(before=None, after=None, order=None, count=None, page_size=1000,
+                    lazy=False, prefetch=0, cursor=None, cache_time=5):
     """
     Return a list of simulation object updates
 
@@ -561,6 +674,8 @@ def get_sim_updates(before=None, after=None, order=None, count=None, page_size=1
         count: number of entries to return.
         page_size: number of elements to get per-page
         lazy: whether to return a list or a generator
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if isinstance(before, datetime):
@@ -583,10 +698,12 @@ def get_sim_updates(before=None, after=None, order=None, count=None, page_size=1
         params["count"] = page_size
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL}/sim/updates', params=params, session=s, total_count=count, page_size=page_size, lazy=lazy)
+    return paged_get(f'{BASE_URL}/sim/updates', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=lazy, prefetch=prefetch, cursor=cursor)
 
 
-def get_globalevent_updates(before=None, after=None, order=None, count=None, page_size=1000, lazy=False, cache_time=600):
+def get_globalevent_updates(before=None, after=None, order=None, count=None, page_size=1000,
+                            lazy=False, prefetch=0, cursor=None, cache_time=600):
     """
     Return a list of global event object updates
 
@@ -597,6 +714,8 @@ def get_globalevent_updates(before=None, after=None, order=None, count=None, pag
         count: number of entries to return.
         page_size: number of elements to get per-page
         lazy: whether to return a list or a generator
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
     if isinstance(before, datetime):
@@ -619,7 +738,8 @@ def get_globalevent_updates(before=None, after=None, order=None, count=None, pag
         params["count"] = page_size
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL}/globalevents/updates', params=params, session=s, total_count=count, page_size=page_size, lazy=lazy)
+    return paged_get(f'{BASE_URL}/globalevents/updates', params=params, session=s, total_count=count,
+                     page_size=page_size, lazy=lazy, prefetch=prefetch, cursor=cursor)
 
 
 def get_old_items(ids=None):
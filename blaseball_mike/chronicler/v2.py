@@ -10,7 +10,7 @@ from blaseball_mike.session import session, TIMESTAMP_FORMAT
 BASE_URL_V2 = 'https://api.sibr.dev/chronicler/v2'
 
 
-def get_entities(type_, id_=None, at=None, count=None, page_size=1000, cache_time=5):
+def get_entities(type_, id_=None, at=None, count=None, page_size=1000, prefetch=0, cursor=None, cache_time=5):
     """
     Chronicler V2 Entities endpoint
 
@@ -20,6 +20,8 @@ def get_entities(type_, id_=None, at=None, count=None, page_size=1000, cache_tim
         at: return entities at this timestamp (ISO string or python `datetime`)
         count: number of entries to return.
         page_size: number of elements to get per-page
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
 
     Returns:
@@ -44,10 +46,12 @@ def get_entities(type_, id_=None, at=None, count=None, page_size=1000, cache_tim
         params["count"] = page_size
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL_V2}/entities', params=params, session=s, total_count=count, page_size=page_size, lazy=True)
+    return paged_get(f'{BASE_URL_V2}/entities', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=True, prefetch=prefetch, cursor=cursor)
 
 
-def get_versions(type_, id_=None, before=None, after=None, order=None, count=None, page_size=1000, cache_time=5):
+def get_versions(type_, id_=None, before=None, after=None, order=None, count=None, page_size=1000,
+                 prefetch=0, cursor=None, cache_time=5):
     """
     Chronicler V2 Versions endpoint
 
@@ -59,6 +63,8 @@ def get_versions(type_, id_=None, before=None, after=None, order=None, count=Non
         order: sort in ascending ('asc') or descending ('desc') order.
         count: number of entries to return.
         page_size: number of elements to get per-page
+        prefetch: number of pages to request ahead of the caller on a background thread, or 0 to disable
+        cursor: `PageCursor` to resume the query from, which is updated as pages are consumed
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
 
     Returns:
@@ -86,4 +92,5 @@ def get_versions(type_, id_=None, before=None, after=None, order=None, count=Non
         params["count"] = page_size
 
     s = session(cache_time)
-    return paged_get(f'{BASE_URL_V2}/versions', params=params, session=s, total_count=count, page_size=page_size, lazy=True)
+    return paged_get(f'{BASE_URL_V2}/versions', params=params, session=s, total_count=count, page_size=page_size,
+                     lazy=True, prefetch=prefetch, cursor=cursor)
@@ -0,0 +1,120 @@
+"""
+In-memory interval index over Chronicler V2 versions.
+
+Each version of an entity is valid from its `validFrom` up to (but not including) its `validTo`. Once a set of versions
+has been loaded, `VersionIndex` answers "what did entity X look like at time T" with a binary search rather than a
+`get_entities(at=...)` request per timestamp.
+
+>>> index = VersionIndex.load("player", id_=player_ids)
+>>> [index.at(player_id, t) for t in gameday_start_times]
+"""
+from bisect import bisect_right
+from datetime import timedelta, timezone
+
+from dateutil.parser import parse
+
+from . import v2
+
+
+def _to_utc(timestamp):
+    """Convert an ISO string or datetime to an aware UTC datetime. Naive datetimes are assumed to be UTC."""
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, str):
+        timestamp = parse(timestamp)
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+class VersionIndex:
+    """
+    Point-in-time index of entity versions, as returned by `blaseball_mike.chronicler.get_versions`.
+    """
+
+    def __init__(self, versions=()):
+        self._starts = {}
+        self._ends = {}
+        self._versions = {}
+        self.add(versions)
+
+    @classmethod
+    def load(cls, type_, id_=None, before=None, after=None, page_size=1000, prefetch=1, cache_time=5):
+        """
+        Build an index from Chronicler V2 versions. Arguments are passed to `blaseball_mike.chronicler.get_versions`.
+        """
+        return cls(v2.get_versions(type_, id_=id_, before=before, after=after, order="asc", page_size=page_size,
+                                   prefetch=prefetch, cache_time=cache_time))
+
+    @classmethod
+    def load_for_times(cls, type_, times, id_=None, page_size=1000, prefetch=1, cache_time=5):
+        """
+        Build an index covering every version needed to look up entities at the given times.
+        """
+        latest = max(_to_utc(t) for t in times)
+        # Pad the bound so versions starting exactly at the latest time are included
+        return cls.load(type_, id_=id_, before=latest + timedelta(seconds=1), page_size=page_size, prefetch=prefetch,
+                        cache_time=cache_time)
+
+    def add(self, versions):
+        """Add versions to the index. Versions may be given in any order."""
+        touched = set()
+        for version in versions:
+            entity_id = version["entityId"]
+            self._versions.setdefault(entity_id, []).append(version)
+            touched.add(entity_id)
+
+        for entity_id in touched:
+            entries = self._versions[entity_id]
+            entries.sort(key=lambda x: _to_utc(x["validFrom"]))
+            self._starts[entity_id] = [_to_utc(x["validFrom"]) for x in entries]
+            self._ends[entity_id] = [_to_utc(x.get("validTo")) for x in entries]
+
+    def __contains__(self, entity_id):
+        return entity_id in self._versions
+
+    def __len__(self):
+        return len(self._versions)
+
+    def ids(self):
+        """List of indexed entity IDs"""
+        return list(self._versions.keys())
+
+    def history(self, entity_id):
+        """All indexed versions of an entity, oldest first"""
+        return list(self._versions.get(entity_id, []))
+
+    def at(self, entity_id, time):
+        """
+        Return the version of an entity valid at the given time (ISO string or python `datetime`), or `None` if the
+        entity did not exist or is not indexed.
+        """
+        starts = self._starts.get(entity_id)
+        if not starts:
+            return None
+
+        time = _to_utc(time)
+        i = bisect_right(starts, time) - 1
+        if i < 0:
+            return None
+
+        end = self._ends[entity_id][i]
+        if end is not None and time >= end:
+            return None
+        return self._versions[entity_id][i]
+
+    def entities_at(self, time, ids=None):
+        """
+        Return a dictionary of all versions valid at the given time, keyed by entity ID.
+        Optionally limited to a list of entity IDs.
+        """
+        time = _to_utc(time)
+        if ids is None:
+            ids = self._versions.keys()
+
+        result = {}
+        for entity_id in ids:
+            version = self.at(entity_id, time)
+            if version is not None:
+                result[entity_id] = version
+        return result
@@ -4,12 +4,72 @@ Wrappers for the Official Blaseball API
 https://docs.sibr.dev/docs/apis/reference/Blaseball-API.v1.yaml
 """
 from blaseball_mike.session import session, check_network_response, TIMESTAMP_FORMAT
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 BASE_URL = 'https://api.blaseball.com'
 BASE_GITHUB = 'https://raw.githubusercontent.com/xSke/blaseball-site-files/main/data'
 CONFIG_S3_URL = 'https://blaseball-configs.s3.us-west-2.amazonaws.com'
 
+# Settings for endpoints taking a list of IDs, set at runtime with `configure_id_batches`
+_ID_BATCH_CONFIG = {
+    "batch_size": 100,
+    "max_workers": 4,
+}
+
+
+def configure_id_batches(batch_size=100, max_workers=4):
+    """
+    Configure how endpoints taking a list of IDs split up long lists.
+
+    Lists longer than `batch_size` are requested in batches, up to `max_workers` at a time, and the results are
+    combined in ID order.
+
+    Args:
+        batch_size: maximum number of IDs per request
+        max_workers: maximum number of batches to request concurrently
+    """
+    if batch_size < 1 or max_workers < 1:
+        raise ValueError("batch_size and max_workers must be at least 1")
+    _ID_BATCH_CONFIG.update(batch_size=batch_size, max_workers=max_workers)
+
+
+def _id_batches(ids, unique=False):
+    """
+    Split IDs into comma separated batches of at most `batch_size`, keeping their order. Values other than strings
+    and lists, such as the integer indexes of blood and coffee types, are passed on as-is.
+
+    Args:
+        ids: IDs as a comma separated string or list
+        unique: drop duplicate IDs, for endpoints whose results are keyed by ID
+    """
+    if isinstance(ids, str):
+        ids = ids.split(',')
+    elif not isinstance(ids, (list, tuple)):
+        return [ids]
+    if unique:
+        ids = list(dict.fromkeys(ids))
+    size = _ID_BATCH_CONFIG["batch_size"]
+    return [','.join(ids[i:i + size]) for i in range(0, len(ids), size)] or ['']
+
+
+def _get_by_ids(path, ids, cache_time, unique=False):
+    """
+    Request an endpoint taking a list of IDs in batches, returning the combined list of results. Only pass `unique`
+    when results are keyed by ID, as duplicate IDs are otherwise returned once for each time they're requested.
+    """
+    s = session(cache_time)
+
+    def fetch(batch):
+        return check_network_response(s.get(f'{BASE_URL}{path}?ids={batch}'))
+
+    batches = _id_batches(ids, unique)
+    if len(batches) == 1:
+        return fetch(batches[0])
+
+    with ThreadPoolExecutor(max_workers=min(_ID_BATCH_CONFIG["max_workers"], len(batches))) as pool:
+        return [x for result in pool.map(fetch, batches) for x in result]
+
 
 def get_global_events(*, cache_time=5):
     """
@@ -109,11 +169,7 @@ def get_player(id_, cache_time=5):
     """
     if len(id_) == 0:
         return {}
-    if isinstance(id_, list):
-        id_ = ','.join(id_)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/players?ids={id_}')
-    return {p['id']: p for p in check_network_response(res)}
+    return {p['id']: p for p in _get_by_ids('/database/players', id_, cache_time, unique=True)}
 
 
 def get_games(season, day, cache_time=5):
@@ -190,11 +246,7 @@ def get_offseason_bonus_results(id_, cache_time=5):
         id: blessing ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(id_, list):
-        id_ = ','.join(id_)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/bonusResults?ids={id_}')
-    return {g['id']: g for g in check_network_response(res)}
+    return {g['id']: g for g in _get_by_ids('/database/bonusResults', id_, cache_time, unique=True)}
 
 
 def get_offseason_decree_results(id_, cache_time=5):
@@ -205,11 +257,7 @@ def get_offseason_decree_results(id_, cache_time=5):
         id: blessing ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(id_, list):
-        id_ = ','.join(id_)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/decreeResults?ids={id_}')
-    return {g['id']: g for g in check_network_response(res)}
+    return {g['id']: g for g in _get_by_ids('/database/decreeResults', id_, cache_time, unique=True)}
 
 
 def get_offseason_event_results(id_, cache_time=5):
@@ -220,11 +268,7 @@ def get_offseason_event_results(id_, cache_time=5):
         id: blessing ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(id_, list):
-        id_ = ','.join(id_)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/eventResults?ids={id_}')
-    return {g['id']: g for g in check_network_response(res)}
+    return {g['id']: g for g in _get_by_ids('/database/eventResults', id_, cache_time, unique=True)}
 
 
 def get_playoff_details(season, cache_time=5):
@@ -261,11 +305,7 @@ def get_playoff_matchups(id_, cache_time=5):
         id: playoff matchup ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(id_, list):
-        id_ = ','.join(id_)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/playoffMatchups?ids={id_}')
-    return {g['id']: g for g in check_network_response(res)}
+    return {g['id']: g for g in _get_by_ids('/database/playoffMatchups', id_, cache_time, unique=True)}
 
 
 def get_standings(id_, cache_time=5):
@@ -315,11 +355,7 @@ def get_game_statsheets(ids, cache_time=5):
         id: game statsheet ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/gameStatsheets?ids={ids}')
-    return {s['id']: s for s in check_network_response(res)}
+    return {s['id']: s for s in _get_by_ids('/database/gameStatsheets', ids, cache_time, unique=True)}
 
 
 def get_player_statsheets(ids, cache_time=5):
@@ -330,11 +366,7 @@ def get_player_statsheets(ids, cache_time=5):
         id: player statsheet ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/playerStatsheets?ids={ids}')
-    return {s['id']: s for s in check_network_response(res)}
+    return {s['id']: s for s in _get_by_ids('/database/playerStatsheets', ids, cache_time, unique=True)}
 
 
 def get_season_statsheets(ids, cache_time=5):
@@ -345,11 +377,7 @@ def get_season_statsheets(ids, cache_time=5):
         id: season statsheet ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/seasonStatsheets?ids={ids}')
-    return {s['id']: s for s in check_network_response(res)}
+    return {s['id']: s for s in _get_by_ids('/database/seasonStatsheets', ids, cache_time, unique=True)}
 
 
 def get_team_statsheets(ids, cache_time=5):
@@ -360,11 +388,7 @@ def get_team_statsheets(ids, cache_time=5):
         id: team statsheet ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/teamStatsheets?ids={ids}')
-    return {s['id']: s for s in check_network_response(res)}
+    return {s['id']: s for s in _get_by_ids('/database/teamStatsheets', ids, cache_time, unique=True)}
 
 
 def get_tributes(*, cache_time=5):
@@ -399,11 +423,7 @@ def get_attributes(ids, cache_time=5):
         ids: modification ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/mods?ids={ids}')
-    return check_network_response(res)
+    return _get_by_ids('/database/mods', ids, cache_time)
 
 
 def get_items(ids, cache_time=5):
@@ -414,11 +434,7 @@ def get_items(ids, cache_time=5):
         ids: item ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/items?ids={ids}')
-    return check_network_response(res)
+    return _get_by_ids('/database/items', ids, cache_time)
 
 
 def get_weather(*, cache_time=5):
@@ -442,11 +458,7 @@ def get_blood(ids, cache_time=5):
         ids: blood ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/blood?ids={ids}')
-    return check_network_response(res)
+    return _get_by_ids('/database/blood', ids, cache_time)
 
 
 def get_coffee(ids, cache_time=5):
@@ -457,11 +469,7 @@ def get_coffee(ids, cache_time=5):
         ids: coffee ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/coffee?ids={ids}')
-    return check_network_response(res)
+    return _get_by_ids('/database/coffee', ids, cache_time)
 
 
 def get_feed_global(limit=50, sort=None, category=None, start=None, type_=None, season=None, sim=None, season_start=None, season_end=None, cache_time=5):
@@ -667,11 +675,7 @@ def get_renovations(ids, cache_time=5):
         ids: renovation ID(s). Can be a single string ID, comma separated string, or list.
         cache_time: response cache lifetime in seconds, or `None` for infinite cache
     """
-    if isinstance(ids, list):
-        ids = ','.join(ids)
-    s = session(cache_time)
-    res = s.get(f'{BASE_URL}/database/renovations?ids={ids}')
-    return check_network_response(res)
+    return _get_by_ids('/database/renovations', ids, cache_time)
 
 
 def get_renovation_progress(id_, cache_time=5):
@@ -2,6 +2,12 @@
 Wrapper around the SSE events API.
 """
 import asyncio
+import copy
+import functools
+import gzip
+import hashlib
+import os
+import time
 from concurrent import futures
 import jsonpatch
 import jsonpointer
@@ -10,16 +16,296 @@ import ujson
 from aiohttp_sse_client import client as sse_client
 from aiohttp.client_exceptions import ClientPayloadError, ClientConnectorError, ServerDisconnectedError
 
+from blaseball_mike import database
 
-async def stream_events(url='https://api.blaseball.com/events/streamData', retry_base=0.01, retry_max=300, on_parse_error='LOG'):
+_CONNECTION_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    ClientPayloadError,
+    futures.TimeoutError,
+    asyncio.exceptions.TimeoutError,
+    ClientConnectorError,
+    ServerDisconnectedError,
+)
+
+_PARSE_ERRORS = (
+    jsonpatch.JsonPatchConflict,
+    jsonpointer.JsonPointerException,
+    IndexError,
+    ValueError,
+)
+
+
+_FAST_OPS = frozenset(('add', 'replace', 'remove'))
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_pointer(pointer):
+    # Stream deltas only touch a limited set of paths, so each is parsed once
+    if not pointer.startswith('/'):
+        raise jsonpointer.JsonPointerException(f"Location must start with /: '{pointer}'")
+    parent, _, key = pointer.rpartition('/')
+    parts = tuple(part.replace('~1', '/').replace('~0', '~') for part in parent.split('/')[1:])
+    return parent, parts, key.replace('~1', '/').replace('~0', '~')
+
+
+def _list_index(items, key, add=False):
+    if add and key == '-':
+        return len(items)
+    if not (key.isascii() and key.isdigit()) or (key[0] == '0' and len(key) > 1):
+        raise jsonpointer.JsonPointerException(f"'{key}' is not a valid list index")
+    index = int(key)
+    if index > len(items) or (index == len(items) and not add):
+        raise jsonpatch.JsonPatchConflict(f"List index {index} is out of range")
+    return index
+
+
+def _resolve(doc, parts):
+    for part in parts:
+        if isinstance(doc, dict):
+            try:
+                doc = doc[part]
+            except KeyError:
+                raise jsonpointer.JsonPointerException(f"Member '{part}' not found")
+        elif isinstance(doc, list):
+            try:
+                doc = doc[_list_index(doc, part)]
+            except jsonpatch.JsonPatchConflict as e:
+                raise jsonpointer.JsonPointerException(str(e))
+        else:
+            raise jsonpointer.JsonPointerException(f"Can't look up '{part}' in a {type(doc).__name__}")
+    return doc
+
+
+def _forget(parents, pointer):
+    # Containers below `pointer` may have been replaced or moved
+    prefix = pointer + '/'
+    for cached in [cached for cached in parents if cached.startswith(prefix)]:
+        del parents[cached]
+
+
+def apply_patch(doc, ops, parents=None):
     """
-    Async generator for the events API.
+    Apply JSON patch operations to `doc` in place, returning the patched document.
+
+    A faster equivalent of `jsonpatch.apply_patch(doc, ops, in_place=True)` for stream deltas, which are long lists of
+    `add`, `replace` and `remove` operations on a few parts of the stream. Paths are parsed the first time they are
+    seen, and each container they point into is looked up from the root once per call. Other operations are passed
+    on to `jsonpatch`.
+
+    Args:
+        doc: document to patch
+        ops: list of patch operations
+        parents: dictionary of the containers looked up, by pointer, to share between calls applying the operations
+            of one frame separately
+    """
+    if parents is None:
+        parents = {}
+    for op in ops:
+        kind = op.get('op')
+        path = op.get('path')
+        if kind not in _FAST_OPS or not path or (kind != 'remove' and 'value' not in op):
+            doc = jsonpatch.apply_patch(doc, [op], in_place=True)
+            parents.clear()
+            continue
+
+        pointer, parts, key = _split_pointer(path)
+        parent = parents.get(pointer)
+        if parent is None:
+            parent = parents[pointer] = _resolve(doc, parts)
+
+        if isinstance(parent, dict):
+            if kind == 'add':
+                old = parent.get(key)
+                parent[key] = op['value']
+            elif key not in parent:
+                raise jsonpatch.JsonPatchConflict(f"Can't {kind} missing member '{key}'")
+            elif kind == 'replace':
+                old = parent[key]
+                parent[key] = op['value']
+            else:
+                old = parent.pop(key)
+            if isinstance(old, (dict, list)):
+                _forget(parents, pointer)
+        elif isinstance(parent, list):
+            index = _list_index(parent, key, kind == 'add')
+            if kind == 'replace':
+                if isinstance(parent[index], (dict, list)):
+                    _forget(parents, pointer)
+                parent[index] = op['value']
+            else:
+                if kind == 'add':
+                    parent.insert(index, op['value'])
+                else:
+                    del parent[index]
+                _forget(parents, pointer)
+        else:
+            raise jsonpointer.JsonPointerException(f"Can't {kind} '{key}' in a {type(parent).__name__}")
+    return doc
+
+
+class EventState:
+    """
+    Current state of the event stream, updated from full `value` frames and `delta` patches.
+
+    `apply_value` and `apply_patch` return what `stream_events` yields for each frame; for this class, the current
+    stream data. Subclasses can keep other representations up to date, such as `blaseball_mike.stream_model.StreamState`.
+
+    Attributes:
+        data: current stream data
+        version: number of updates applied, carried over from a `StreamCheckpoint` when resuming from one
+        updated: timestamp of when `data` was last known to be current
+        synced: whether `data` is following the live stream. While resyncing after a delta failed to apply, or when
+            resumed from a checkpoint or rebuilt from the REST API, it is `False` until the next full frame arrives.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.version = 0
+        self.updated = None
+        self.synced = False
+
+    def apply_value(self, value):
+        self.data = value
+        return self.data
+
+    def apply_patch(self, ops):
+        self.data = apply_patch(self.data, ops)
+        return self.data
+
+
+class StreamCheckpoint:
+    """
+    Saves the event stream data to a gzipped file at intervals, as a known good state for `stream_events` to resume
+    from after a restart, and to rebuild from after a delta fails to apply.
+
+    The file holds a header line, with the time the data was saved, the state's version and a SHA-256 hash of the
+    data, followed by the data's JSON. It is replaced atomically, and `load` checks the hash, so a crash while saving
+    can't leave a corrupt checkpoint behind.
+
+    Args:
+        path: file to save to
+        interval: minimum number of seconds between saves
+    """
+
+    def __init__(self, path, interval=60):
+        if interval < 0:
+            raise ValueError("Interval must not be negative")
+        self.path = path
+        self.interval = interval
+        self.saved = None
+        self._latest = None
+        self._writing = None
+
+    def due(self):
+        """Whether `interval` has passed since the last save"""
+        return self.saved is None or time.time() - self.saved >= self.interval
+
+    def _snapshot(self, data, version):
+        body = ujson.dumps(data, escape_forward_slashes=False)
+        self.saved = time.time()
+        header = ujson.dumps({
+            "saved": self.saved,
+            "version": version,
+            "sha256": hashlib.sha256(body.encode('utf-8')).hexdigest(),
+        })
+        self._latest = (header, body)
+        return self._latest
+
+    def _write(self, header, body):
+        temp = f"{self.path}.tmp"
+        with gzip.open(temp, 'wt', encoding='utf-8') as f:
+            f.write(header + '\n')
+            f.write(body + '\n')
+        os.replace(temp, self.path)
+
+    def save(self, data, version=0):
+        """Save `data` now"""
+        self._write(*self._snapshot(data, version))
+
+    def _write_latest(self):
+        written = None
+        while self._latest is not written:
+            written = self._latest
+            self._write(*written)
+
+    def _save_in_background(self, data, version):
+        # The data is serialized straight away, since the stream keeps changing it, but written from a thread, which
+        # carries on with any newer snapshot taken while it was writing
+        self._snapshot(data, version)
+        if self._writing is None or self._writing.done():
+            self._writing = asyncio.get_running_loop().run_in_executor(None, self._write_latest)
+
+    def load(self):
+        """
+        The most recent checkpoint, as a dictionary of the `data`, its `version`, and the timestamp it was `saved`
+        at, or `None` if nothing has been saved. Raises `ValueError` if the checkpoint is corrupt.
+        """
+        if self._latest is not None:
+            header, body = self._latest
+        else:
+            try:
+                with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                    header, body = f.readline(), f.readline().rstrip('\n')
+            except FileNotFoundError:
+                return None
+            except (OSError, EOFError) as e:
+                raise ValueError(f"Checkpoint {self.path} is not readable") from e
+        header = ujson.loads(header)
+        if hashlib.sha256(body.encode('utf-8')).hexdigest() != header.get("sha256"):
+            raise ValueError(f"Checkpoint {self.path} does not match its hash")
+        return {"data": ujson.loads(body), "version": header["version"], "saved": header["saved"]}
+
+
+def rebuild_from_api(data=None):
+    """
+    Bring stream data up to date with the simulation data and today's and tomorrow's games from the REST API, for
+    `stream_events` to resync with. Other sections of `data`, such as standings and leagues, are left as they were.
+
+    Args:
+        data: stream data to update, such as the last checkpoint's, or `None` to start from nothing
+    """
+    data = data if data is not None else {}
+    sim = database.get_simulation_data(cache_time=0)
+    games = data.setdefault("games", {})
+    games["sim"] = sim
+    games["schedule"] = list(database.get_games(sim["season"] + 1, sim["day"] + 1, cache_time=0).values())
+    games["tomorrowSchedule"] = list(database.get_games(sim["season"] + 1, sim["day"] + 2, cache_time=0).values())
+    return data
+
+
+def _rebuild_state(rebuild, checkpoint):
+    # Runs in a thread, so consumers keep receiving while the REST API is queried
+    try:
+        saved = checkpoint.load() if checkpoint is not None else None
+    except ValueError as e:
+        print(e)
+        saved = None
+    try:
+        return rebuild(saved["data"] if saved is not None else None)
+    except Exception as e:
+        print("Event resync failed.")
+        print(e)
+        return None
+
+
+def _parse_error(on_parse_error, error):
+    if on_parse_error.lower() == 'skip':
+        return
+    print("Event parse error.")
+    if on_parse_error.lower() == 'raise':
+        raise error
+    print(error)
+
+
+async def stream_frames(url='https://api.blaseball.com/events/streamData', retry_base=0.01, retry_max=300):
+    """
+    Async generator of the raw frames of the events API, reconnecting after connection errors.
+    Each frame is a dictionary with either a full `value` or a `delta` list of JSON patch operations.
     `retry_base` will be the minimum time to delay if there's a connection error
     `retry_max` is the maximum time to delay if there's a connection error
     """
     retry_delay = retry_base
-    event_current = {}
-    delta_previous = None
     while True:
         try:
             async with sse_client.EventSource(url, read_bufsize=2 ** 19) as src:
@@ -27,38 +313,379 @@ async def stream_events(url='https://api.blaseball.com/events/streamData', retry
                     retry_delay = retry_base  # reset backoff
                     if not event.data:
                         continue
-                    raw_event = ujson.loads(event.data)
-                    if 'value' in raw_event.keys(): # New, full event
-                        delta_previous = None
-                        event_current = raw_event['value']
-                        payload = event_current
-                    elif 'delta' in raw_event.keys(): # Delta event
-                        if raw_event['delta'] == delta_previous:
-                            continue
-                        delta_previous = raw_event['delta']
-                        jsonpatch.apply_patch(event_current, raw_event['delta'], in_place=True)
-                        payload = event_current
-                    else:
-                        raise ValueError("Unknown event type: {}".format(raw_event.keys()))
-                    yield payload
-        except (ConnectionError,
-                TimeoutError,
-                ClientPayloadError,
-                futures.TimeoutError,
-                asyncio.exceptions.TimeoutError,
-                ClientConnectorError,
-                ServerDisconnectedError):
+                    yield ujson.loads(event.data)
+        except _CONNECTION_ERRORS:
             await asyncio.sleep(retry_delay)
             retry_delay = min(retry_delay * 2, retry_max)
-        except (jsonpatch.JsonPatchConflict,
-                jsonpointer.JsonPointerException,
-                IndexError,
-                ValueError) as error:
-            if on_parse_error.lower()=='skip':
+
+
+async def stream_events(url='https://api.blaseball.com/events/streamData', retry_base=0.01, retry_max=300,
+                        on_parse_error='LOG', state=None, source=None, checkpoint=None, rebuild=None):
+    """
+    Async generator for the events API.
+    `retry_base` will be the minimum time to delay if there's a connection error
+    `retry_max` is the maximum time to delay if there's a connection error
+    `on_parse_error` is what to do when a frame can't be applied: 'LOG' or 'SKIP' to restart from the next full
+    frame (logging the error or not), or 'RAISE' to raise the error
+    `state` is the `EventState` to update with each frame, which decides what is yielded. By default, the current
+    stream data is yielded.
+    `source` is a callable returning an async iterable of frames, called to start and after a parse error, such as a
+    `ReplaySource` or a `FrameRecorder` wrapping `stream_frames`. By default frames are streamed from `url`.
+    The generator ends if the source runs out of frames.
+    `checkpoint` is a `StreamCheckpoint` to save the stream data to at intervals. If `state` is empty, the last
+    checkpoint is yielded straight away, before the stream connects.
+    `rebuild` is a callable taking the last checkpoint's data (or `None`) and returning current stream data, such as
+    `rebuild_from_api`. After a delta fails to apply it is run in a thread, and its data yielded if it finishes before
+    the stream sends a full frame.
+    """
+    if state is None:
+        state = EventState()
+    if source is None:
+        def source():
+            return stream_frames(url, retry_base, retry_max)
+
+    resync = False
+    rebuilding = None
+    if checkpoint is not None and not state.data:
+        try:
+            saved = checkpoint.load()
+        except ValueError as error:
+            _parse_error(on_parse_error, error)
+            saved = None
+        if saved is not None:
+            resync = True
+            payload = state.apply_value(saved["data"])
+            state.version, state.updated, state.synced = saved["version"], saved["saved"], False
+            yield payload
+
+    while True:
+        delta_previous = None
+        frames = source().__aiter__()
+        next_frame = None
+        try:
+            while True:
+                if rebuilding is not None:
+                    # Wait on both, so rebuilt data isn't held up by a slow reconnect
+                    if next_frame is None:
+                        next_frame = asyncio.ensure_future(frames.__anext__())
+                    await asyncio.wait((next_frame, rebuilding), return_when=asyncio.FIRST_COMPLETED)
+                    if rebuilding.done():
+                        data, rebuilding = rebuilding.result(), None
+                        if data is not None:
+                            payload = state.apply_value(data)
+                            state.version += 1
+                            state.updated = time.time()
+                            yield payload
+                        continue
+                if next_frame is not None:
+                    frame, next_frame = next_frame, None
+                    raw_event = await frame
+                else:
+                    raw_event = await frames.__anext__()
+
+                if 'value' in raw_event.keys():  # New, full event
+                    resync = False
+                    rebuilding = None
+                    delta_previous = None
+                    payload = state.apply_value(raw_event['value'])
+                elif 'delta' in raw_event.keys():  # Delta event
+                    if resync or raw_event['delta'] == delta_previous:
+                        continue
+                    delta_previous = raw_event['delta']
+                    payload = state.apply_patch(raw_event['delta'])
+                else:
+                    raise ValueError("Unknown event type: {}".format(raw_event.keys()))
+                state.version += 1
+                state.updated = time.time()
+                state.synced = True
+                if checkpoint is not None and checkpoint.due():
+                    checkpoint._save_in_background(state.data, state.version)
+                yield payload
+        except StopAsyncIteration:
+            return
+        except _PARSE_ERRORS as error:
+            # Deltas can't be applied to the current state any more, so wait for the next full frame
+            resync = True
+            state.synced = False
+            _parse_error(on_parse_error, error)
+            if rebuild is not None and rebuilding is None:
+                rebuilding = asyncio.get_running_loop().run_in_executor(None, _rebuild_state, rebuild, checkpoint)
+        finally:
+            if next_frame is not None:
+                next_frame.cancel()
+                await asyncio.wait((next_frame,))
+            if hasattr(frames, 'aclose'):
+                await frames.aclose()
+
+
+class FrameRecorder:
+    """
+    Records event stream frames to a gzipped file, with the time each was received, for replay with `ReplaySource`.
+
+    Each line of the file is the number of seconds since the first frame, a tab, and the frame's JSON.
+    Use it as a `source` for `stream_events` (or `StreamHub`) to record everything the stream receives, across
+    reconnects:
+
+    >>> with FrameRecorder("games.frames.gz") as recorder:
+    ...     async for data in stream_events(source=recorder):
+    ...         ...
+
+    Args:
+        path: file to write to
+        source: callable returning an async iterable of frames to record, by default `stream_frames()`
+    """
+
+    def __init__(self, path, source=None):
+        self.path = path
+        self.source = source if source is not None else stream_frames
+        self.count = 0
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._start = None
+
+    def record(self, frame):
+        """Write a frame"""
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        self._file.write('{:.3f}\t{}\n'.format(now - self._start, ujson.dumps(frame, escape_forward_slashes=False)))
+        self.count += 1
+
+    async def _record_frames(self):
+        async for frame in self.source():
+            self.record(frame)
+            yield frame
+
+    def __call__(self):
+        return self._record_frames()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_frames(path):
+    """
+    Generator of the `(seconds, frame)` pairs recorded in a `FrameRecorder` file, for processing recorded frames
+    without waiting between them.
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            offset, frame = line.split('\t', 1)
+            yield float(offset), ujson.loads(frame)
+
+
+class ReplaySource:
+    """
+    Replays a `FrameRecorder` file as a `source` for `stream_events` (or `StreamHub`).
+
+    >>> async for data in stream_events(source=ReplaySource("games.frames.gz", speed=10)):
+    ...     ...
+
+    Frames are released with the timing they were recorded with, divided by `speed`. After a parse error, replay
+    continues from the next full frame rather than restarting.
+
+    Args:
+        path: file to replay
+        speed: playback speed multiplier, or `None` to replay as fast as possible
+    """
+
+    def __init__(self, path, speed=1.0):
+        if speed is not None and speed <= 0:
+            raise ValueError("Speed must be positive, or None for no delay")
+        self.path = path
+        self.speed = speed
+        self._frames = read_frames(path)
+        self._clock = None
+
+    async def _replay(self):
+        loop = asyncio.get_running_loop()
+        for offset, frame in self._frames:
+            if self.speed is None:
+                await asyncio.sleep(0)
+            else:
+                if self._clock is None:
+                    self._clock = loop.time() - offset / self.speed
+                delay = self._clock + offset / self.speed - loop.time()
+                await asyncio.sleep(max(delay, 0))
+            yield frame
+
+    def __call__(self):
+        return self._replay()
+
+
+_END = object()
+_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+
+class Subscription:
+    """
+    A subscriber's view of a `StreamHub`. Iterate over it with `async for` to receive updates, until the hub stops.
+
+    Attributes:
+        policy: what happens when the queue is full, see `StreamHub.subscribe`
+        dropped: number of updates dropped because the queue was full
+    """
+
+    def __init__(self, hub, maxsize, policy):
+        if policy not in _POLICIES:
+            raise ValueError(f"Policy must be one of {', '.join(_POLICIES)}")
+        self.policy = policy
+        self.dropped = 0
+        self._hub = hub
+        self._queue = asyncio.Queue(maxsize)
+        self._end = None
+        self._ended = False
+
+    async def _put(self, item):
+        if self.policy == 'block':
+            await self._queue.put(item)
+            return
+        if self._queue.full():
+            self.dropped += 1
+            if self.policy == 'drop_newest':
+                return
+            self._queue.get_nowait()
+        self._queue.put_nowait(item)
+
+    def _finish(self, item):
+        # The end of the stream doesn't take a place in the queue; it is seen once the queue is empty
+        self._end = item
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._ended:
+            raise StopAsyncIteration
+        if self._queue.empty() and self._end is not None:
+            item = self._end
+        else:
+            item = await self._queue.get()
+        if item is _END:
+            self._ended = True
+            raise StopAsyncIteration
+        if isinstance(item, _Failure):
+            self._ended = True
+            raise item.error
+        return item
+
+    def qsize(self):
+        """Number of updates waiting to be received"""
+        return self._queue.qsize()
+
+    def close(self):
+        """Stop receiving updates"""
+        self._hub._subscribers.pop(self, None)
+        # Discard anything queued, so the hub isn't left waiting on a blocking subscriber
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._ended = True
+
+
+class StreamHub:
+    """
+    Shares one connection to the events API between many async subscribers.
+
+    Frames are received and applied to `state` once, and whatever `stream_events` yields for them (the stream data by
+    default, or change sets with a `blaseball_mike.stream_model.StreamState`) is passed to every subscriber.
+
+    >>> async with StreamHub() as hub:
+    ...     dashboard = hub.subscribe(maxsize=1, policy='drop_oldest')
+    ...     recorder = hub.subscribe(policy='block')
+    ...     async for payload in dashboard:
+    ...         ...
+
+    The stream data is updated in place, so subscribers that fall behind see newer data than the update they were
+    sent. Set `copy_payloads` to give subscribers a copy of each update instead (made once, shared by all of them).
+
+    Args:
+        url, retry_base, retry_max, on_parse_error, state, source, checkpoint, rebuild: as `stream_events`
+        copy_payloads: pass subscribers a copy of each update
+    """
+
+    def __init__(self, url='https://api.blaseball.com/events/streamData', retry_base=0.01, retry_max=300,
+                 on_parse_error='LOG', state=None, copy_payloads=False, source=None, checkpoint=None, rebuild=None):
+        self.url = url
+        self.source = source
+        self.checkpoint = checkpoint
+        self.rebuild = rebuild
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.on_parse_error = on_parse_error
+        self.state = state if state is not None else EventState()
+        self.copy_payloads = copy_payloads
+        self.latest = None
+        self._subscribers = {}  # Used as an ordered set
+        self._task = None
+
+    def subscribe(self, maxsize=16, policy='drop_oldest', replay_latest=False):
+        """
+        Add a subscriber.
+
+        Args:
+            maxsize: number of updates the subscriber's queue holds, or 0 for unlimited
+            policy: what to do when the queue is full: 'drop_oldest' or 'drop_newest' discard an update, while
+                'block' makes the hub (and so every other subscriber) wait for this one
+            replay_latest: start by receiving the most recent update, if there has been one
+        """
+        subscription = Subscription(self, maxsize, policy)
+        if replay_latest and self.latest is not None:
+            subscription._queue.put_nowait(self.latest)
+        self._subscribers[subscription] = None
+        return subscription
+
+    def start(self):
+        """Start receiving the stream, if not already started"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return self._task
+
+    async def close(self):
+        """Disconnect, and end every subscription"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
                 pass
-            elif on_parse_error.lower()=='raise':
-                print("Event parse error.")
-                raise
-            else: # log and restart, default
-                print("Event parse error.")
-                print(error)
+        for subscription in list(self._subscribers):
+            subscription._finish(_END)
+        self._subscribers.clear()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _run(self):
+        try:
+            async for payload in stream_events(self.url, self.retry_base, self.retry_max, self.on_parse_error,
+                                               state=self.state, source=self.source, checkpoint=self.checkpoint,
+                                               rebuild=self.rebuild):
+                if self.copy_payloads:
+                    payload = copy.deepcopy(payload)
+                self.latest = payload
+                for subscription in list(self._subscribers):
+                    await subscription._put(payload)
+            end = _END
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            end = _Failure(e)
+        for subscription in list(self._subscribers):
+            subscription._finish(end)
+        self._subscribers.clear()
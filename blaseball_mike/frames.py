@@ -0,0 +1,290 @@
+"""
+Vectorized player calculations
+
+`PlayerFrame` holds the stlats of many players (or many versions of players) as NumPy column arrays, so ratings and
+stars can be computed for all of them in a single pass rather than one `Player` at a time.
+
+Requires NumPy, which can be installed with the `frames` extra: `pip install blaseball-mike[frames]`
+
+>>> from blaseball_mike.frames import PlayerFrame
+>>> frame = PlayerFrame.load_all()
+>>> stars = frame.by_id(frame.get_hitting_stars())
+"""
+import numpy as np
+
+from . import chronicler
+from .models import Player
+
+STLATS = (
+    "base_thirst", "continuation", "ground_friction", "indulgence", "laserlikeness",
+    "divinity", "martyrdom", "moxie", "musclitude", "patheticism", "thwackability", "tragicness", "buoyancy",
+    "anticapitalism", "chasiness", "omniscience", "tenaciousness", "watchfulness",
+    "coldness", "overpowerment", "ruthlessness", "shakespearianism", "suppression", "unthwackability",
+    "cinnamon", "pressurization",
+)
+"""Stlat columns held by a `PlayerFrame`"""
+
+RATINGS = ("hitting_rating", "pitching_rating", "baserunning_rating", "defense_rating")
+"""Rating categories, in the order returned by `PlayerFrame.ratings`"""
+
+_ITEM_RATINGS = tuple(f"item_{x}" for x in RATINGS)
+_ITEM_KEYS = ("hittingRating", "pitchingRating", "baserunningRating", "defenseRating")
+
+
+def _api_key(name):
+    """Convert a snake_case attribute name to its camelCase API key"""
+    first, *rest = name.split("_")
+    return first + "".join(x.title() for x in rest)
+
+
+def get_vibes(pressurization, cinnamon, buoyancy, days):
+    """
+    Vibes for many players over many days, with the same results as `Player.get_vibe`.
+
+    Returns a 2-D array with one row per player and one column per day. Players missing any of the vibe stlats
+    (where `Player.get_vibe` returns `None`) have a row of NaN.
+
+    Args:
+        pressurization: array of player pressurization
+        cinnamon: array of player cinnamon
+        buoyancy: array of player buoyancy
+        days: day or list of days, 1-indexed
+    """
+    pressurization = np.asarray(pressurization, dtype=float)[:, np.newaxis]
+    cinnamon = np.asarray(cinnamon, dtype=float)[:, np.newaxis]
+    buoyancy = np.asarray(buoyancy, dtype=float)[:, np.newaxis]
+    days = np.atleast_1d(np.asarray(days, dtype=float))[np.newaxis, :]
+
+    with np.errstate(invalid="ignore"):
+        period = 2 / (6 + np.rint(10 * buoyancy))
+        vibes = 0.5 * ((pressurization + cinnamon) * np.sin(np.pi * (period * (days - 1) + 0.5)) -
+                       pressurization + cinnamon)
+
+    # Zero and missing stlats both mean the player has no vibes
+    missing = np.zeros(pressurization.shape, dtype=bool)
+    for stlat in (pressurization, cinnamon, buoyancy):
+        missing |= np.isnan(stlat) | (stlat == 0)
+    return np.where(missing, np.nan, vibes)
+
+
+class PlayerFrame:
+    """
+    Column arrays of player stlats, one row per player or player version.
+
+    Missing values are stored as NaN. Ratings provided by the API (`hittingRating`, etc) are kept in the rating
+    columns and used in place of the calculated rating, the same as `Player.hitting_rating`.
+
+    Args:
+        ids: list of player IDs, one per row
+        columns: dictionary of column name to list or array of values
+        timestamps: optional list of times each row is valid from, such as for Chronicler versions
+    """
+    def __init__(self, ids, columns, timestamps=None):
+        self.ids = list(ids)
+        self.timestamps = timestamps
+        self.columns = {}
+        for name in STLATS + RATINGS + _ITEM_RATINGS:
+            values = columns.get(name)
+            if values is None:
+                values = np.full(len(self.ids), np.nan if name not in _ITEM_RATINGS else 0.0)
+            self.columns[name] = np.asarray(values, dtype=float)
+
+    @classmethod
+    def from_records(cls, records, ids=None, timestamps=None):
+        """
+        Build a frame from player JSON data, such as the values returned by `blaseball_mike.database.get_player`.
+        Player IDs are taken from the data unless given.
+        """
+        names = STLATS + RATINGS
+        keys = [_api_key(name) for name in names]
+        record_ids = []
+        rows = []
+        item_rows = []
+        for record in records:
+            record_ids.append(record.get("id", record.get("_id")))
+            # Some archived data uses snake_case keys
+            rows.append([record.get(key, record.get(name)) for key, name in zip(keys, names)])
+            # Items are listed by ID in older data, which carries no item ratings
+            items = [x for x in record.get("items") or [] if isinstance(x, dict)]
+            item_rows.append([sum(item.get(key) or 0 for item in items) for key in _ITEM_KEYS])
+        return cls._from_rows(ids if ids is not None else record_ids, names, rows, item_rows, timestamps)
+
+    @classmethod
+    def from_players(cls, players):
+        """Build a frame from `Player` models, given as a list or a dictionary keyed by player ID"""
+        if isinstance(players, dict):
+            players = players.values()
+        names = STLATS + RATINGS
+        ids = []
+        rows = []
+        item_rows = []
+        for player in players:
+            ids.append(getattr(player, "id", None))
+            rows.append([getattr(player, name, None) for name in STLATS] +
+                        [getattr(player, f"_{name}", None) for name in RATINGS])
+            items = getattr(player, "items", None) or []
+            item_rows.append([sum(getattr(item, name, None) or 0 for item in items) for name in RATINGS])
+        return cls._from_rows(ids, names, rows, item_rows)
+
+    @classmethod
+    def from_versions(cls, versions):
+        """Build a frame from Chronicler entities or versions, one row per version"""
+        versions = list(versions)
+        return cls.from_records([x["data"] for x in versions], ids=[x["entityId"] for x in versions],
+                                timestamps=[x.get("validFrom") for x in versions])
+
+    @classmethod
+    def load_all(cls, time=None):
+        """Load all players, optionally at a point in time"""
+        return cls.from_versions(chronicler.get_entities("player", at=time))
+
+    @classmethod
+    def load_versions(cls, id_=None, before=None, after=None, page_size=1000, prefetch=1):
+        """Load every version of players over a period of time, one row per version"""
+        return cls.from_versions(chronicler.get_versions("player", id_=id_, before=before, after=after,
+                                                         order="asc", page_size=page_size, prefetch=prefetch))
+
+    @classmethod
+    def _from_rows(cls, ids, names, rows, item_rows, timestamps=None):
+        values = np.array(rows, dtype=float).reshape(len(rows), len(names))
+        item_values = np.array(item_rows, dtype=float).reshape(len(item_rows), len(RATINGS))
+        columns = {name: values[:, i] for i, name in enumerate(names)}
+        columns.update({name: item_values[:, i] for i, name in enumerate(_ITEM_RATINGS)})
+        return cls(ids, columns, timestamps)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def by_id(self, values):
+        """Map an array of per-row results to a dictionary keyed by player ID. Later rows win for repeated IDs."""
+        return dict(zip(self.ids, values.tolist()))
+
+    def get_vibes(self, days):
+        """Vibes for every row over a day or list of days (1-indexed). See `get_vibes`."""
+        c = self.columns
+        return get_vibes(c["pressurization"], c["cinnamon"], c["buoyancy"], days)
+
+    def simulate(self, overrides=None, multipliers=None, buffs=None, reroll=None, seed=None):
+        """
+        Return a frame of simulated copies of every row, applying adjustments the same way as
+        `Player.simulated_copy`. API-provided ratings are cleared so ratings are recalculated.
+
+        Adjustment values may be numbers or arrays with one value per row. Only stlat columns are adjusted.
+
+        Args:
+            overrides: dict of stlat (by API name) to value to replace it with
+            multipliers: dict of stlat or rating to multiplier
+            buffs: dict of stlat or rating to amount to add
+            reroll: dict of stlat or rating to reroll (values are unused)
+            seed: seed or `numpy.random.Generator` used for rerolls
+        """
+        rng = np.random.default_rng(seed)
+        stats = {_api_key(name): self.columns[name].copy() for name in STLATS}
+        Player._simulate_stats(stats, overrides, multipliers, buffs, reroll,
+                               lambda: rng.uniform(0.01, 0.99, len(self)), np.minimum, np.maximum)
+
+        columns = {name: np.broadcast_to(stats[_api_key(name)], len(self)) for name in STLATS}
+        columns.update({name: self.columns[name] for name in _ITEM_RATINGS})
+        return PlayerFrame(self.ids, columns, self.timestamps)
+
+    def simulate_scenarios(self, scenarios, include_items=True, seed=None):
+        """
+        Recalculate ratings for many simulation scenarios without building intermediate models.
+
+        Each scenario is a dictionary of `simulate` arguments (`overrides`, `multipliers`, `buffs`, `reroll`).
+        Returns a dictionary keyed by rating name of 2-D arrays, with one row per scenario and one column per row
+        of this frame.
+        """
+        rng = np.random.default_rng(seed)
+        results = {name: [] for name in RATINGS}
+        for scenario in scenarios:
+            ratings = self.simulate(seed=rng, **scenario).ratings(include_items)
+            for name in RATINGS:
+                results[name].append(ratings[name])
+        return {name: np.array(values).reshape(-1, len(self)) for name, values in results.items()}
+
+    def _rating(self, name, calculated):
+        provided = self.columns[name]
+        return np.where(np.isnan(provided), calculated, provided)
+
+    @property
+    def hitting_rating(self):
+        c = self.columns
+        with np.errstate(invalid="ignore"):
+            calculated = (((1 - c["tragicness"]) ** 0.01) * ((1 - c["patheticism"]) ** 0.05) *
+                          ((c["thwackability"] * c["divinity"]) ** 0.35) *
+                          ((c["moxie"] * c["musclitude"]) ** 0.075) * (c["martyrdom"] ** 0.02))
+        return self._rating("hitting_rating", calculated)
+
+    batting_rating = hitting_rating
+
+    @property
+    def pitching_rating(self):
+        c = self.columns
+        with np.errstate(invalid="ignore"):
+            calculated = ((c["unthwackability"] ** 0.5) * (c["ruthlessness"] ** 0.4) *
+                          (c["overpowerment"] ** 0.15) * (c["shakespearianism"] ** 0.1) * (c["coldness"] ** 0.025))
+        return self._rating("pitching_rating", calculated)
+
+    @property
+    def baserunning_rating(self):
+        c = self.columns
+        with np.errstate(invalid="ignore"):
+            calculated = ((c["laserlikeness"] ** 0.5) *
+                          ((c["continuation"] * c["base_thirst"] * c["indulgence"] * c["ground_friction"]) ** 0.1))
+        return self._rating("baserunning_rating", calculated)
+
+    @property
+    def defense_rating(self):
+        c = self.columns
+        with np.errstate(invalid="ignore"):
+            calculated = (((c["omniscience"] * c["tenaciousness"]) ** 0.2) *
+                          ((c["watchfulness"] * c["anticapitalism"] * c["chasiness"]) ** 0.1))
+        return self._rating("defense_rating", calculated)
+
+    def _with_items(self, name, include_items):
+        rating = getattr(self, name)
+        if include_items:
+            return rating + self.columns[f"item_{name}"]
+        return rating
+
+    def get_hitting_rating(self, include_items=True):
+        return self._with_items("hitting_rating", include_items)
+
+    def get_pitching_rating(self, include_items=True):
+        return self._with_items("pitching_rating", include_items)
+
+    def get_baserunning_rating(self, include_items=True):
+        return self._with_items("baserunning_rating", include_items)
+
+    def get_defense_rating(self, include_items=True):
+        return self._with_items("defense_rating", include_items)
+
+    def ratings(self, include_items=True):
+        """Dictionary of all four ratings, keyed by rating name"""
+        return {name: self._with_items(name, include_items) for name in RATINGS}
+
+    @staticmethod
+    def _to_stars(rating, round_stars):
+        if round_stars:
+            return 0.5 * np.rint(rating * 10)
+        return np.round(rating * 5, 1)
+
+    def get_hitting_stars(self, include_items=True, round_stars=False):
+        return self._to_stars(self.get_hitting_rating(include_items), round_stars)
+
+    def get_pitching_stars(self, include_items=True, round_stars=False):
+        return self._to_stars(self.get_pitching_rating(include_items), round_stars)
+
+    def get_baserunning_stars(self, include_items=True, round_stars=False):
+        return self._to_stars(self.get_baserunning_rating(include_items), round_stars)
+
+    def get_defense_stars(self, include_items=True, round_stars=False):
+        return self._to_stars(self.get_defense_rating(include_items), round_stars)
+
+    def stars(self, include_items=True, round_stars=False):
+        """Dictionary of star values for all four ratings, keyed by rating name"""
+        return {name: self._to_stars(rating, round_stars) for name, rating in self.ratings(include_items).items()}
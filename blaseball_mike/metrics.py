@@ -0,0 +1,171 @@
+"""
+Request metrics
+
+Every HTTP request made through `blaseball_mike.session` (and `blaseball_mike.aio`) is recorded here: request counts,
+latency histograms, bytes transferred, errors, and response cache hits, grouped by endpoint.
+
+>>> from blaseball_mike import metrics
+>>> with metrics.record_requests() as trace:
+...     team.lineup
+>>> [(x.endpoint, x.from_cache) for x in trace]
+[('/database/players', False)]
+>>> print(metrics.to_prometheus())
+
+Callbacks added with `add_callback` are called with a `RequestRecord` after every request, for forwarding to other
+monitoring systems.
+"""
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+RequestRecord = namedtuple("RequestRecord", ["method", "url", "host", "endpoint", "status", "elapsed", "size",
+                                             "from_cache", "error"])
+RequestRecord.__doc__ = """
+A single request. `elapsed` is in seconds, `size` is the response body size in bytes, `status` is `None` and `error`
+is the exception type name if the request failed without a response.
+"""
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+"""Upper bounds of the latency histogram buckets, in seconds"""
+
+_LOCK = threading.Lock()
+_ENDPOINTS = {}
+_CALLBACKS = []
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, record):
+        self.requests += 1
+        if record.from_cache:
+            self.cache_hits += 1
+        if record.error is not None or (record.status is not None and record.status >= 400):
+            self.errors += 1
+        self.bytes += record.size
+        self.latency_sum += record.elapsed
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, record.elapsed)] += 1
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.requests - self.cache_hits,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "latency_sum": self.latency_sum,
+            "latency_buckets": dict(zip(LATENCY_BUCKETS + (float("inf"),), self.latency_buckets)),
+        }
+
+
+def record(method, url, status, elapsed, size, from_cache=False, error=None):
+    """
+    Record a completed request. Called by the session layer; only needed when making requests some other way.
+    """
+    parts = urlsplit(url)
+    entry = RequestRecord(method, url, parts.netloc, parts.path, status, elapsed, size, from_cache, error)
+
+    with _LOCK:
+        stats = _ENDPOINTS.get((entry.host, entry.endpoint))
+        if stats is None:
+            stats = _ENDPOINTS[(entry.host, entry.endpoint)] = _EndpointStats()
+        stats.add(entry)
+        callbacks = list(_CALLBACKS)
+
+    for callback in callbacks:
+        callback(entry)
+
+
+def add_callback(callback):
+    """Call `callback` with a `RequestRecord` after every request"""
+    with _LOCK:
+        _CALLBACKS.append(callback)
+
+
+def remove_callback(callback):
+    """Stop calling a callback added with `add_callback`"""
+    with _LOCK:
+        _CALLBACKS.remove(callback)
+
+
+@contextmanager
+def record_requests():
+    """
+    Context manager collecting a trace of every request made while it is active, from any thread.
+    Yields a list which is filled with a `RequestRecord` per request.
+    """
+    trace = []
+    add_callback(trace.append)
+    try:
+        yield trace
+    finally:
+        remove_callback(trace.append)
+
+
+def snapshot():
+    """
+    Get the metrics recorded so far, as a dictionary keyed by (host, endpoint) of dictionaries with `requests`,
+    `cache_hits`, `cache_misses`, `errors`, `bytes`, `latency_sum`, and `latency_buckets` (a count of requests per
+    bucket upper bound, not cumulative).
+    """
+    with _LOCK:
+        return {key: stats.as_dict() for key, stats in _ENDPOINTS.items()}
+
+
+def reset():
+    """Discard all recorded metrics"""
+    with _LOCK:
+        _ENDPOINTS.clear()
+
+
+def _labels(host, endpoint, **extra):
+    labels = dict(host=host, endpoint=endpoint, **extra)
+    return ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels.items())
+
+
+def to_prometheus(prefix="blaseball_mike"):
+    """Render the recorded metrics in the Prometheus text exposition format"""
+    metrics = snapshot()
+    lines = [
+        f"# HELP {prefix}_requests_total HTTP requests, by whether they were served from the response cache",
+        f"# TYPE {prefix}_requests_total counter",
+    ]
+    for (host, endpoint), stats in metrics.items():
+        lines.append(f'{prefix}_requests_total{{{_labels(host, endpoint, cache="hit")}}} {stats["cache_hits"]}')
+        lines.append(f'{prefix}_requests_total{{{_labels(host, endpoint, cache="miss")}}} {stats["cache_misses"]}')
+
+    lines.extend([
+        f"# HELP {prefix}_request_errors_total HTTP requests that failed or returned an error status",
+        f"# TYPE {prefix}_request_errors_total counter",
+    ])
+    for (host, endpoint), stats in metrics.items():
+        lines.append(f'{prefix}_request_errors_total{{{_labels(host, endpoint)}}} {stats["errors"]}')
+
+    lines.extend([
+        f"# HELP {prefix}_response_bytes_total Response body bytes received",
+        f"# TYPE {prefix}_response_bytes_total counter",
+    ])
+    for (host, endpoint), stats in metrics.items():
+        lines.append(f'{prefix}_response_bytes_total{{{_labels(host, endpoint)}}} {stats["bytes"]}')
+
+    lines.extend([
+        f"# HELP {prefix}_request_duration_seconds HTTP request latency",
+        f"# TYPE {prefix}_request_duration_seconds histogram",
+    ])
+    for (host, endpoint), stats in metrics.items():
+        cumulative = 0
+        for bound, count in stats["latency_buckets"].items():
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{{_labels(host, endpoint, le=le)}}} {cumulative}')
+        lines.append(f'{prefix}_request_duration_seconds_sum{{{_labels(host, endpoint)}}} {stats["latency_sum"]}')
+        lines.append(f'{prefix}_request_duration_seconds_count{{{_labels(host, endpoint)}}} {stats["requests"]}')
+    return "\n".join(lines) + "\n"
@@ -1,12 +1,15 @@
 import abc
 import functools
 import re
+import threading
+import time as time_
+from collections import OrderedDict
 
 
 class _LazyLoadDecorator:
 
     def __init__(self, function, original_name, cache_name=None, default_value=None, use_default=True,
-                 key_replace_name=None):
+                 key_replace_name=None, batch_load=None, batch_by_time=False):
         """
         Lazy Loading Class Decorator
 
@@ -23,6 +26,10 @@ class _LazyLoadDecorator:
         * A lookup dictionary (`key_replace_name`) can be generated upon the setter being called, which will map the
           attribute name to the location of the original value. This is useful for cases where you want to map back to
           the original value programmatically.
+        * A batch loader (`batch_load`) can be given to allow `prefetch` to resolve this attribute for many objects at
+          once. It is called with a list of IDs and a timestamp, and returns a dictionary of loaded objects keyed by
+          ID. The timestamp is the object's `timestamp` attribute if `batch_by_time` is set, otherwise `None`.
+          Batch loading requires `cache_name` to be set.
         """
         functools.update_wrapper(self, function)
         self.func = function
@@ -32,8 +39,13 @@ class _LazyLoadDecorator:
         self.default_value = default_value
         self.use_default = use_default
         self.key_replace_name = key_replace_name
+        self.batch_load = batch_load
+        self.batch_by_time = batch_by_time
 
     def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
         if self.use_default and not getattr(obj, self.original_name, None):
             return self.default_value
 
@@ -50,13 +62,94 @@ class _LazyLoadDecorator:
     def __set__(self, obj, value):
         setattr(obj, self.original_name, value)
 
-        if self.cache_name:
+        if self.cache_name and (not _MODEL_CONFIG["compact"] or self.cache_name in obj.__dict__):
+            # Compact models only store a cache once something has been cached
             setattr(obj, self.cache_name, None)
 
         if self.key_replace_name:
-            key_lookup = getattr(obj, self.key_replace_name)
-            key_lookup[self.name] = self.original_name
-            setattr(obj, self.key_replace_name, key_lookup)
+            getattr(obj, self.key_replace_name)[self.name] = self.original_name
+
+
+_MODEL_CONFIG = {"compact": False}
+# Shared tables for compact models: interned field name tuples, and key lookups per model class
+_FIELD_TABLES = {}
+_KEY_TABLES = {}
+
+
+def enable_compact_models():
+    """
+    Store models created from now on in a compact form, reducing memory use when many models are kept at once.
+
+    Compact models share their `fields` and key lookup tables with every other model of the same class and shape,
+    and only hold cached lazy-loaded values once they have been loaded. Attribute access and `json()` are unchanged,
+    but `fields` is a tuple rather than a list.
+    """
+    _MODEL_CONFIG["compact"] = True
+
+
+def disable_compact_models():
+    """Store models created from now on in the default form"""
+    _MODEL_CONFIG["compact"] = False
+
+
+# Identity map of loaded models keyed by (model class, ID, timestamp). Disabled unless `enable_identity_map` is called.
+_IDENTITY_MAP = OrderedDict()
+_IDENTITY_MAP_CONFIG = {"enabled": False, "max_size": 10000, "ttl": 300}
+_IDENTITY_MAP_LOCK = threading.Lock()
+
+
+def enable_identity_map(max_size=10000, ttl=300):
+    """
+    Share loaded models between lookups.
+
+    While enabled, `load` classmethods (and the lazy-loaded attributes that use them) return the same object for
+    the same model class, ID, and timestamp instead of fetching and constructing a new one. This saves requests and
+    memory when many interlinked models refer to the same entities, such as a team's rotation and the pitchers of
+    its games. Since objects are shared, changes made to one are seen by every holder.
+
+    Args:
+        max_size: maximum number of models to keep, least recently used models are evicted first
+        ttl: number of seconds a model is reused for before it is loaded again, or `None` to keep it until evicted
+    """
+    with _IDENTITY_MAP_LOCK:
+        _IDENTITY_MAP_CONFIG.update(enabled=True, max_size=max_size, ttl=ttl)
+        _IDENTITY_MAP.clear()
+
+
+def disable_identity_map():
+    """Stop sharing loaded models and discard the identity map"""
+    with _IDENTITY_MAP_LOCK:
+        _IDENTITY_MAP_CONFIG["enabled"] = False
+        _IDENTITY_MAP.clear()
+
+
+def clear_identity_map():
+    """Discard all models held by the identity map"""
+    with _IDENTITY_MAP_LOCK:
+        _IDENTITY_MAP.clear()
+
+
+def _identity_get(key):
+    with _IDENTITY_MAP_LOCK:
+        entry = _IDENTITY_MAP.get(key)
+        if entry is None:
+            return None
+        expires, obj = entry
+        if expires is not None and expires <= time_.monotonic():
+            del _IDENTITY_MAP[key]
+            return None
+        _IDENTITY_MAP.move_to_end(key)
+        return obj
+
+
+def _identity_put(key, obj):
+    ttl = _IDENTITY_MAP_CONFIG["ttl"]
+    expires = None if ttl is None else time_.monotonic() + ttl
+    with _IDENTITY_MAP_LOCK:
+        _IDENTITY_MAP[key] = (expires, obj)
+        _IDENTITY_MAP.move_to_end(key)
+        while len(_IDENTITY_MAP) > _IDENTITY_MAP_CONFIG["max_size"]:
+            _IDENTITY_MAP.popitem(last=False)
 
 
 class Base(abc.ABC):
@@ -74,12 +167,17 @@ class Base(abc.ABC):
     _camel_to_snake_re = re.compile(r'(?<!^)(?=[A-Z])')
 
     def __init__(self, data, strict=False):
-        self.fields = []
-        self.key_transform_lookup = {}
+        if _MODEL_CONFIG["compact"]:
+            fields = tuple(data)
+            self.fields = _FIELD_TABLES.setdefault(fields, fields)
+            self.key_transform_lookup = _KEY_TABLES.setdefault(type(self), {})
+        else:
+            self.fields = list(data)
+            self.key_transform_lookup = {}
+        convert = Base._from_api_conversion
         for key, value in data.items():
-            self.fields.append(key)
             try:
-                setattr(self, Base._from_api_conversion(key), value)
+                setattr(self, convert(key), value)
             except AttributeError:
                 if strict:
                     raise
@@ -106,17 +204,68 @@ class Base(abc.ABC):
         return name.strip('_')
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _from_api_conversion(name):
+        # The API uses a fixed set of keys, so each conversion is computed once and shared by every model
         return Base._remove_leading_underscores(Base._camel_to_snake(name))
 
     @staticmethod
     def lazy_load(original_name, cache_name=None, default_value=None, use_default=True,
-                  key_replace_name="key_transform_lookup"):
+                  key_replace_name="key_transform_lookup", batch_load=None, batch_by_time=False):
         # Python requires Class Decorators with arguments to be wrapped by a function
         def lazy_wrapper(function):
-            return _LazyLoadDecorator(function, original_name, cache_name, default_value, use_default, key_replace_name)
+            return _LazyLoadDecorator(function, original_name, cache_name, default_value, use_default, key_replace_name,
+                                      batch_load, batch_by_time)
         return lazy_wrapper
 
+    @classmethod
+    def _load_cached(cls, ids, fetch, time=None):
+        """
+        Load models by ID through the identity map, if it is enabled.
+
+        `fetch` is called with the list of IDs that are not already held, and returns a dictionary of models keyed
+        by ID. Returns a dictionary of models keyed by ID.
+        """
+        if not _IDENTITY_MAP_CONFIG["enabled"]:
+            return fetch(list(ids))
+
+        found = {}
+        missing = []
+        for id_ in dict.fromkeys(ids):
+            obj = _identity_get((cls, id_, time))
+            if obj is None:
+                missing.append(id_)
+            else:
+                found[id_] = obj
+
+        if missing:
+            fetched = fetch(missing)
+            cls._remember(fetched, time)
+            found.update(fetched)
+        return {id_: found[id_] for id_ in ids if id_ in found}
+
+    @classmethod
+    def _load_cached_list(cls, ids, fetch):
+        """
+        Load a list of models by ID through the identity map, if it is enabled, in the order of `ids`.
+
+        `fetch` is called with a list of IDs and returns a list of API responses. Without the identity map, the
+        models are returned in the order of the response.
+        """
+        if not _IDENTITY_MAP_CONFIG["enabled"]:
+            return [cls(x) for x in fetch(list(ids))]
+        models = cls._load_cached(ids, lambda ids_: {x["id"]: cls(x) for x in fetch(ids_)})
+        return [models[id_] for id_ in ids if id_ in models]
+
+    @classmethod
+    def _remember(cls, models, time=None):
+        """Add a dictionary of models keyed by ID to the identity map, if it is enabled"""
+        if not _IDENTITY_MAP_CONFIG["enabled"]:
+            return
+        for id_, obj in models.items():
+            if obj is not None:
+                _identity_put((cls, id_, time), obj)
+
     def _custom_key_transform(self, name):
         if name in self.key_transform_lookup:
             return self.key_transform_lookup[name]
@@ -124,9 +273,61 @@ class Base(abc.ABC):
 
     def json(self):
         """Returns dictionary of fields used to generate the original object"""
-        data = {
-            f: getattr(self, self._custom_key_transform(self._from_api_conversion(f))) for f in self.fields
-        }
+        convert = Base._from_api_conversion
+        lookup = self.key_transform_lookup
+        data = {}
+        for f in self.fields:
+            name = convert(f)
+            data[f] = getattr(self, lookup.get(name, name))
         if "timestamp" in data and not isinstance(data["timestamp"], str):
             data["timestamp"] = data["timestamp"].strftime("%Y-%m-%dT%H:%M:%S.%fZ")
         return data
+
+
+_EMPTY_IDS = (None, "", "NONE")
+
+
+def prefetch(models, *names, chunk_size=100):
+    """
+    Resolve lazy-loaded attributes for a collection of models using batched requests, instead of one request per
+    object when each attribute is first accessed.
+
+    >>> teams = Team.load_all().values()
+    >>> prefetch(teams, "lineup", "rotation")
+
+    IDs are gathered across every model and attribute name, so in the example above all lineup and rotation players
+    are loaded together, `chunk_size` IDs per request. Each model's attribute cache is populated with the result.
+    Attributes that could not be fully resolved are left to load normally when accessed.
+    """
+    models = list(models)
+    groups = {}
+    for name in names:
+        for model in models:
+            loader = getattr(type(model), name, None)
+            if not isinstance(loader, _LazyLoadDecorator) or loader.batch_load is None:
+                raise ValueError(f"{type(model).__name__}.{name} does not support prefetching")
+            if getattr(model, loader.cache_name, None):
+                continue
+            if not getattr(model, loader.original_name, None):
+                continue
+            time = getattr(model, "timestamp", None) if loader.batch_by_time else None
+            groups.setdefault((loader.batch_load, time), []).append((model, loader))
+
+    for (batch_load, time), entries in groups.items():
+        ids = []
+        for model, loader in entries:
+            value = getattr(model, loader.original_name)
+            ids.extend(value if isinstance(value, list) else [value])
+        ids = [id_ for id_ in dict.fromkeys(ids) if id_ not in _EMPTY_IDS]
+
+        loaded = {}
+        for i in range(0, len(ids), chunk_size):
+            loaded.update(batch_load(ids[i:i + chunk_size], time))
+
+        for model, loader in entries:
+            value = getattr(model, loader.original_name)
+            if isinstance(value, list):
+                if all(id_ in loaded for id_ in value):
+                    setattr(model, loader.cache_name, [loaded[id_] for id_ in value])
+            elif value in loaded:
+                setattr(model, loader.cache_name, loaded[value])
@@ -22,7 +22,7 @@ class Game(Base):
         """
         Load by ID
         """
-        return cls(database.get_game_by_id(id_))
+        return cls._load_cached([id_], lambda ids: {id_: cls(database.get_game_by_id(id_))})[id_]
 
     @classmethod
     def load_by_day(cls, season, day, sim=None):
@@ -97,7 +97,8 @@ class Game(Base):
     def losing_score(self):
         return self.home_score if self.home_score < self.away_score else self.away_score
 
-    @Base.lazy_load("_base_runner_ids", cache_name="_base_runners", default_value=list())
+    @Base.lazy_load("_base_runner_ids", cache_name="_base_runners", default_value=list(),
+                    batch_load=Player._load_batch)
     def base_runners(self):
         players = Player.load(*self._base_runner_ids)
         return [players.get(id_) for id_ in self._base_runner_ids]
@@ -106,27 +107,27 @@ class Game(Base):
     def weather(self):
         return Weather.load_one(self._weather)
 
-    @Base.lazy_load("_home_team_id", cache_name="_home_team")
+    @Base.lazy_load("_home_team_id", cache_name="_home_team", batch_load=Team._load_batch)
     def home_team(self):
         return Team.load(self._home_team_id)
 
-    @Base.lazy_load("_away_team_id", cache_name="_away_team")
+    @Base.lazy_load("_away_team_id", cache_name="_away_team", batch_load=Team._load_batch)
     def away_team(self):
         return Team.load(self._away_team_id)
 
-    @Base.lazy_load("_home_pitcher_id", cache_name="_home_pitcher")
+    @Base.lazy_load("_home_pitcher_id", cache_name="_home_pitcher", batch_load=Player._load_batch)
     def home_pitcher(self):
         return Player.load_one(self._home_pitcher_id)
 
-    @Base.lazy_load("_away_pitcher_id", cache_name="_away_pitcher")
+    @Base.lazy_load("_away_pitcher_id", cache_name="_away_pitcher", batch_load=Player._load_batch)
     def away_pitcher(self):
         return Player.load_one(self._away_pitcher_id)
 
-    @Base.lazy_load("_home_batter_id", cache_name="_home_batter")
+    @Base.lazy_load("_home_batter_id", cache_name="_home_batter", batch_load=Player._load_batch)
     def home_batter(self):
         return Player.load_one(self._home_batter_id)
 
-    @Base.lazy_load("_away_batter_id", cache_name="_away_batter")
+    @Base.lazy_load("_away_batter_id", cache_name="_away_batter", batch_load=Player._load_batch)
     def away_batter(self):
         return Player.load_one(self._away_batter_id)
 
@@ -216,7 +217,7 @@ class Game(Base):
     def statsheet(self):
         return GameStatsheet.load(self._statsheet_id)[self._statsheet_id]
 
-    @Base.lazy_load("_stadium_id", cache_name="_stadium")
+    @Base.lazy_load("_stadium_id", cache_name="_stadium", batch_load=Stadium._load_batch)
     def stadium_id(self):
         return Stadium.load_one(self._stadium_id)
 
@@ -225,23 +226,28 @@ class Game(Base):
         # stadium is an alias for stadium_id
         return self.stadium_id
 
-    @Base.lazy_load("_base_runner_mod_ids", cache_name="_base_runner_mods", default_value=list())
+    @Base.lazy_load("_base_runner_mod_ids", cache_name="_base_runner_mods", default_value=list(),
+                    batch_load=Modification._load_batch)
     def base_runner_mods(self):
         return Modification.load(*self._base_runner_mod_ids)
 
-    @Base.lazy_load("_home_pitcher_mod_id", cache_name="_home_pitcher_mod", use_default=False)
+    @Base.lazy_load("_home_pitcher_mod_id", cache_name="_home_pitcher_mod", use_default=False,
+                    batch_load=Modification._load_batch)
     def home_pitcher_mod(self):
         return Modification.load_one(getattr(self, "_home_pitcher_mod_id", None))
 
-    @Base.lazy_load("_home_batter_mod_id", cache_name="_home_batter_mod", use_default=False)
+    @Base.lazy_load("_home_batter_mod_id", cache_name="_home_batter_mod", use_default=False,
+                    batch_load=Modification._load_batch)
     def home_batter_mod(self):
         return Modification.load_one(getattr(self, "_home_batter_mod_id", None))
 
-    @Base.lazy_load("_away_pitcher_mod_id", cache_name="_away_pitcher_mod", use_default=False)
+    @Base.lazy_load("_away_pitcher_mod_id", cache_name="_away_pitcher_mod", use_default=False,
+                    batch_load=Modification._load_batch)
     def away_pitcher_mod(self):
         return Modification.load_one(getattr(self, "_away_pitcher_mod_id", None))
 
-    @Base.lazy_load("_away_batter_mod_id", cache_name="_away_batter_mod", use_default=False)
+    @Base.lazy_load("_away_batter_mod_id", cache_name="_away_batter_mod", use_default=False,
+                    batch_load=Modification._load_batch)
     def away_batter_mod(self):
         return Modification.load_one(getattr(self, "_away_batter_mod_id", None))
 
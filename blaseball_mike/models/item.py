@@ -12,7 +12,7 @@ class Item(Base):
 
     @classmethod
     def load(cls, *ids):
-        return [cls(item) for item in database.get_items(list(ids))]
+        return cls._load_cached_list(ids, database.get_items)
 
     @classmethod
     def load_one(cls, id_):
@@ -23,7 +23,7 @@ class Idol(Base):
             idols_dict[idol] = cls({"playerId": idol})
         return idols_dict
 
-    @Base.lazy_load("_player_id", cache_name="_player")
+    @Base.lazy_load("_player_id", cache_name="_player", batch_load=Player._load_batch)
     def player_id(self):
         return Player.load_one(self._player_id)
 
@@ -11,10 +11,15 @@ class Modification(Base):
 
     @classmethod
     def load(cls, *ids):
-        return [cls(mod) for mod in database.get_attributes(list(ids))]
+        return cls._load_cached_list(ids, database.get_attributes)
 
     @classmethod
     def load_one(cls, id_):
         if id_ in (None, "NONE", ""):
             return None
         return cls.load(id_)[0]
+
+    @classmethod
+    def _load_batch(cls, ids, time=None):
+        """Batch loader for `prefetch`. Modifications are not versioned, so `time` is ignored."""
+        return {mod.id: mod for mod in cls.load(*ids)}
@@ -1,3 +1,4 @@
+import functools
 import math
 import random
 import uuid
@@ -9,6 +10,59 @@ from .base import Base
 from .item import Item
 from .modification import Modification
 from .. import database, chronicler, reference
+from ..chronicler.version_index import VersionIndex
+
+
+_SOULSCREAM_LETTERS = ("A", "E", "I", "O", "U", "X", "H", "A", "E", "I")
+# Decimal place values 10^-r for each soul, with each value's integer significand and exponent
+_SOULSCREAM_PLACES = []
+
+
+def _float_parts(value):
+    """Split a float into an integer significand and a binary exponent"""
+    m, e = math.frexp(value)
+    return int(m * 2 ** 53), e - 53
+
+
+def _soulscream_places(souls):
+    while len(_SOULSCREAM_PLACES) < souls:
+        place = 10 ** -len(_SOULSCREAM_PLACES)
+        _SOULSCREAM_PLACES.append((place, *_float_parts(place)))
+    return _SOULSCREAM_PLACES[:souls]
+
+
+def _soulscream_letters(stat, souls):
+    """
+    Soulscream letter for each soul of one stat: the letter for digit `floor((stat % 10^-r) / 10^-r * 10)`.
+
+    Float modulo by a tiny place value is slow, so the remainder is computed exactly with integers instead, which
+    gives the same result as the float operation.
+    """
+    places = _soulscream_places(souls)
+    exact = isinstance(stat, float) and stat > 0 and math.isfinite(stat)
+    if exact:
+        stat_m, stat_e = _float_parts(stat)
+
+    letters = []
+    for place, place_m, place_e in places:
+        if exact and place and stat_e >= place_e:
+            remainder = math.ldexp((stat_m << (stat_e - place_e)) % place_m, place_e)
+        else:
+            try:
+                remainder = stat % place
+            except ZeroDivisionError:
+                letters.append("undefined")
+                continue
+        letters.append(_SOULSCREAM_LETTERS[math.floor(remainder / place * 10)])
+    return letters
+
+
+@functools.lru_cache(maxsize=4096)
+def _soulscream(stats, souls):
+    """Soulscream for the first `souls` souls of the five soulscream stats"""
+    # Each soul repeats the letter of every stat twice, then the first stat's letter once more
+    return "".join(a + b + c + d + e + a + b + c + d + e + a
+                   for a, b, c, d, e in zip(*[_soulscream_letters(s, souls) for s in stats]))
 
 
 class Player(Base):
@@ -27,18 +81,25 @@ class Player(Base):
 
         Returns a dictionary of players keyed by Player ID.
         """
-        if time is None:
-            players = database.get_player(list(ids))
-            return {
-                id_: cls(player) for (id_, player) in players.items()
-            }
-        else:
-            if isinstance(time, str):
-                time = parse(time)
-            players = chronicler.get_entities("player", id_=list(ids), at=time)
+        if isinstance(time, str):
+            time = parse(time)
+
+        def fetch(ids_):
+            if time is None:
+                players = database.get_player(ids_)
+                return {
+                    id_: cls(player) for (id_, player) in players.items()
+                }
+            players = chronicler.get_entities("player", id_=ids_, at=time)
             return {
                 player["entityId"]: cls(dict(player["data"], timestamp=time)) for player in players
             }
+        return cls._load_cached(ids, fetch, time)
+
+    @classmethod
+    def _load_batch(cls, ids, time=None):
+        """Batch loader for `prefetch`"""
+        return cls.load(*ids, time=time)
 
     @classmethod
     def load_one(cls, id_, time=None):
@@ -54,6 +115,28 @@ class Player(Base):
         """
         return cls.load_one(id_, time=time)
 
+    @classmethod
+    def load_at_times(cls, ids, times):
+        """
+        Load players at many points in time using a single history query, rather than one request per time.
+
+        Returns a dictionary keyed by each provided time, of dictionaries of players keyed by Player ID. If `ids`
+        is `None`, all players are loaded.
+        """
+        times = list(times)
+        if len(times) == 0:
+            return {}
+        if ids is not None:
+            ids = list(ids)
+
+        index = VersionIndex.load_for_times("player", times, id_=ids)
+        result = {}
+        for time in times:
+            parsed = parse(time) if isinstance(time, str) else time
+            versions = index.entities_at(parsed, ids)
+            result[time] = {id_: cls(dict(player["data"], timestamp=parsed)) for id_, player in versions.items()}
+        return result
+
     @classmethod
     def load_all(cls, time=None):
         """
@@ -291,30 +374,28 @@ class Player(Base):
         return self.get_soulscream()
 
     def get_soulscream(self, collapse=True):
-        letters = ["A", "E", "I", "O", "U", "X", "H", "A", "E", "I"]
-        stats = [self.pressurization, self.divinity, self.tragicness, self.shakespearianism, self.ruthlessness]
+        stats = (self.pressurization, self.divinity, self.tragicness, self.shakespearianism, self.ruthlessness)
 
-        scream = []
         if collapse:
             soul_max = min(self.soul, 300)
         else:
             soul_max = self.soul
-        for r in range(soul_max):
-            sub_scream = []
-            i = 10 ** -r
-            for s in stats:
-                try:
-                    c = math.floor((s % i) / i * 10)
-                    sub_scream.append(letters[c])
-                except ZeroDivisionError:
-                    sub_scream.append("undefined")
-            scream.extend(sub_scream + sub_scream + [sub_scream[0]])
-
-        scream = ''.join(scream)
+        scream = _soulscream(stats, soul_max)
+
         if collapse and self.soul > 300:
             scream += f"... (CONT. FOR {self.soul - 300} SOUL)"
         return scream
 
+    @classmethod
+    def get_soulscreams(cls, players, collapse=True):
+        """
+        Get the soulscreams of many players, given as a list or a dictionary keyed by player ID.
+        Returns a dictionary of soulscreams keyed by player ID.
+        """
+        if isinstance(players, dict):
+            players = players.values()
+        return {player.id: player.get_soulscream(collapse=collapse) for player in players}
+
     @Base.lazy_load("_blood_id", cache_name="_blood", use_default=False)
     def blood(self):
         if isinstance(getattr(self, "_blood_id", None), str):
@@ -339,23 +420,28 @@ class Player(Base):
     def items(self):
         return [Item(x) for x in self._items]
 
-    @Base.lazy_load("_perm_attr_ids", cache_name="_perm_attr", default_value=list())
+    @Base.lazy_load("_perm_attr_ids", cache_name="_perm_attr", default_value=list(),
+                    batch_load=Modification._load_batch)
     def perm_attr(self):
         return Modification.load(*self._perm_attr_ids)
 
-    @Base.lazy_load("_seas_attr_ids", cache_name="_seas_attr", default_value=list())
+    @Base.lazy_load("_seas_attr_ids", cache_name="_seas_attr", default_value=list(),
+                    batch_load=Modification._load_batch)
     def seas_attr(self):
         return Modification.load(*self._seas_attr_ids)
 
-    @Base.lazy_load("_week_attr_ids", cache_name="_week_attr", default_value=list())
+    @Base.lazy_load("_week_attr_ids", cache_name="_week_attr", default_value=list(),
+                    batch_load=Modification._load_batch)
     def week_attr(self):
         return Modification.load(*self._week_attr_ids)
 
-    @Base.lazy_load("_game_attr_ids", cache_name="_game_attr", default_value=list())
+    @Base.lazy_load("_game_attr_ids", cache_name="_game_attr", default_value=list(),
+                    batch_load=Modification._load_batch)
     def game_attr(self):
         return Modification.load(*self._game_attr_ids)
 
-    @Base.lazy_load("_item_attr_ids", cache_name="_item_attr", default_value=list())
+    @Base.lazy_load("_item_attr_ids", cache_name="_item_attr", default_value=list(),
+                    batch_load=Modification._load_batch)
     def item_attr(self):
         return Modification.load(*self._item_attr_ids)
 
@@ -379,6 +465,66 @@ class Player(Base):
         # alias to tournament_team_id
         return self.tournament_team_id
 
+    # Stats adjusted by `simulated_copy` for each rating, keyed by their API names
+    _SIMULATION_GROUPS = (
+        ("batting_rating", ("buoyancy", "tragicness", "patheticism", "thwackability", "divinity", "moxie",
+                            "musclitude", "martyrdom")),
+        ("pitching_rating", ("unthwackability", "ruthlessness", "overpowerment", "shakespearianism", "coldness",
+                             "suppression")),
+        ("baserunning_rating", ("laserlikeness", "continuation", "baseThirst", "indulgence", "groundFriction")),
+        ("defense_rating", ("omniscience", "tenaciousness", "watchfulness", "anticapitalism", "chasiness")),
+    )
+    # Stats where lower is better. Buffs to these are subtracted, and the result kept within 0.01 and 0.99.
+    _NEGATIVE_STATS = ("tragicness", "patheticism")
+    # Rating multipliers additionally reduce buoyancy
+    _NEGATIVE_MULTIPLIER_STATS = ("buoyancy", "tragicness", "patheticism")
+
+    @classmethod
+    def _simulation_stats(cls, key):
+        for group, stats in cls._SIMULATION_GROUPS:
+            if key in (group, "overall_rating"):
+                yield from stats
+
+    @classmethod
+    def _simulate_stats(cls, stats, overrides=None, multipliers=None, buffs=None, reroll=None, uniform=None,
+                        minimum=min, maximum=max):
+        """
+        Apply `simulated_copy` adjustments in place to a dictionary of stats keyed by API name.
+
+        `uniform` returns a new random value between 0.01 and 0.99 for rerolls. The stats may also be arrays, with
+        `minimum` and `maximum` given as element-wise functions.
+        """
+        for key, value in (overrides or {}).items():
+            stats[key] = value
+
+        for key, value in (multipliers or {}).items():
+            for name in cls._simulation_stats(key):
+                if name in cls._NEGATIVE_MULTIPLIER_STATS:
+                    stats[name] *= (1.0 - value)
+                else:
+                    stats[name] *= (1.0 + value)
+            if key in cls._NEGATIVE_STATS:
+                stats[key] *= (1.0 - value)
+            elif key in stats:
+                stats[key] *= (1.0 + value)
+
+        for key, value in (buffs or {}).items():
+            for name in cls._simulation_stats(key):
+                if name in cls._NEGATIVE_STATS:
+                    stats[name] = minimum(0.99, maximum(0.01, stats[name] - value))
+                else:
+                    stats[name] = maximum(0.01, stats[name] + value)
+            if key in cls._NEGATIVE_STATS:
+                stats[key] = minimum(0.99, maximum(0.01, stats[key] - value))
+            elif key in stats:
+                stats[key] = maximum(0.01, stats[key] + value)
+
+        for key in (reroll or {}):
+            for name in cls._simulation_stats(key):
+                stats[name] = uniform()
+            if key in cls._NEGATIVE_STATS or key in stats:
+                stats[key] = uniform()
+
     def simulated_copy(self, overrides=None, multipliers=None, buffs=None, reroll=None):
         """
         Return a copy of this player with adjusted stats (ie to simulate blessings)
@@ -391,121 +537,14 @@ class Player(Base):
         can additionally be passed to `multipliers`, `buffs`, and `reroll` to automatically multiply the
         appropriate related stats.
         """
-        overrides = overrides or {}
-        multipliers = multipliers or {}
-        buffs = buffs or {}
-        reroll = reroll or {}
-
         original_json = self.json()
         if not original_json.get("baseThirst") and original_json.get("base_thirst"):
             original_json["baseThirst"] = original_json["base_thirst"]
         if not original_json.get("groundFriction") and original_json.get("ground_friction"):
             original_json["groundFriction"] = original_json["ground_friction"]
 
-        for override_key, override_value in overrides.items():
-            original_json[override_key] = override_value
-
-        for m_key, m_val in multipliers.items():
-            if m_key in ('batting_rating', 'overall_rating'):
-                original_json['buoyancy'] *= (1.0 - m_val)
-                original_json['tragicness'] *= (1.0 - m_val)
-                original_json['patheticism'] *= (1.0 - m_val)
-                original_json['thwackability'] *= (1.0 + m_val)
-                original_json['divinity'] *= (1.0 + m_val)
-                original_json['moxie'] *= (1.0 + m_val)
-                original_json['musclitude'] *= (1.0 + m_val)
-                original_json['martyrdom'] *= (1.0 + m_val)
-            if m_key in ('pitching_rating', 'overall_rating'):
-                original_json['unthwackability'] *= (1.0 + m_val)
-                original_json['ruthlessness'] *= (1.0 + m_val)
-                original_json['overpowerment'] *= (1.0 + m_val)
-                original_json['shakespearianism'] *= (1.0 + m_val)
-                original_json['coldness'] *= (1.0 + m_val)
-                original_json['suppression'] *= (1.0 + m_val)
-            if m_key in ('baserunning_rating', 'overall_rating'):
-                original_json['laserlikeness'] *= (1.0 + m_val)
-                original_json['continuation'] *= (1.0 + m_val)
-                original_json['baseThirst'] *= (1.0 + m_val)
-                original_json['indulgence'] *= (1.0 + m_val)
-                original_json['groundFriction'] *= (1.0 + m_val)
-            if m_key in ('defense_rating', 'overall_rating'):
-                original_json['omniscience'] *= (1.0 + m_val)
-                original_json['tenaciousness'] *= (1.0 + m_val)
-                original_json['watchfulness'] *= (1.0 + m_val)
-                original_json['anticapitalism'] *= (1.0 + m_val)
-                original_json['chasiness'] *= (1.0 + m_val)
-            if m_key in ('tragicness', 'patheticism'):
-                original_json[m_key] *= (1.0 - m_val)
-            elif m_key in original_json:
-                original_json[m_key] *= (1.0 + m_val)
-
-        for b_key, b_val in buffs.items():
-            if b_key in ('batting_rating', 'overall_rating'):
-                original_json['tragicness'] = min(0.99, max(0.01, original_json['tragicness'] - b_val))
-                original_json['patheticism'] = min(0.99, max(0.01, original_json['patheticism'] - b_val))
-                original_json['buoyancy'] = max(0.01, original_json['buoyancy'] + b_val)
-                original_json['thwackability'] = max(0.01, original_json['thwackability'] + b_val)
-                original_json['divinity'] = max(0.01, original_json['divinity'] + b_val)
-                original_json['moxie'] = max(0.01, original_json['moxie'] + b_val)
-                original_json['musclitude'] = max(0.01, original_json['musclitude'] + b_val)
-                original_json['martyrdom'] = max(0.01, original_json['martyrdom'] + b_val)
-            if b_key in ('pitching_rating', 'overall_rating'):
-                original_json['unthwackability'] = max(0.01, original_json['unthwackability'] + b_val)
-                original_json['ruthlessness'] = max(0.01, original_json['ruthlessness'] + b_val)
-                original_json['overpowerment'] = max(0.01, original_json['overpowerment'] + b_val)
-                original_json['shakespearianism'] = max(0.01, original_json['shakespearianism'] + b_val)
-                original_json['coldness'] = max(0.01, original_json['coldness'] + b_val)
-                original_json['suppression'] = max(0.01, original_json['suppression'] + b_val)
-            if b_key in ('baserunning_rating', 'overall_rating'):
-                original_json['laserlikeness'] = max(0.01, original_json['laserlikeness'] + b_val)
-                original_json['continuation'] = max(0.01, original_json['continuation'] + b_val)
-                original_json['baseThirst'] = max(0.01, original_json['baseThirst'] + b_val)
-                original_json['indulgence'] = max(0.01, original_json['indulgence'] + b_val)
-                original_json['groundFriction'] = max(0.01, original_json['groundFriction'] + b_val)
-            if b_key in ('defense_rating', 'overall_rating'):
-                original_json['omniscience'] = max(0.01, original_json['omniscience'] + b_val)
-                original_json['tenaciousness'] = max(0.01, original_json['tenaciousness'] + b_val)
-                original_json['watchfulness'] = max(0.01, original_json['watchfulness'] + b_val)
-                original_json['anticapitalism'] = max(0.01, original_json['anticapitalism'] + b_val)
-                original_json['chasiness'] = max(0.01, original_json['chasiness'] + b_val)
-            if b_key in ('tragicness', 'patheticism'):
-                original_json[b_key] = min(0.99, max(0.01, original_json[b_key] - b_val))
-            elif b_key in original_json:
-                original_json[b_key] = max(0.01, original_json[b_key] + b_val)
-
-        for r_key, _ in reroll.items():
-            if r_key in ('batting_rating', 'overall_rating'):
-                original_json['buoyancy'] = random.uniform(0.01, 0.99)
-                original_json['tragicness'] = random.uniform(0.01, 0.99)
-                original_json['patheticism'] = random.uniform(0.01, 0.99)
-                original_json['thwackability'] = random.uniform(0.01, 0.99)
-                original_json['divinity'] = random.uniform(0.01, 0.99)
-                original_json['moxie'] = random.uniform(0.01, 0.99)
-                original_json['musclitude'] = random.uniform(0.01, 0.99)
-                original_json['martyrdom'] = random.uniform(0.01, 0.99)
-            if r_key in ('pitching_rating', 'overall_rating'):
-                original_json['unthwackability'] = random.uniform(0.01, 0.99)
-                original_json['ruthlessness'] = random.uniform(0.01, 0.99)
-                original_json['overpowerment'] = random.uniform(0.01, 0.99)
-                original_json['shakespearianism'] = random.uniform(0.01, 0.99)
-                original_json['coldness'] = random.uniform(0.01, 0.99)
-                original_json['suppression'] = random.uniform(0.01, 0.99)
-            if r_key in ('baserunning_rating', 'overall_rating'):
-                original_json['laserlikeness'] = random.uniform(0.01, 0.99)
-                original_json['continuation'] = random.uniform(0.01, 0.99)
-                original_json['baseThirst'] = random.uniform(0.01, 0.99)
-                original_json['indulgence'] = random.uniform(0.01, 0.99)
-                original_json['groundFriction'] = random.uniform(0.01, 0.99)
-            if r_key in ('defense_rating', 'overall_rating'):
-                original_json['omniscience'] = random.uniform(0.01, 0.99)
-                original_json['tenaciousness'] = random.uniform(0.01, 0.99)
-                original_json['watchfulness'] = random.uniform(0.01, 0.99)
-                original_json['anticapitalism'] = random.uniform(0.01, 0.99)
-                original_json['chasiness'] = random.uniform(0.01, 0.99)
-            if r_key in ('tragicness', 'patheticism'):
-                original_json[r_key] = random.uniform(0.01, 0.99)
-            elif r_key in original_json:
-                original_json[r_key] = random.uniform(0.01, 0.99)
+        self._simulate_stats(original_json, overrides, multipliers, buffs, reroll,
+                             lambda: random.uniform(0.01, 0.99))
 
         # Clear database-provided ratings to force a recalculation
         original_json['hittingRating'] = None
@@ -21,10 +21,17 @@ class Stadium(Base):
 
     @classmethod
     def load_one(cls, id_):
-        stadiums = list(chronicler.get_entities("stadium", id_=id_))
-        if len(stadiums) < 1:
-            return None
-        return cls(stadiums[0]["data"])
+        return cls._load_batch([id_]).get(id_)
+
+    @classmethod
+    def _load_batch(cls, ids, time=None):
+        """Batch loader for `prefetch`"""
+        def fetch(ids_):
+            stadiums = chronicler.get_entities("stadium", id_=ids_, at=time)
+            return {
+                x['entityId']: cls(x['data']) for x in stadiums
+            }
+        return cls._load_cached(ids, fetch, time)
 
     @classmethod
     def load_all_by_gameday(cls, season, day):
@@ -56,7 +63,7 @@ class Stadium(Base):
         ret = database.get_renovation_progress(self.id)
         return ret["progress"]["toNext"]
 
-    @Base.lazy_load("_mods_ids", cache_name="_mods", default_value=[])
+    @Base.lazy_load("_mods_ids", cache_name="_mods", default_value=[], batch_load=Modification._load_batch)
     def mods(self):
         return Modification.load(*self._mods_ids)
 
@@ -69,7 +76,6 @@ class Stadium(Base):
         return Renovation.load(*self._reno_discard_ids)
 
 
-
 class Renovation(Base):
     """
     Represents a Stadium Renovation
@@ -5,6 +5,7 @@ from .modification import Modification
 from .player import Player
 from .stadium import Stadium
 from .. import database, chronicler, tables
+from ..chronicler.version_index import VersionIndex
 
 
 class Team(Base):
@@ -21,17 +22,56 @@ class Team(Base):
         """
         Load team by ID.
         """
-        if time is None:
-            return cls(database.get_team(id_))
-        else:
-            if isinstance(time, str):
-                time = parse(time)
+        if isinstance(time, str):
+            time = parse(time)
+
+        def fetch(ids):
+            if time is None:
+                return {id_: cls(database.get_team(id_))}
 
             team = list(chronicler.get_entities("team", id_, at=time))
             if len(team) == 0:
-                return None
-            return cls(dict(team[0]["data"], timestamp=time))
+                return {}
+            return {id_: cls(dict(team[0]["data"], timestamp=time))}
+        return cls._load_cached([id_], fetch, time).get(id_)
+
+    @classmethod
+    def _load_batch(cls, ids, time=None):
+        """Batch loader for `prefetch`. Teams missing from `load_all` (such as the PODs) are left out."""
+        if isinstance(time, str):
+            time = parse(time)
+
+        def fetch(ids_):
+            if time is None:
+                return {id_: team for id_, team in cls.load_all().items() if id_ in ids_}
+
+            teams = chronicler.get_entities("team", id_=ids_, at=time)
+            return {
+                team["entityId"]: cls(dict(team["data"], timestamp=time)) for team in teams
+            }
+        return cls._load_cached(ids, fetch, time)
 
+    @classmethod
+    def load_at_times(cls, ids, times):
+        """
+        Load teams at many points in time using a single history query, rather than one request per time.
+
+        Returns a dictionary keyed by each provided time, of dictionaries of teams keyed by team ID. If `ids`
+        is `None`, all teams are loaded.
+        """
+        times = list(times)
+        if len(times) == 0:
+            return {}
+        if ids is not None:
+            ids = list(ids)
+
+        index = VersionIndex.load_for_times("team", times, id_=ids)
+        result = {}
+        for time in times:
+            parsed = parse(time) if isinstance(time, str) else time
+            versions = index.entities_at(parsed, ids)
+            result[time] = {id_: cls(dict(team["data"], timestamp=parsed)) for id_, team in versions.items()}
+        return result
 
     @classmethod
     def load_all(cls, time=None):
@@ -41,7 +81,7 @@ class Team(Base):
         Returns dictionary keyed by team ID.
         """
         if time is None:
-            return {
+            teams = {
                 id_: cls(team) for id_, team in database.get_all_teams().items()
             }
         else:
@@ -49,9 +89,11 @@ class Team(Base):
                 time = parse(time)
 
             teams = chronicler.get_entities("team", at=time)
-            return {
+            teams = {
                 team["entityId"]: cls(dict(team["data"], timestamp=time)) for team in teams
             }
+        cls._remember(teams, time)
+        return teams
 
     @classmethod
     def load_history(cls, id_, order='desc', count=None):
@@ -113,49 +155,58 @@ class Team(Base):
             return name
         return self.location
 
-    @Base.lazy_load("_lineup_ids", cache_name="_lineup", default_value=list())
+    @Base.lazy_load("_lineup_ids", cache_name="_lineup", default_value=list(), batch_load=Player._load_batch,
+                    batch_by_time=True)
     def lineup(self):
         time = getattr(self, "timestamp", None)
         players = Player.load(*self._lineup_ids, time=time)
         return [players.get(id_) for id_ in self._lineup_ids]
 
-    @Base.lazy_load("_rotation_ids", cache_name="_rotation", default_value=list())
+    @Base.lazy_load("_rotation_ids", cache_name="_rotation", default_value=list(), batch_load=Player._load_batch,
+                    batch_by_time=True)
     def rotation(self):
         time = getattr(self, "timestamp", None)
         players = Player.load(*self._rotation_ids, time=time)
         return [players.get(id_) for id_ in self._rotation_ids]
 
-    @Base.lazy_load("_bullpen_ids", cache_name="_bullpen", default_value=list())
+    @Base.lazy_load("_bullpen_ids", cache_name="_bullpen", default_value=list(), batch_load=Player._load_batch,
+                    batch_by_time=True)
     def bullpen(self):
         time = getattr(self, "timestamp", None)
         players = Player.load(*self._bullpen_ids, time=time)
         return [players.get(id_) for id_ in self._bullpen_ids]
 
-    @Base.lazy_load("_bench_ids", cache_name="_bench", default_value=list())
+    @Base.lazy_load("_bench_ids", cache_name="_bench", default_value=list(), batch_load=Player._load_batch,
+                    batch_by_time=True)
     def bench(self):
         time = getattr(self, "timestamp", None)
         players = Player.load(*self._bench_ids, time=time)
         return [players.get(id_) for id_ in self._bench_ids]
 
-    @Base.lazy_load("_shadows_ids", cache_name="_shadows", default_value=list())
+    @Base.lazy_load("_shadows_ids", cache_name="_shadows", default_value=list(), batch_load=Player._load_batch,
+                    batch_by_time=True)
     def shadows(self):
         time = getattr(self, "timestamp", None)
         players = Player.load(*self._shadows_ids, time=time)
         return [players.get(id_) for id_ in self._shadows_ids]
 
-    @Base.lazy_load("_perm_attr_ids", cache_name="_perm_attr", default_value=list())
+    @Base.lazy_load("_perm_attr_ids", cache_name="_perm_attr", default_value=list(),
+                    batch_load=Modification._load_batch)
     def perm_attr(self):
         return Modification.load(*self._perm_attr_ids)
 
-    @Base.lazy_load("_seas_attr_ids", cache_name="_seas_attr", default_value=list())
+    @Base.lazy_load("_seas_attr_ids", cache_name="_seas_attr", default_value=list(),
+                    batch_load=Modification._load_batch)
     def seas_attr(self):
         return Modification.load(*self._seas_attr_ids)
 
-    @Base.lazy_load("_week_attr_ids", cache_name="_week_attr", default_value=list())
+    @Base.lazy_load("_week_attr_ids", cache_name="_week_attr", default_value=list(),
+                    batch_load=Modification._load_batch)
     def week_attr(self):
         return Modification.load(*self._week_attr_ids)
 
-    @Base.lazy_load("_game_attr_ids", cache_name="_game_attr", default_value=list())
+    @Base.lazy_load("_game_attr_ids", cache_name="_game_attr", default_value=list(),
+                    batch_load=Modification._load_batch)
     def game_attr(self):
         return Modification.load(*self._game_attr_ids)
 
@@ -163,7 +214,7 @@ class Team(Base):
     def card(self):
         return tables.Tarot(self._card)
 
-    @Base.lazy_load("_stadium_id", cache_name="_stadium")
+    @Base.lazy_load("_stadium_id", cache_name="_stadium", batch_load=Stadium._load_batch)
     def stadium(self):
         if self._stadium_id is None:
             return None
@@ -0,0 +1,175 @@
+"""
+Client-side rate limiting
+
+Requests can be limited per base URL, with a token bucket rate limit and a cap on the number of requests in flight at
+once. Limits apply to every thread using the API wrappers (and `blaseball_mike.aio`), and the rate limit can also be
+shared between processes with a lock file. Responses served from the cache do not count against the limits.
+
+>>> from blaseball_mike import chronicler, ratelimit
+>>> ratelimit.configure_rate_limit(chronicler.v2.BASE_URL_V2, rate=10, max_in_flight=4)
+
+No limits are applied unless configured.
+"""
+import asyncio
+import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_LIMITS = {}
+_LIMITS_LOCK = threading.Lock()
+
+
+class RateLimit:
+    """
+    Token bucket rate limit with an optional cap on simultaneous requests.
+
+    Args:
+        rate: requests per second, or `None` for no rate limit
+        burst: number of requests that can be made at once after being idle, defaults to `rate` (at least 1)
+        max_in_flight: maximum number of simultaneous requests, or `None` for unlimited. This is per-process, even
+            when a lock file is used.
+        lock_file: path to a file used to share the rate limit with other processes using the same path
+    """
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None, lock_file=None):
+        if rate is not None and rate <= 0:
+            raise ValueError("Rate must be positive")
+        if lock_file is not None and fcntl is None:
+            raise ValueError("Lock files are not supported on this platform")
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate or 1)
+        self.max_in_flight = max_in_flight
+        self.lock_file = lock_file
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self._async_in_flight = weakref.WeakKeyDictionary()
+
+    def _take(self, tokens, updated, now):
+        """Take a token from a bucket state, returning the new state and how long to wait before using it"""
+        tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+        # The bucket goes into debt rather than being polled, so waiting requests are served in order
+        wait = -tokens / self.rate if tokens < 0 else 0
+        return tokens, now, wait
+
+    def _reserve(self):
+        """Reserve the next request slot, returning the number of seconds to wait for it"""
+        if self.rate is None:
+            return 0
+        if self.lock_file is not None:
+            return self._reserve_shared()
+
+        with self._lock:
+            self._tokens, self._updated, wait = self._take(self._tokens, self._updated, time.monotonic())
+        return wait
+
+    def _reserve_shared(self):
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            state = os.read(fd, 64).split()
+            now = time.time()
+            if len(state) == 2:
+                tokens, updated = float(state[0]), float(state[1])
+            else:
+                tokens, updated = self.burst, now
+            tokens, updated, wait = self._take(tokens, updated, now)
+
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{tokens!r} {updated!r}".encode())
+        finally:
+            os.close(fd)
+        return wait
+
+    def acquire(self):
+        """Block until a request may be made. Must be followed by `release` once the request completes."""
+        # Wait for an in-flight slot before taking a token, so waiting callers don't hold tokens and then all send at
+        # once when slots free up
+        if self._in_flight is not None:
+            self._in_flight.acquire()
+        try:
+            wait = self._reserve()
+            if wait > 0:
+                time.sleep(wait)
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self):
+        if self._in_flight is not None:
+            self._in_flight.release()
+
+    @contextmanager
+    def limit(self):
+        """Context manager waiting for the rate limit, and holding an in-flight slot while active"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def _wait_async(self):
+        if self.lock_file is not None:
+            # Locking the shared file can wait on other processes, so don't hold up the event loop
+            wait = await asyncio.get_running_loop().run_in_executor(None, self._reserve)
+        else:
+            wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def limit_async(self):
+        """Asyncio equivalent of `limit`"""
+        if not self.max_in_flight:
+            await self._wait_async()
+            yield
+            return
+
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_in_flight.get(loop)
+        if semaphore is None:
+            semaphore = self._async_in_flight[loop] = asyncio.Semaphore(self.max_in_flight)
+        async with semaphore:
+            await self._wait_async()
+            yield
+
+
+def configure_rate_limit(base_url, rate=None, burst=None, max_in_flight=None, lock_file=None):
+    """
+    Limit requests to URLs starting with `base_url`, such as `blaseball_mike.database.BASE_URL` or
+    `blaseball_mike.chronicler.v1.BASE_URL`. Arguments are the same as `RateLimit`. Replaces any existing limit
+    for the base URL, or removes it if no limits are given.
+    """
+    with _LIMITS_LOCK:
+        if rate is None and max_in_flight is None:
+            _LIMITS.pop(base_url, None)
+        else:
+            _LIMITS[base_url] = RateLimit(rate, burst, max_in_flight, lock_file)
+
+
+def clear_rate_limits():
+    """Remove all configured limits"""
+    with _LIMITS_LOCK:
+        _LIMITS.clear()
+
+
+def rate_limit_for(url):
+    """Get the `RateLimit` for a URL (the limit with the longest matching base URL), or `None` if it is unlimited"""
+    if not _LIMITS:
+        return None
+    with _LIMITS_LOCK:
+        matches = [base for base in _LIMITS if url.startswith(base)]
+        if not matches:
+            return None
+        return _LIMITS[max(matches, key=len)]
@@ -1,20 +1,166 @@
 import os
+import time
 import requests_cache
 from json.decoder import JSONDecodeError
+from requests.adapters import HTTPAdapter
+
+from blaseball_mike import metrics, ratelimit
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 _SESSIONS_BY_EXPIRY = {}
 
+# Cache settings may be set with environment variables, or at runtime with `configure_cache`
+_CACHE_CONFIG = {
+    "backend": os.getenv("BLASEBALL_MIKE_CACHE_BACKEND", "memory"),
+    "cache_dir": os.getenv("BLASEBALL_MIKE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "blaseball_mike")),
+    "max_entries": int(os.getenv("BLASEBALL_MIKE_CACHE_MAX_ENTRIES", 0)) or None,
+}
 
-def session(expiry=0):
-    """Get a caching HTTP session"""
 
-     # Testing requires caching be disabled or tests may fetch network data from previous tests which would be incorrect.
+_UNSET = object()
+
+
+def configure_cache(backend=None, cache_dir=None, max_entries=_UNSET):
+    """
+    Configure the response cache used by all API wrappers.
+
+    Each cache lifetime gets its own namespace (a separate database or directory within `cache_dir`), so responses
+    cached with a long lifetime are never served to callers asking for a shorter one. Changing the configuration
+    discards any sessions created with the previous settings.
+
+    These settings can also be set with the `BLASEBALL_MIKE_CACHE_BACKEND`, `BLASEBALL_MIKE_CACHE_DIR`, and
+    `BLASEBALL_MIKE_CACHE_MAX_ENTRIES` environment variables.
+
+    Args:
+        backend: requests_cache backend name, such as "memory", "sqlite", or "filesystem"
+        cache_dir: directory to store persistent caches in
+        max_entries: maximum number of responses to keep per namespace, or `None` for unlimited. The oldest
+            responses are evicted when a session is created and after every `max_entries // 10` new responses.
+
+    Settings that aren't passed keep their current values.
+    """
+    if backend is not None:
+        _CACHE_CONFIG["backend"] = backend
+    if cache_dir is not None:
+        _CACHE_CONFIG["cache_dir"] = cache_dir
+    if max_entries is not _UNSET:
+        _CACHE_CONFIG["max_entries"] = max_entries
+
+    for s in _SESSIONS_BY_EXPIRY.values():
+        s.close()
+    _SESSIONS_BY_EXPIRY.clear()
+
+
+def _cache_name(expiry):
+    namespace = "forever" if expiry is None else f"expiry_{expiry}"
+    return os.path.join(_CACHE_CONFIG["cache_dir"], namespace)
+
+
+def _entry_created(entry):
+    # requests_cache < 0.6 stores (response, created_at) tuples, newer versions store a CachedResponse
+    if isinstance(entry, tuple):
+        return entry[1]
+    return entry.created_at
+
+
+def prune_cache(session_, max_entries=None):
+    """
+    Remove expired responses from a session's cache, then evict the oldest responses until at most
+    `max_entries` remain.
+    """
+    cache = session_.cache
+    if hasattr(cache, "delete") and hasattr(cache, "filter"):
+        cache.delete(expired=True)
+    else:
+        session_.remove_expired_responses()
+
+    if max_entries is None or len(cache.responses) <= max_entries:
+        return
+
+    entries = sorted(cache.responses.items(), key=lambda x: _entry_created(x[1]))
+    for key, _ in entries[:len(entries) - max_entries]:
+        cache.delete(key)
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter applying `blaseball_mike.ratelimit` limits, so only requests that reach the network wait"""
+
+    def send(self, request, stream=False, **kwargs):
+        limit = ratelimit.rate_limit_for(request.url)
+        if limit is None:
+            return super().send(request, stream=stream, **kwargs)
+
+        with limit.limit():
+            response = super().send(request, stream=stream, **kwargs)
+            if not stream:
+                # Download the body while holding the in-flight slot
+                response.content
+            return response
+
+
+class _InstrumentedSession(requests_cache.CachedSession):
+    """
+    Caching session that records every request in `blaseball_mike.metrics`, applies rate limits, and keeps its
+    cache to the configured `max_entries`
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        adapter = _RateLimitedAdapter()
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        # Set by `session`; requests_cache versions disagree on where they keep `expire_after`
+        self.expiry = None
+        self._new_responses = 0
+
+    def _count_new_response(self):
+        max_entries = _CACHE_CONFIG["max_entries"]
+        if max_entries is None:
+            return
+        # Pruning sorts the whole cache, so it is done in batches, letting the cache run a tenth over its limit
+        self._new_responses += 1
+        if self._new_responses >= max(max_entries // 10, 1):
+            self._new_responses = 0
+            prune_cache(self, max_entries)
+
+    def request(self, method, url, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception as e:
+            metrics.record(method, url, None, time.perf_counter() - start, 0, error=type(e).__name__)
+            raise
+        from_cache = getattr(response, "from_cache", False)
+        metrics.record(method, response.url or url, response.status_code, time.perf_counter() - start,
+                       len(response.content), from_cache)
+        if not from_cache and self.expiry != 0:
+            self._count_new_response()
+        return response
+
+
+def cache_expiry(expiry):
+    """Get the cache lifetime to use for a requested lifetime, honoring `BLASEBALL_MIKE_NOCACHE`"""
+    # Testing requires caching be disabled or tests may fetch network data from previous tests which would be incorrect.
     if os.getenv("BLASEBALL_MIKE_NOCACHE", None):
-        expiry = 0
+        return 0
+    return expiry
+
+
+def session(expiry=0):
+    """Get a caching HTTP session"""
+    expiry = cache_expiry(expiry)
 
     if expiry not in _SESSIONS_BY_EXPIRY:
-        _SESSIONS_BY_EXPIRY[expiry] = requests_cache.CachedSession(backend="memory", expire_after=expiry)
+        backend = _CACHE_CONFIG["backend"]
+        if backend == "memory" or expiry == 0:
+            # Nothing would ever be read back from a zero-lifetime cache, so don't bother persisting it
+            s = _InstrumentedSession(backend="memory", expire_after=expiry)
+        else:
+            os.makedirs(_CACHE_CONFIG["cache_dir"], exist_ok=True)
+            s = _InstrumentedSession(_cache_name(expiry), backend=backend, expire_after=expiry)
+            prune_cache(s, _CACHE_CONFIG["max_entries"])
+        s.expiry = expiry
+        _SESSIONS_BY_EXPIRY[expiry] = s
     return _SESSIONS_BY_EXPIRY[expiry]
 
 
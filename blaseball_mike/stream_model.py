@@ -1,6 +1,9 @@
 """For deserializing stream data."""
+import functools
+
 from dateutil.parser import parse
 
+from blaseball_mike.events import EventState, apply_patch
 from blaseball_mike.models import (
     Base,
     Division,
@@ -102,3 +105,217 @@ class Fights(StreamComponent):
     def __init__(self, data, parent):
         self._parent = parent
         self.boss_fights = {g['id']: Fight(g) for g in data.get('bossFights', [])}
+
+
+# List collections of the stream data, keyed by path: (change set attribute, model class)
+_COLLECTIONS = {
+    ("games", "schedule"): ("games", Game),
+    ("leagues", "teams"): ("teams", Team),
+    ("leagues", "subleagues"): ("subleagues", Subleague),
+    ("leagues", "divisions"): ("divisions", Division),
+    ("leagues", "leagues"): ("leagues", League),
+    ("fights", "bossFights"): ("fights", Fight),
+}
+_COMPONENTS = {
+    "games": StreamGames,
+    "leagues": StreamLeagues,
+    "fights": Fights,
+}
+_GAMES_PARTS = (("games", "sim"), ("games", "season"))
+# Parts of the games section `StreamGames` doesn't model, so changes to them don't rebuild anything
+_GAMES_UNMODELED = (("games", "tomorrowSchedule"), ("games", "standings"), ("games", "postseason"))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_path(path):
+    # Stream patches only touch a limited set of paths, so each is parsed once
+    return tuple(token.replace("~1", "/").replace("~0", "~") for token in path.split("/")[1:])
+
+
+class StreamChanges:
+    """
+    Parts of the stream touched by an update.
+
+    Attributes:
+        games: IDs of games added, changed, or removed from the schedule
+        teams: IDs of teams added, changed, or removed
+        subleagues: IDs of subleagues added, changed, or removed
+        divisions: IDs of divisions added, changed, or removed
+        leagues: IDs of leagues added, changed, or removed
+        fights: IDs of boss fights added, changed, or removed
+        sections: other parts of the stream that changed, by path (such as "games/sim" or "temporal")
+        full: whether the whole stream was replaced
+    """
+
+    def __init__(self, full=False):
+        self.games = set()
+        self.teams = set()
+        self.subleagues = set()
+        self.divisions = set()
+        self.leagues = set()
+        self.fights = set()
+        self.sections = set()
+        self.full = full
+
+    def __bool__(self):
+        return self.full or bool(self.sections) or any(getattr(self, name) for name, _ in _COLLECTIONS.values())
+
+    def __repr__(self):
+        touched = {name: len(getattr(self, name)) for name, _ in _COLLECTIONS.values() if getattr(self, name)}
+        return f"<StreamChanges: full={self.full} {touched} sections={sorted(self.sections)}>"
+
+
+class StreamState(EventState):
+    """
+    Stream state which keeps a `StreamData` model up to date incrementally.
+
+    Patches only rebuild the models they touch, such as a single `Game` when its score changes, rather than the whole
+    `StreamData`. Each update returns a `StreamChanges` of what was touched. Use with `events.stream_events`:
+
+    >>> state = StreamState()
+    >>> async for changes in stream_events(state=state):
+    ...     for id_ in changes.games:
+    ...         print(state.model.games.schedule.games.get(id_))
+
+    Attributes:
+        data: current raw stream data
+        model: current `StreamData`
+    """
+
+    def __init__(self, data=None):
+        super().__init__()
+        self.model = StreamData({})
+        self._sources = {key: {} for key in _COLLECTIONS}
+        if data is not None:
+            self.apply_value(data)
+
+    def _container(self, key):
+        if key == ("games", "schedule"):
+            return self.model.games.schedule.games
+        if key == ("fights", "bossFights"):
+            return self.model.fights.boss_fights
+        return getattr(self.model.leagues, key[1])
+
+    def _items(self, key):
+        data = self.data.get(key[0], {})
+        return data.get(key[1], []) if isinstance(data, dict) else []
+
+    def _reset_sources(self, keys, changes):
+        for key in keys:
+            old = self._sources[key]
+            self._sources[key] = {item["id"]: item for item in self._items(key)}
+            getattr(changes, _COLLECTIONS[key][0]).update(old.keys() | self._sources[key].keys())
+
+    def apply_value(self, value):
+        self.data = value
+        self.model = StreamData(value)
+        changes = StreamChanges(full=True)
+        self._reset_sources(_COLLECTIONS, changes)
+        return changes
+
+    def apply_patch(self, ops):
+        changes = StreamChanges()
+        dirty = {key: {} for key in _COLLECTIONS}
+        structural = set()
+        rebuild = set()
+        parts = set()
+        parents = {}
+
+        for op in ops:
+            # One at a time, since classifying an operation looks up items by their current index. The source of a
+            # move or copy is looked up before the operation can shift it.
+            if "from" in op:
+                self._classify(_parse_path(op["from"]), dirty, structural, rebuild, parts, changes)
+            self.data = apply_patch(self.data, (op,), parents)
+            self._classify(_parse_path(op["path"]), dirty, structural, rebuild, parts, changes)
+
+        if None in rebuild:
+            return self.apply_value(self.data)
+
+        for top in rebuild:
+            self._rebuild_component(top, changes)
+        if "games" not in rebuild:
+            games = self.model.games
+            if "sim" in parts:
+                games.sim = Sim(self.data["games"].get("sim", {}), self.model)
+            if "season" in parts:
+                games.season = Season(self.data["games"].get("season", {}))
+        for key in structural:
+            if key[0] not in rebuild:
+                self._sync_collection(key, dirty[key], changes)
+        for key, items in dirty.items():
+            if key[0] in rebuild or key in structural:
+                continue
+            name, cls = _COLLECTIONS[key]
+            container = self._container(key)
+            for item in items.values():
+                container[item["id"]] = cls(item)
+                self._sources[key][item["id"]] = item
+                getattr(changes, name).add(item["id"])
+        return changes
+
+    def _classify(self, tokens, dirty, structural, rebuild, parts, changes):
+        if not tokens:
+            rebuild.add(None)
+            return
+        top = tokens[0]
+        if top not in _COMPONENTS:
+            if top == "temporal":
+                self.model.temporal = self.data.get("temporal", {})
+            changes.sections.add(top)
+            return
+        if len(tokens) == 1:
+            rebuild.add(top)
+            return
+
+        key = tokens[:2]
+        if key in _COLLECTIONS:
+            if len(tokens) <= 3 or (len(tokens) == 4 and tokens[3] == "id"):
+                structural.add(key)
+            else:
+                item = self.data[top][tokens[1]][int(tokens[2])]
+                dirty[key][id(item)] = item
+        elif key in _GAMES_PARTS:
+            # Rebuilt once the whole frame is applied
+            parts.add(tokens[1])
+            changes.sections.add("/".join(key))
+        elif key in _GAMES_UNMODELED:
+            changes.sections.add("/".join(key))
+        else:
+            rebuild.add(top)
+
+    def _rebuild_component(self, top, changes):
+        value = self.data.get(top, {})
+        if top == "games":
+            self.model.games = StreamGames(value, self.model)
+        elif top == "leagues":
+            self.model.leagues = StreamLeagues(value, self.model)
+        else:
+            self.model.fights = Fights(value, self.model)
+        changes.sections.add(top)
+        self._reset_sources([key for key in _COLLECTIONS if key[0] == top], changes)
+
+    def _sync_collection(self, key, dirty, changes):
+        """Re-key a collection after items were added, removed, or moved, reusing the models of untouched items"""
+        name, cls = _COLLECTIONS[key]
+        touched = getattr(changes, name)
+        old_models = self._container(key)
+        old_sources = self._sources[key]
+
+        models = {}
+        sources = {}
+        for item in self._items(key):
+            id_ = item["id"]
+            if old_sources.get(id_) is item and id(item) not in dirty:
+                models[id_] = old_models[id_]
+            else:
+                models[id_] = cls(item)
+                touched.add(id_)
+            sources[id_] = item
+        touched.update(old_sources.keys() - sources.keys())
+
+        old_models.clear()
+        old_models.update(models)
+        self._sources[key] = sources
+        if key == ("games", "schedule"):
+            self.model.games.schedule.fields = list(models)
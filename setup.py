@@ -25,5 +25,9 @@ setuptools.setup(
     long_description_content_type='text/markdown',
     packages=setuptools.find_packages(),
     install_requires=install_requires,
+    extras_require={
+        'frames': ['numpy'],
+        'columnar': ['pyarrow>=14'],
+    },
     python_requires="~=3.8",
 )
@@ -1,5 +1,7 @@
 from blaseball_mike.models import Base
+import copy
 import json
+import requests
 
 TEST_DATA_DIR = "tests/test_data"
 CASSETTE_DIR = f'{TEST_DATA_DIR}/cassettes'
@@ -48,3 +50,61 @@ def base_test(base_obj):
     TestBase.json_test(base_obj)
     TestBase.json_feedback_test(base_obj)
     TestBase.docgen_test(base_obj)
+
+
+class FakeResponse:
+    """Minimal stand-in for a `requests.Response` carrying JSON data"""
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def json(self):
+        return self.data
+
+
+class FakePagedSession:
+    """
+    Serves a list of items as a paged Chronicler response, recording the parameters of each request
+    """
+    def __init__(self, items):
+        self.items = items
+        self.requests = []
+
+    def get(self, url, params=None):
+        params = dict(params or {})
+        self.requests.append(params)
+        start = int(params.get("page", 0))
+        end = start + params["count"]
+        next_page = str(end) if end < len(self.items) else None
+        return FakeResponse({"items": self.items[start:end], "nextPage": next_page})
+
+
+class FakeJSONSession:
+    """
+    Serves fixed JSON responses keyed by URL suffix, recording each requested URL
+    """
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def get(self, url, params=None):
+        self.requests.append(url)
+        for suffix, data in self.responses.items():
+            if url.endswith(suffix):
+                return FakeResponse(copy.deepcopy(data))
+        return FakeResponse(None, status_code=404)
+
+
+def load_stream_value():
+    """
+    Full event stream data, from a recorded Chronicler response
+    """
+    import yaml
+    with open(f'{CASSETTE_DIR}/test_chronicler_v2_entities[stream-None-2000].yaml') as f:
+        cassette = yaml.safe_load(f)
+    body = json.loads(cassette["interactions"][0]["response"]["body"]["string"])
+    return body["items"][0]["data"]["value"]
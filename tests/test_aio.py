@@ -0,0 +1,143 @@
+"""
+Unit Tests for the asyncio API wrappers
+"""
+
+import asyncio
+import pytest
+from aiohttp import web
+from blaseball_mike import aio, metrics
+
+
+def run_against_server(monkeypatch, routes, coro_fn):
+    """
+    Serve `routes` on localhost, point the async wrappers at it, and run `coro_fn`
+    """
+    async def runner():
+        app = web.Application()
+        app.add_routes(routes)
+        server = web.AppRunner(app)
+        await server.setup()
+        site = web.TCPSite(server, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(aio, "BASE_URL", f"http://127.0.0.1:{port}")
+        try:
+            return await coro_fn()
+        finally:
+            await aio.close()
+            await server.cleanup()
+
+    return asyncio.run(runner())
+
+
+def test_get_player(monkeypatch):
+    """
+    Player lists are joined into one request and keyed by ID
+    """
+    seen = []
+
+    async def players(request):
+        seen.append(request.query["ids"])
+        return web.json_response([{"id": i, "name": i.upper()} for i in request.query["ids"].split(",")])
+
+    with metrics.record_requests() as trace:
+        result = run_against_server(monkeypatch, [web.get("/database/players", players)],
+                                    lambda: aio.get_player(["abc", "def"]))
+    assert result == {"abc": {"id": "abc", "name": "ABC"}, "def": {"id": "def", "name": "DEF"}}
+    assert seen == ["abc,def"]
+    assert [(x.endpoint, x.status) for x in trace] == [("/database/players", 200)]
+
+
+def test_concurrent_requests_share_fetch(monkeypatch):
+    """
+    Simultaneous identical requests only hit the network once, and each caller gets its own copy
+    """
+    calls = []
+
+    async def team(request):
+        calls.append(request.query["id"])
+        await asyncio.sleep(0.05)
+        return web.json_response({"id": request.query["id"]})
+
+    async def fetch_many():
+        return await asyncio.gather(*[aio.get_team("crabs", cache_time=0) for _ in range(5)])
+
+    results = run_against_server(monkeypatch, [web.get("/database/team", team)], fetch_many)
+    assert calls == ["crabs"]
+    assert all(r == {"id": "crabs"} for r in results)
+    assert len({id(r) for r in results}) == 5
+
+
+def test_invalid_json(monkeypatch):
+    async def bad(request):
+        return web.Response(text="not json")
+
+    with pytest.raises(ValueError):
+        run_against_server(monkeypatch, [web.get("/database/globalEvents", bad)], aio.get_global_events)
+
+
+def test_wrappers_match_database():
+    """
+    Every wrapper in `blaseball_mike.database` has a coroutine taking the same arguments
+    """
+    import inspect
+    from blaseball_mike import database
+
+    names = [name for name, fn in vars(database).items() if name.startswith("get_") and inspect.isfunction(fn)]
+    assert names
+    for name in names:
+        coro = getattr(aio, name)
+        assert inspect.iscoroutinefunction(coro)
+        assert coro.__module__ == aio.__name__
+        assert inspect.signature(coro) == inspect.signature(getattr(database, name))
+
+
+def test_get_player_batches(monkeypatch):
+    """
+    Long ID lists are requested in concurrent batches, as with the blocking wrappers
+    """
+    from blaseball_mike import database
+    seen = []
+
+    async def players(request):
+        seen.append(request.query["ids"])
+        return web.json_response([{"id": i} for i in request.query["ids"].split(",")])
+
+    database.configure_id_batches(batch_size=2)
+    try:
+        result = run_against_server(monkeypatch, [web.get("/database/players", players)],
+                                    lambda: aio.get_player(["a", "b", "c", "a", "d", "e"]))
+    finally:
+        database.configure_id_batches()
+    assert list(result) == ["a", "b", "c", "d", "e"]
+    assert sorted(seen) == ["a,b", "c,d", "e"]
+
+
+def test_get_items_keeps_duplicates(monkeypatch):
+    async def items(request):
+        return web.json_response([{"id": i} for i in request.query["ids"].split(",")])
+
+    result = run_against_server(monkeypatch, [web.get("/database/items", items)],
+                                lambda: aio.get_items(["a", "b", "a"]))
+    assert [x["id"] for x in result] == ["a", "b", "a"]
+
+
+def test_response_cache_size(monkeypatch):
+    monkeypatch.delenv("BLASEBALL_MIKE_NOCACHE", raising=False)
+    calls = []
+
+    async def team(request):
+        calls.append(request.query["id"])
+        return web.json_response({"id": request.query["id"]})
+
+    async def fetch():
+        for id_ in ("a", "b", "a", "c", "b", "a"):
+            await aio.get_team(id_, cache_time=None)
+
+    aio.configure(cache_size=2)
+    try:
+        run_against_server(monkeypatch, [web.get("/database/team", team)], fetch)
+    finally:
+        aio.configure()
+    # "a" is used again before "c" arrives, so "b" is evicted rather than "a", and then "a" to make room for "b"
+    assert calls == ["a", "b", "c", "b", "a"]
@@ -2,7 +2,11 @@
 Unit Tests for the Base model class
 """
 
-from blaseball_mike.models import Base
+import pytest
+from blaseball_mike import chronicler, database
+from blaseball_mike.models import Base, Modification, Player, Team, prefetch, enable_identity_map, \
+    disable_identity_map, clear_identity_map, enable_compact_models, disable_compact_models
+from .helpers import FakeResponse
 
 
 def test_eq():
@@ -33,3 +37,275 @@ def test_repr():
     assert repr(obj_id) == "<Base: 1234>"
     assert repr(obj_int) == "<Base: 5678>"
     assert isinstance(repr(obj_bad), str)  # Just make sure it doesnt raise an exception
+
+
+def load_things(ids, time=None):
+    Thing.batches.append((list(ids), time))
+    return {id_: f"loaded-{id_}" for id_ in ids if id_ != "missing"}
+
+
+class Thing(Base):
+    batches = []
+
+    def load_one(self, id_):
+        return f"single-{id_}"
+
+    @Base.lazy_load("_part_ids", cache_name="_parts", default_value=list(), batch_load=load_things)
+    def parts(self):
+        return [self.load_one(id_) for id_ in self._part_ids]
+
+    @Base.lazy_load("_owner_id", cache_name="_owner", batch_load=load_things, batch_by_time=True)
+    def owner(self):
+        return self.load_one(self._owner_id)
+
+    @Base.lazy_load("_name")
+    def name(self):
+        return self._name
+
+
+def test_prefetch():
+    """
+    Lazy attributes are resolved with shared, chunked batch requests
+    """
+    Thing.batches = []
+    things = [
+        Thing({"parts": ["a", "b"], "owner": "x"}),
+        Thing({"parts": ["b", "c"], "owner": "y"}),
+        Thing({"parts": ["c", "missing"], "owner": None}),
+        Thing({"parts": [], "owner": "a"}),
+    ]
+    prefetch(things, "parts", "owner", chunk_size=3)
+
+    # IDs are shared across attributes, deduplicated, and chunked
+    assert Thing.batches == [(["a", "b", "c"], None), (["missing", "x", "y"], None)]
+
+    assert things[0].parts == ["loaded-a", "loaded-b"]
+    assert things[1].owner == "loaded-y"
+    assert things[3].owner == "loaded-a"
+    # Unresolved attributes fall back to the regular loader
+    assert things[2].parts == ["single-c", "single-missing"]
+    assert things[3].parts == []
+    assert len(Thing.batches) == 2
+
+
+def test_prefetch_by_time():
+    """
+    Time-dependent attributes are batched per timestamp
+    """
+    Thing.batches = []
+    things = [
+        Thing({"owner": "x", "timestamp": "2021-03-01T00:00:00Z"}),
+        Thing({"owner": "y", "timestamp": "2021-03-02T00:00:00Z"}),
+        Thing({"owner": "z", "timestamp": "2021-03-01T00:00:00Z"}),
+    ]
+    prefetch(things, "owner")
+    assert Thing.batches == [(["x", "z"], "2021-03-01T00:00:00Z"), (["y"], "2021-03-02T00:00:00Z")]
+    assert [t.owner for t in things] == ["loaded-x", "loaded-y", "loaded-z"]
+
+
+def test_prefetch_unsupported():
+    with pytest.raises(ValueError):
+        prefetch([Thing({"name": "a"})], "name")
+
+
+def test_prefetch_team_rosters(monkeypatch):
+    """
+    Team rosters resolve with one player request for all teams
+    """
+    requests = []
+
+    def load_batch(ids, time=None):
+        requests.append(list(ids))
+        return {id_: Base({"id": id_}) for id_ in ids}
+    monkeypatch.setattr(Team.lineup, "batch_load", load_batch)
+    monkeypatch.setattr(Team.rotation, "batch_load", load_batch)
+
+    teams = [
+        Team({"id": "t1", "lineup": ["p1", "p2"], "rotation": ["p3"]}),
+        Team({"id": "t2", "lineup": ["p4"], "rotation": ["p5", "p1"]}),
+    ]
+    prefetch(teams, "lineup", "rotation")
+    assert requests == [["p1", "p2", "p4", "p3", "p5"]]
+    assert [p.id for p in teams[1].rotation] == ["p5", "p1"]
+
+
+@pytest.fixture
+def identity_map():
+    enable_identity_map(max_size=3, ttl=60)
+    yield
+    disable_identity_map()
+
+
+@pytest.fixture
+def fake_players(monkeypatch):
+    requests = []
+
+    def get_player(ids, cache_time=5):
+        requests.append(list(ids))
+        return {id_: {"id": id_, "name": f"Player {id_}"} for id_ in ids}
+    monkeypatch.setattr(database, "get_player", get_player)
+    return requests
+
+
+def test_identity_map(identity_map, fake_players):
+    """
+    Models are shared between loads while the identity map is enabled
+    """
+    first = Player.load("a", "b")
+    second = Player.load("b", "c")
+    assert second["b"] is first["b"]
+    assert list(second.keys()) == ["b", "c"]
+    assert fake_players == [["a", "b"], ["c"]]
+
+    assert Player.load_one("a") is first["a"]
+
+    clear_identity_map()
+    assert Player.load_one("a") is not first["a"]
+
+
+def test_identity_map_eviction(identity_map, fake_players):
+    Player.load("a", "b", "c")
+    Player.load_one("a")  # Refresh "a" so "b" is the least recently used
+    Player.load_one("d")
+    fake_players.clear()
+    Player.load("a", "b", "c", "d")
+    assert fake_players == [["b"]]
+
+
+def test_identity_map_ttl(fake_players):
+    enable_identity_map(ttl=0)
+    try:
+        Player.load_one("a")
+        Player.load_one("a")
+        assert fake_players == [["a"], ["a"]]
+    finally:
+        disable_identity_map()
+
+
+def test_identity_map_disabled(fake_players):
+    assert Player.load_one("a") is not Player.load_one("a")
+    assert len(fake_players) == 2
+
+
+def test_identity_map_modifications(identity_map, monkeypatch):
+    requests = []
+
+    def get_attributes(ids, cache_time=5):
+        requests.append(list(ids))
+        return [{"id": id_, "title": id_.title()} for id_ in ids]
+    monkeypatch.setattr(database, "get_attributes", get_attributes)
+
+    fireproof = Modification.load_one("FIREPROOF")
+    assert [m.id for m in Modification.load("SHELLED", "FIREPROOF")] == ["SHELLED", "FIREPROOF"]
+    assert Modification.load("FIREPROOF")[0] is fireproof
+    assert requests == [["FIREPROOF"], ["SHELLED"]]
+
+
+def test_identity_map_time(identity_map, fake_players, monkeypatch):
+    """
+    Historical lookups are kept separate from current ones, with string and datetime times sharing entries
+    """
+    def get_entities(type_, id_=None, at=None):
+        return [{"entityId": x, "data": {"id": x}} for x in id_]
+    monkeypatch.setattr(chronicler, "get_entities", get_entities)
+
+    current = Player.load_one("a")
+    historical = Player.load_one("a", time="2021-03-01T00:00:00Z")
+    assert historical is not current
+    assert Player.load_one("a", time=historical.timestamp) is historical
+
+
+def test_key_conversion():
+    """
+    API keys map to snake_case attributes, and back again in json()
+    """
+    assert Base._from_api_conversion("hitStreak") == "hit_streak"
+    assert Base._from_api_conversion("_id") == "id"
+    assert Base._from_api_conversion("hitStreak") is Base._from_api_conversion("hitStreak")
+
+    data = {"_id": "a", "hitStreak": 2, "permAttr": ["FIREPROOF"]}
+    player = Player(data)
+    assert player.id == "a"
+    assert player.hit_streak == 2
+    assert player._perm_attr_ids == ["FIREPROOF"]
+    assert player.json() == data
+
+
+@pytest.fixture
+def compact_models():
+    enable_compact_models()
+    yield
+    disable_compact_models()
+
+
+def test_compact_models(compact_models):
+    """
+    Compact models behave like regular models while sharing their key tables
+    """
+    data = {"id": "a", "name": "Player A", "permAttr": ["FIREPROOF"], "hitStreak": 2}
+    first = Player(data)
+    second = Player(dict(data, id="b"))
+
+    assert first.fields is second.fields
+    assert first.key_transform_lookup is second.key_transform_lookup
+    assert "_perm_attr" not in vars(first)
+    assert first.hit_streak == 2
+    assert first.json() == data
+    assert Player(first.json()) == first
+
+    disable_compact_models()
+    assert Player(data) == first
+
+
+def test_compact_models_cache(compact_models):
+    """
+    Cached lazy-loaded values are still reset when the original value is replaced
+    """
+    things = [Thing({"owner": "x"})]
+    Thing.batches = []
+    prefetch(things, "owner")
+    assert things[0].owner == "loaded-x"
+    things[0].owner = "y"
+    assert things[0].owner == "single-y"
+
+
+@pytest.mark.parametrize("enabled", (False, True))
+def test_load_list_order(monkeypatch, enabled):
+    """
+    Lists of models keep the API's order and duplicates without the identity map, and the requested order with it
+    """
+    def get_attributes(ids, cache_time=5):
+        return [{"id": id_} for id_ in reversed(ids)]
+    monkeypatch.setattr(database, "get_attributes", get_attributes)
+
+    if enabled:
+        enable_identity_map()
+    try:
+        mods = [m.id for m in Modification.load("A", "B", "C", "A")]
+    finally:
+        disable_identity_map()
+    assert mods == (["A", "B", "C", "A"] if enabled else ["A", "C", "B", "A"])
+
+
+@pytest.mark.parametrize("enabled", (False, True))
+def test_load_list_duplicates(monkeypatch, enabled):
+    """
+    Duplicate IDs are requested and returned through the batched database wrappers
+    """
+    urls = []
+
+    class Session:
+        def get(self, url, params=None):
+            urls.append(url)
+            ids = url.split("ids=")[1].split(",")
+            return FakeResponse([{"id": id_} for id_ in ids])
+    monkeypatch.setattr(database, "session", lambda cache_time: Session())
+
+    if enabled:
+        enable_identity_map()
+    try:
+        mods = [m.id for m in Modification.load("A", "A")]
+    finally:
+        disable_identity_map()
+    assert mods == ["A", "A"]
+    assert urls == [f"{database.BASE_URL}/database/mods?ids={'A' if enabled else 'A,A'}"]
@@ -2,9 +2,14 @@
 Unit Tests for Chronicler Endpoints
 """
 
+import json
 import pytest
+import requests
+import time
 import types
 import blaseball_mike.chronicler as chron
+from datetime import datetime
+from .helpers import FakePagedSession, FakeJSONSession, FakeResponse
 
 
 @pytest.mark.vcr
@@ -187,3 +192,172 @@ def test_chronicler_v2_versions(type, id, count):
     assert len(data) > 0
     if count is not None:
         assert len(data) == count
+
+
+@pytest.mark.parametrize("prefetch", (0, 1, 3))
+@pytest.mark.parametrize(["total_count", "expected"], [(None, 1000), (500, 500), (999, 999)])
+def test_paged_get(prefetch, total_count, expected):
+    items = list(range(1000))
+    session = FakePagedSession(items)
+    data = chron.paged_get("http://chronicler", {}, session, total_count=total_count, page_size=100,
+                           prefetch=prefetch)
+    assert data == items[:expected]
+
+
+def test_paged_get_prefetch_error():
+    """
+    Errors on the prefetch thread are raised to the caller, after the pages fetched before it
+    """
+    class FailingSession(FakePagedSession):
+        def get(self, url, params=None):
+            if params.get("page") == "200":
+                raise ConnectionError("Network hiccup")
+            return super().get(url, params)
+
+    data = chron.paged_get_lazy("http://chronicler", {}, FailingSession(list(range(1000))), page_size=100, prefetch=2)
+    assert [next(data) for _ in range(200)] == list(range(200))
+    with pytest.raises(ConnectionError):
+        next(data)
+
+
+def test_paged_get_prefetch_early_exit():
+    """
+    Abandoning a prefetching generator stops the background thread
+    """
+    session = FakePagedSession(list(range(10000)))
+    data = chron.paged_get_lazy("http://chronicler", {}, session, page_size=10, prefetch=2)
+    assert next(data) == 0
+    data.close()
+    time.sleep(0.3)
+    fetched = len(session.requests)
+    time.sleep(0.3)
+    assert len(session.requests) == fetched
+    assert fetched < 10
+
+
+@pytest.fixture
+def fast_retries():
+    chron.configure_retries(retries=2, backoff=0.001)
+    yield
+    chron.configure_retries()
+
+
+class FlakySession(FakePagedSession):
+    """
+    Fails requests for the given pages with a status code, a set number of times each
+    """
+    def __init__(self, items, failures, status_code=503):
+        super().__init__(items)
+        self.failures = dict(failures)
+        self.status_code = status_code
+
+    def get(self, url, params=None):
+        page = params.get("page")
+        if self.failures.get(page, 0) > 0:
+            self.failures[page] -= 1
+            self.requests.append(dict(params))
+            return FakeResponse(None, status_code=self.status_code)
+        return super().get(url, params)
+
+
+def test_paged_get_retry(fast_retries):
+    session = FlakySession(list(range(1000)), {"200": 2, "700": 1})
+    assert chron.paged_get("http://chronicler", {}, session, page_size=100) == list(range(1000))
+    assert len(session.requests) == 13
+
+
+@pytest.mark.parametrize(["status_code", "failures", "attempts"], [(503, 3, 3), (404, 1, 1)])
+def test_paged_get_retry_failure(fast_retries, status_code, failures, attempts):
+    session = FlakySession(list(range(1000)), {"200": failures}, status_code)
+    with pytest.raises(requests.HTTPError):
+        chron.paged_get("http://chronicler", {}, session, page_size=100)
+    assert [x.get("page") for x in session.requests].count("200") == attempts
+
+
+@pytest.mark.parametrize("prefetch", (0, 2))
+@pytest.mark.parametrize(["total_count", "expected"], [(None, 1000), (750, 750)])
+def test_paged_get_cursor_resume(fast_retries, prefetch, total_count, expected):
+    """
+    A query interrupted by an error can be resumed from a saved cursor without repeating consumed pages
+    """
+    items = list(range(1000))
+    cursor = chron.PageCursor()
+    data = []
+    with pytest.raises(requests.HTTPError):
+        for x in chron.paged_get_lazy("http://chronicler", {}, FlakySession(items, {"500": 5}), total_count,
+                                      page_size=100, prefetch=prefetch, cursor=cursor):
+            data.append(x)
+    assert (cursor.page, cursor.count, cursor.done) == ("500", 500, False)
+
+    cursor = chron.PageCursor(**json.loads(json.dumps(cursor.json())))
+    session = FakePagedSession(items)
+    data.extend(chron.paged_get("http://chronicler", {}, session, total_count, page_size=100, prefetch=prefetch,
+                                cursor=cursor))
+    assert data == items[:expected]
+    assert session.requests[0]["page"] == "500"
+    assert cursor.done and cursor.count == expected
+
+    assert chron.paged_get("http://chronicler", {}, session, total_count, page_size=100, cursor=cursor) == []
+
+
+@pytest.mark.parametrize("prefetch", (0, 2))
+def test_paged_get_cursor_resume_list(fast_retries, prefetch):
+    """
+    A cursor isn't moved by a list query that fails part way, since the pages it fetched are lost
+    """
+    items = list(range(1000))
+    cursor = chron.PageCursor()
+    with pytest.raises(requests.HTTPError):
+        chron.paged_get("http://chronicler", {}, FlakySession(items, {"300": 5}), page_size=100, prefetch=prefetch,
+                        cursor=cursor)
+    assert (cursor.page, cursor.count, cursor.done) == (None, 0, False)
+
+    assert chron.paged_get("http://chronicler", {}, FakePagedSession(items), page_size=100, prefetch=prefetch,
+                           cursor=cursor) == items
+    assert cursor.done and cursor.count == 1000
+
+
+TIME_MAP = [
+    {"season": 0, "tournament": -1, "day": 0, "type": "season",
+     "startTime": "2020-07-27T16:00:00Z", "endTime": "2020-07-27T17:00:00Z"},
+    {"season": 0, "tournament": -1, "day": 1, "type": "season",
+     "startTime": "2020-07-27T17:00:00Z", "endTime": "2020-07-27T18:00:00Z"},
+    {"season": 0, "tournament": -1, "day": 2, "type": "election",
+     "startTime": "2020-07-27T18:00:00Z", "endTime": "2020-07-27T19:00:00Z"},
+    {"season": 1, "tournament": 0, "day": 0, "type": "tournament",
+     "startTime": "2020-07-28T12:00:00Z", "endTime": None},
+]
+
+
+@pytest.fixture
+def time_map_session(monkeypatch):
+    session = FakeJSONSession({"/time/map": {"data": TIME_MAP}})
+    monkeypatch.setattr(chron.v1, "session", lambda cache_time: session)
+    monkeypatch.setattr(chron.v1, "cache_expiry", lambda expiry: expiry)
+    chron.v1._PARSED_TIME_DATA.clear()
+    yield session
+    chron.v1._PARSED_TIME_DATA.clear()
+
+
+def test_time_map_query(time_map_session):
+    assert [(x["season"], x["day"]) for x in chron.time_map(season=1)] == [(0, 0), (0, 1), (0, 2)]
+    assert [(x["season"], x["day"]) for x in chron.time_map(season=1, include_nongame=False)] == [(0, 0), (0, 1)]
+    assert [x["day"] for x in chron.time_map(season=1, day=2)] == [1]
+    assert [x["type"] for x in chron.time_map(day=1)] == ["season", "tournament"]
+    assert [x["tournament"] for x in chron.time_map(tournament=0)] == [0]
+    assert len(chron.time_map()) == 4
+    assert isinstance(chron.time_map(season=1)[0]["startTime"], datetime)
+
+    # Downloaded and parsed only once
+    assert len(time_map_session.requests) == 1
+
+
+def test_time_map_lookup(time_map_session):
+    time_map = chron.TimeMap.load()
+    assert time_map.lookup("2020-07-27T16:30:00Z")["day"] == 0
+    assert time_map.lookup(datetime(2020, 7, 27, 17))["day"] == 1
+    assert time_map.lookup("2020-07-27T18:30:00Z")["type"] == "election"
+    assert time_map.lookup("2020-07-27T18:30:00Z", include_nongame=False) is None
+    assert time_map.lookup("2020-07-28T06:00:00Z") is None
+    assert time_map.lookup("2020-08-28T06:00:00Z")["tournament"] == 0
+    assert time_map.lookup("2020-01-01T00:00:00Z") is None
@@ -0,0 +1,100 @@
+"""
+Unit Tests for columnar export of Chronicler data
+"""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+columnar = pytest.importorskip("blaseball_mike.chronicler.columnar")
+
+
+def game_update(game, season, day, inning, home_score, timestamp, **extra):
+    return {
+        "gameId": game,
+        "timestamp": timestamp,
+        "hash": f"{game}-{inning}",
+        "data": dict({
+            "_id": game,
+            "season": season,
+            "day": day,
+            "inning": inning,
+            "homeScore": home_score,
+            "baseRunners": [],
+            "state": {"holidayInning": False},
+        }, **extra),
+    }
+
+
+UPDATES = [
+    game_update("a", 11, 0, 1, 0, "2021-03-01T16:00:05.000Z"),
+    game_update("a", 11, 0, 2, 1.5, "2021-03-01T16:01:05.000Z", baseRunners=["p1"]),
+    game_update("b", 11, 1, 1, 2, "2021-03-01T17:00:05.000Z", outcomes=[{"text": "Incinerated"}]),
+    game_update("c", 12, 0, 1, 3, "2021-03-08T16:00:05.000Z"),
+]
+
+
+def test_flatten_record():
+    row = columnar.flatten_record(UPDATES[2])
+    assert row["id"] == "b"
+    assert row["game_id"] == "b"
+    assert row["home_score"] == 2
+    assert row["state__holiday_inning"] is False
+    assert row["outcomes"] == '[{"text":"Incinerated"}]'
+
+    assert columnar.flatten_record({"id": "x", "data": {"id": "y"}}) == {"id": "y", "chronicler_id": "x"}
+
+
+def test_to_table_types():
+    table = columnar.to_table(UPDATES)
+    assert table.num_rows == 4
+    assert table.schema.field("home_score").type == pa.float64()
+    assert table.schema.field("timestamp").type == pa.timestamp("us", tz="UTC")
+    assert table.schema.field("base_runners").type == pa.list_(pa.string())
+    assert table["outcomes"].to_pylist() == [None, None, '[{"text":"Incinerated"}]', None]
+
+
+def test_to_table_schema_merge():
+    first = columnar.to_table(UPDATES[:1])
+    assert first.schema.field("home_score").type == pa.int64()
+
+    second = columnar.to_table(UPDATES[1:2] + [game_update("d", 12, 1, "ninth", 0, "2021-03-08T17:00:05.000Z")],
+                               schema=first.schema)
+    assert second.schema.field("home_score").type == pa.float64()
+    assert second.schema.field("inning").type == pa.string()
+    assert second["inning"].to_pylist() == ["2", "ninth"]
+
+
+def test_parquet_roundtrip(tmp_path):
+    root = tmp_path / "updates"
+    schema = columnar.write_parquet(UPDATES[:2], root, batch_size=1)
+    columnar.write_parquet(UPDATES[2:], root, schema=schema)
+
+    assert sorted(p.name for p in root.iterdir()) == ["season=11", "season=12"]
+    table = columnar.read_parquet(root).sort_by([("timestamp", "ascending")])
+    assert table["game_id"].to_pylist() == ["a", "a", "b", "c"]
+    assert table["home_score"].to_pylist() == [0, 1.5, 2, 3]
+    assert table["outcomes"].to_pylist() == [None, None, '[{"text":"Incinerated"}]', None]
+
+    table = columnar.read_parquet(root, columns=["game_id"], filter=[("season", "=", 11), ("day", "=", 1)])
+    assert table["game_id"].to_pylist() == ["b"]
+
+
+def test_parquet_unpartitioned(tmp_path):
+    versions = [{"entityId": "p", "validFrom": "2021-03-01T00:00:00Z", "validTo": None, "data": {"name": "Test"}}]
+    columnar.write_parquet(versions, tmp_path, partition_cols=None)
+    table = columnar.read_parquet(tmp_path)
+    assert table["entity_id"].to_pylist() == ["p"]
+    assert table.schema.field("valid_from").type == pa.timestamp("us", tz="UTC")
+
+    with pytest.raises(ValueError):
+        columnar.write_parquet(versions, tmp_path)
+
+
+def test_parquet_widened_across_batches(tmp_path):
+    records = [{"x": 1, "y": 1}, {"x": "abc", "y": 2.5}, {"x": 2, "y": 3}]
+    columnar.write_parquet(records, tmp_path, partition_cols=None, batch_size=1)
+    table = columnar.read_parquet(tmp_path)
+    assert table.schema.field("x").type == pa.string()
+    assert table.schema.field("y").type == pa.float64()
+    assert sorted(table["x"].to_pylist()) == ["1", "2", "abc"]
+    assert sorted(table["y"].to_pylist()) == [1, 2.5, 3]
@@ -0,0 +1,89 @@
+"""
+Unit Tests for Blaseball API ID batching
+"""
+
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from blaseball_mike import database
+from .helpers import FakeResponse
+
+
+class FakeIdSession:
+    """
+    Serves an object per requested ID, recording each request's IDs and the peak number of concurrent requests
+    """
+    def __init__(self):
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None):
+        ids = parse_qs(urlsplit(url).query)["ids"][0].split(",")
+        with self.lock:
+            self.requests.append(ids)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return FakeResponse([{"id": id_, "name": f"Player {id_}"} for id_ in ids])
+
+
+@pytest.fixture
+def id_session(monkeypatch):
+    session = FakeIdSession()
+    monkeypatch.setattr(database, "session", lambda cache_time: session)
+    database.configure_id_batches(batch_size=10, max_workers=3)
+    yield session
+    database.configure_id_batches()
+
+
+def test_get_player_batches(id_session):
+    ids = [str(i) for i in range(95)]
+    players = database.get_player(ids)
+    assert list(players) == ids
+    assert players["42"]["name"] == "Player 42"
+    assert len(id_session.requests) == 10
+    assert max(len(x) for x in id_session.requests) == 10
+    assert id_session.peak == 3
+
+
+def test_get_items_batches(id_session):
+    ids = [str(i) for i in range(25)]
+    assert [x["id"] for x in database.get_items(ids + ids[:5])] == ids + ids[:5]
+    assert len(id_session.requests) == 3
+
+
+def test_get_player_duplicate_ids(id_session):
+    ids = [str(i) for i in range(25)]
+    assert list(database.get_player(ids + ids[:5])) == ids
+    assert sum(len(x) for x in id_session.requests) == 25
+
+
+@pytest.mark.parametrize("ids", ("a,b,c", ["a", "b", "c"], "a"))
+def test_get_by_ids_single_batch(id_session, ids):
+    assert list(database.get_game_statsheets(ids)) == list(ids.split(",") if isinstance(ids, str) else ids)
+    assert len(id_session.requests) == 1
+
+
+@pytest.mark.parametrize("ids", (3, None))
+def test_get_by_ids_scalar(monkeypatch, ids):
+    urls = []
+
+    class Session:
+        def get(self, url, params=None):
+            urls.append(url)
+            return FakeResponse([{"id": ids}])
+
+    monkeypatch.setattr(database, "session", lambda cache_time: Session())
+    assert database.get_blood(ids) == [{"id": ids}]
+    assert urls == [f"{database.BASE_URL}/database/blood?ids={ids}"]
+
+
+def test_configure_id_batches():
+    with pytest.raises(ValueError):
+        database.configure_id_batches(batch_size=0)
@@ -0,0 +1,308 @@
+"""
+Unit Tests for event stream handling
+"""
+
+import asyncio
+import copy
+import time
+
+import pytest
+from blaseball_mike import events
+
+
+def counter_frames(count):
+    frames = [{"value": {"count": 0}}]
+    frames.extend({"delta": [{"op": "replace", "path": "/count", "value": i}]} for i in range(1, count + 1))
+    return frames
+
+
+@pytest.fixture
+def fake_stream(monkeypatch):
+    """Serve a fixed list of frames instead of connecting, then fail with a parse error to end the stream"""
+    def use(frames, pause=0.0):
+        async def fake_frames(*args, **kwargs):
+            for frame in frames:
+                yield frame
+                await asyncio.sleep(pause)
+            await asyncio.sleep(0.01)
+            raise ValueError("End of recorded stream")
+
+        monkeypatch.setattr(events, "stream_frames", fake_frames)
+    return use
+
+
+async def drain(subscription, delay=0):
+    """Receive from a subscription until the stream ends"""
+    received = []
+    with pytest.raises(ValueError):
+        async for payload in subscription:
+            received.append(payload["count"])
+            await asyncio.sleep(delay)
+    return received
+
+
+def test_hub_fan_out(fake_stream):
+    fake_stream(counter_frames(5), pause=0.001)
+
+    async def run():
+        hub = events.StreamHub(on_parse_error='RAISE', copy_payloads=True)
+        subscribers = [hub.subscribe(maxsize=0) for _ in range(3)]
+        hub.start()
+        results = await asyncio.gather(*(drain(s) for s in subscribers))
+        await hub.close()
+        return results
+
+    assert asyncio.run(run()) == [[0, 1, 2, 3, 4, 5]] * 3
+
+
+@pytest.mark.parametrize(["policy", "expected"], [
+    ("drop_oldest", [8, 9, 10]),
+    ("drop_newest", [0, 1, 2]),
+    ("block", list(range(11))),
+])
+def test_hub_slow_subscriber(fake_stream, policy, expected):
+    fake_stream(counter_frames(10))
+
+    async def run():
+        hub = events.StreamHub(on_parse_error='RAISE', copy_payloads=True)
+        slow = hub.subscribe(maxsize=3, policy=policy)
+        fast = hub.subscribe(maxsize=0)
+        fast_task = asyncio.ensure_future(drain(fast))
+        hub.start()
+        if policy != 'block':
+            # Fall behind until the stream is over
+            await asyncio.wait([fast_task])
+        slow_received = await drain(slow, delay=0.001)
+        fast_received = await fast_task
+        await hub.close()
+        return fast_received, slow_received, slow.dropped
+
+    fast_received, slow_received, dropped = asyncio.run(run())
+    assert fast_received == list(range(11))
+    assert slow_received == expected
+    assert dropped == 11 - len(expected)
+
+
+def test_hub_close(fake_stream):
+    fake_stream(counter_frames(1000), pause=0.001)
+
+    async def run():
+        async with events.StreamHub(on_parse_error='RAISE', copy_payloads=True) as hub:
+            stuck = hub.subscribe(maxsize=1, policy='block')
+            listener = hub.subscribe(maxsize=0)
+            await asyncio.sleep(0.02)
+            # Closing a blocking subscriber that stopped reading lets the hub carry on
+            stuck.close()
+            await asyncio.sleep(0.02)
+            late = hub.subscribe(replay_latest=True)
+            assert late.qsize() == 1
+        received = [x["count"] async for x in listener]
+        return received, [x async for x in stuck], [x async for x in late]
+
+    received, stuck, late = asyncio.run(run())
+    assert received[:3] == [0, 1, 2]
+    assert len(received) > 10
+    assert stuck == []
+    assert late[0]["count"] <= received[-1]
+
+
+def test_subscribe_policy():
+    with pytest.raises(ValueError):
+        events.StreamHub().subscribe(policy='sometimes')
+
+
+def frame_source(frames, pause=0.0):
+    async def frames_():
+        for frame in frames:
+            yield frame
+            await asyncio.sleep(pause)
+    return frames_
+
+
+async def collect(source, **kwargs):
+    return [payload["count"] async for payload in events.stream_events(source=source, **kwargs)]
+
+
+def test_record_replay(tmp_path):
+    path = tmp_path / "counter.frames.gz"
+    frames = counter_frames(20)
+    with events.FrameRecorder(path, source=frame_source(frames, pause=0.005)) as recorder:
+        assert asyncio.run(collect(recorder)) == list(range(21))
+    assert recorder.count == 21
+
+    recorded = list(events.read_frames(path))
+    assert [frame for _, frame in recorded] == counter_frames(20)
+    assert recorded[0][0] == 0
+    assert recorded[-1][0] >= 0.09
+
+    assert asyncio.run(collect(events.ReplaySource(path, speed=None))) == list(range(21))
+
+    start = time.monotonic()
+    assert asyncio.run(collect(events.ReplaySource(path, speed=4))) == list(range(21))
+    assert recorded[-1][0] / 4 <= time.monotonic() - start < recorded[-1][0]
+
+
+def test_replay_resync(tmp_path):
+    """
+    After a delta fails to apply, deltas are skipped until the next full frame
+    """
+    path = tmp_path / "broken.frames.gz"
+    frames = counter_frames(3)
+    frames.insert(2, {"delta": [{"op": "remove", "path": "/missing"}]})
+    frames.extend([{"delta": [{"op": "replace", "path": "/count", "value": 99}]}, {"value": {"count": 10}}])
+    frames.extend({"delta": [{"op": "replace", "path": "/count", "value": i}]} for i in range(11, 13))
+    with events.FrameRecorder(path, source=frame_source(frames)) as recorder:
+        for frame in frames:
+            recorder.record(frame)
+
+    assert asyncio.run(collect(events.ReplaySource(path, speed=None), on_parse_error='SKIP')) == [0, 1, 10, 11, 12]
+    with pytest.raises(events.jsonpatch.JsonPatchConflict):
+        asyncio.run(collect(events.ReplaySource(path, speed=None), on_parse_error='RAISE'))
+
+
+def test_replay_speed():
+    with pytest.raises(ValueError):
+        events.ReplaySource("unused", speed=0)
+
+
+def test_checkpoint(tmp_path):
+    path = tmp_path / "stream.checkpoint.gz"
+    checkpoint = events.StreamCheckpoint(path, interval=3600)
+    assert checkpoint.load() is None
+    assert checkpoint.due()
+
+    checkpoint.save({"count": 5}, version=7)
+    assert not checkpoint.due()
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+    saved = events.StreamCheckpoint(path).load()
+    assert saved["data"] == {"count": 5}
+    assert saved["version"] == 7
+    assert saved["saved"] == checkpoint.saved
+
+    with events.gzip.open(path, 'wt') as f:
+        f.write('{"saved": 0, "version": 7, "sha256": "0"}\n{"count": 6}\n')
+    with pytest.raises(ValueError):
+        events.StreamCheckpoint(path).load()
+
+    with pytest.raises(ValueError):
+        events.StreamCheckpoint(path, interval=-1)
+
+
+def test_resume_from_checkpoint(tmp_path):
+    checkpoint = events.StreamCheckpoint(tmp_path / "stream.checkpoint.gz", interval=0)
+    assert asyncio.run(collect(frame_source(counter_frames(3)), checkpoint=checkpoint)) == [0, 1, 2, 3]
+
+    async def resume():
+        state = events.EventState()
+        stream = events.stream_events(source=frame_source(counter_frames(2), pause=0.01), state=state,
+                                      checkpoint=events.StreamCheckpoint(checkpoint.path))
+        first = await stream.__anext__()
+        resumed = first["count"], state.version, state.synced
+        return resumed, [first["count"]] + [payload["count"] async for payload in stream], state.synced
+
+    resumed, received, synced = asyncio.run(resume())
+    assert resumed == (3, 4, False)
+    assert received == [3, 0, 1, 2]
+    assert synced
+
+
+def test_rebuild_on_failed_delta():
+    frames = counter_frames(2)
+    frames.append({"delta": [{"op": "remove", "path": "/missing"}]})
+    calls = []
+
+    def source():
+        calls.append(None)
+        return frame_source(frames)() if len(calls) == 1 else slow_reconnect()
+
+    async def slow_reconnect():
+        # Reconnecting takes a while, so the rebuilt data arrives first
+        await asyncio.sleep(0.1)
+        yield {"value": {"count": 10}}
+        yield {"delta": [{"op": "replace", "path": "/count", "value": 11}]}
+
+    def rebuild(data):
+        assert data is None
+        return {"count": 50}
+
+    async def run():
+        state = events.EventState()
+        received = []
+        async for payload in events.stream_events(source=source, on_parse_error='SKIP', state=state, rebuild=rebuild):
+            received.append((payload["count"], state.synced))
+        return received
+
+    assert asyncio.run(run()) == [(0, True), (1, True), (2, True), (50, False), (10, True), (11, True)]
+
+
+def test_rebuild_from_api(monkeypatch):
+    requests = []
+
+    def get_games(season, day, cache_time=5):
+        requests.append((season, day))
+        return {f"game-{day}": {"id": f"game-{day}", "day": day - 1}}
+
+    monkeypatch.setattr(events.database, "get_simulation_data", lambda cache_time=5: {"season": 10, "day": 4})
+    monkeypatch.setattr(events.database, "get_games", get_games)
+
+    data = events.rebuild_from_api({"games": {"schedule": [], "standings": {"id": "s"}}, "leagues": {}})
+    assert requests == [(11, 5), (11, 6)]
+    assert data["games"]["sim"] == {"season": 10, "day": 4}
+    assert data["games"]["schedule"] == [{"id": "game-5", "day": 4}]
+    assert data["games"]["tomorrowSchedule"] == [{"id": "game-6", "day": 5}]
+    assert data["games"]["standings"] == {"id": "s"}
+    assert "leagues" in data
+
+
+@pytest.mark.parametrize("ops", [
+    [{"op": "replace", "path": "/games/0/score", "value": 2}, {"op": "add", "path": "/games/0/outs", "value": 1}],
+    [{"op": "add", "path": "/games/-", "value": {"score": 9}}, {"op": "replace", "path": "/games/2/score", "value": 8}],
+    # Cached containers are looked up again once they are replaced or moved
+    [{"op": "replace", "path": "/games/0/score", "value": 3}, {"op": "remove", "path": "/games/0"},
+     {"op": "replace", "path": "/games/0/score", "value": 4}],
+    [{"op": "replace", "path": "/games/1/runners/0", "value": "c"},
+     {"op": "add", "path": "/games/1", "value": {"runners": []}},
+     {"op": "add", "path": "/games/1/runners/0", "value": "d"},
+     {"op": "replace", "path": "/games/2/runners/1", "value": "e"}],
+    [{"op": "replace", "path": "/sim/day", "value": 5}, {"op": "replace", "path": "/sim", "value": {"day": 0}},
+     {"op": "replace", "path": "/sim/day", "value": 6}, {"op": "remove", "path": "/sim/day"}],
+    [{"op": "add", "path": "/a~1b/c~0d", "value": 1}, {"op": "replace", "path": "/a~1b/c~0d", "value": 2}],
+    # Other operations are passed on to jsonpatch
+    [{"op": "move", "from": "/games/0", "path": "/games/1"}, {"op": "replace", "path": "/games/0/score", "value": 7},
+     {"op": "test", "path": "/games/0/score", "value": 7}, {"op": "copy", "from": "/sim", "path": "/sim2"},
+     {"op": "replace", "path": "/sim2/day", "value": 1}],
+    [{"op": "replace", "path": "", "value": {"sim": {}}}, {"op": "add", "path": "/sim/day", "value": 2}],
+])
+def test_apply_patch(ops):
+    def document():
+        return {"games": [{"score": 0, "runners": []}, {"score": 1, "runners": ["a", "b"]}], "sim": {"day": 4},
+                "a/b": {}}
+
+    expected = events.jsonpatch.apply_patch(document(), copy.deepcopy(ops))
+    assert events.apply_patch(document(), copy.deepcopy(ops)) == expected
+
+    parents = {}
+    doc = document()
+    for op in copy.deepcopy(ops):
+        doc = events.apply_patch(doc, [op], parents)
+    assert doc == expected
+
+
+@pytest.mark.parametrize("op", [
+    {"op": "replace", "path": "/sim/missing", "value": 1},
+    {"op": "remove", "path": "/sim/missing"},
+    {"op": "replace", "path": "/games/2", "value": 1},
+    {"op": "add", "path": "/games/3", "value": 1},
+    {"op": "remove", "path": "/games/-"},
+    {"op": "replace", "path": "/games/01/score", "value": 1},
+    {"op": "replace", "path": "/games/2/score", "value": 1},
+    {"op": "replace", "path": "/missing/score", "value": 1},
+    {"op": "replace", "path": "/sim/day/value", "value": 1},
+    {"op": "replace", "path": "sim/day", "value": 1},
+])
+def test_apply_patch_errors(op):
+    doc = {"games": [{"score": 0}, {"score": 1}], "sim": {"day": 4}}
+    with pytest.raises(events._PARSE_ERRORS):
+        events.jsonpatch.apply_patch(doc, [op])
+    with pytest.raises(events._PARSE_ERRORS):
+        events.apply_patch(doc, [op])
@@ -0,0 +1,113 @@
+"""
+Unit Tests for vectorized player frames
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from blaseball_mike.frames import PlayerFrame
+from blaseball_mike.models import Player
+
+
+@pytest.fixture
+def players():
+    players = [Player.make_random(name=f"Player {i}", seed=i + 1) for i in range(50)]
+    # Provided ratings take precedence over calculated ones
+    players[0] = Player(dict(players[0].json(), hittingRating=0.123))
+    # Item ratings are added to player ratings
+    players[1] = Player(dict(players[1].json(), items=[
+        {"id": "a", "hittingRating": 0.1, "pitchingRating": -0.05, "baserunningRating": 0, "defenseRating": 0.2},
+        {"id": "b", "hittingRating": 0.02, "pitchingRating": 0, "baserunningRating": 0.3, "defenseRating": 0},
+    ]))
+    return players
+
+
+@pytest.mark.parametrize("build", ["players", "records", "versions"])
+def test_ratings(players, build):
+    """Frame ratings and stars match the per-player calculations"""
+    if build == "players":
+        frame = PlayerFrame.from_players(players)
+    elif build == "records":
+        frame = PlayerFrame.from_records([p.json() for p in players])
+    else:
+        frame = PlayerFrame.from_versions([{"entityId": p.id, "validFrom": "2021-03-01T00:00:00Z", "data": p.json()}
+                                           for p in players])
+
+    assert frame.ids == [p.id for p in players]
+    for name in ("hitting", "pitching", "baserunning", "defense"):
+        for include_items in (True, False):
+            ratings = getattr(frame, f"get_{name}_rating")(include_items=include_items)
+            expected = [getattr(p, f"get_{name}_rating")(include_items=include_items) for p in players]
+            assert ratings.tolist() == pytest.approx(expected)
+
+        stars = getattr(frame, f"get_{name}_stars")(round_stars=True)
+        assert stars.tolist() == [getattr(p, f"get_{name}_stars")(round_stars=True) for p in players]
+        stars = getattr(frame, f"get_{name}_stars")()
+        assert stars.tolist() == pytest.approx([getattr(p, f"get_{name}_stars")() for p in players])
+
+    assert frame.hitting_rating[0] == 0.123
+    assert frame.ratings()["hitting_rating"][1] == pytest.approx(players[1].get_hitting_rating())
+
+
+def test_missing_stlats():
+    """Missing stlats produce NaN rather than raising"""
+    frame = PlayerFrame.from_records([{"id": "a", "unthwackability": 0.5}, {"id": "b", "hittingRating": 0.5}])
+    assert np.isnan(frame.pitching_rating).all()
+    assert np.isnan(frame.hitting_rating[0])
+    assert frame.by_id(frame.hitting_rating)["b"] == 0.5
+
+
+def test_vibes(players):
+    """Vibe curves match the per-player calculation"""
+    players.append(Player({"id": "no-vibes", "pressurization": 0.5, "cinnamon": 0, "buoyancy": 0.5}))
+    frame = PlayerFrame.from_players(players)
+    days = range(1, 100)
+    vibes = frame.get_vibes(days)
+    assert vibes.shape == (len(players), len(days))
+
+    for row, player in zip(vibes, players):
+        expected = [player.get_vibe(day) for day in days]
+        if expected[0] is None:
+            assert np.isnan(row).all()
+        else:
+            assert row.tolist() == expected
+
+    assert frame.get_vibes(1)[:, 0].tolist() == pytest.approx([p.get_vibe(1) or np.nan for p in players],
+                                                              nan_ok=True)
+
+
+SCENARIOS = [
+    {"multipliers": {"overall_rating": 0.2, "patheticism": 0.01, "cinnamon": 6.9}},
+    {"buffs": {"batting_rating": -2.0, "patheticism": -0.99, "baseThirst": 0.1}},
+    {"buffs": {"pitching_rating": 0.05}, "multipliers": {"defense_rating": -0.1}},
+    {"overrides": {"moxie": 0.5, "tragicness": 0.1}},
+]
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_simulate(players, scenario):
+    """Simulated frames match simulated player copies"""
+    frame = PlayerFrame.from_players(players).simulate(**scenario)
+    copies = [p.simulated_copy(**scenario) for p in players]
+    for name in ("hitting", "pitching", "baserunning", "defense"):
+        assert getattr(frame, f"get_{name}_rating")().tolist() == \
+            pytest.approx([getattr(p, f"get_{name}_rating")() for p in copies])
+
+
+def test_simulate_reroll():
+    """Rerolls are reproducible with a seed and stay within the reroll bounds"""
+    frame = PlayerFrame.from_players([Player.make_random(seed=i + 1) for i in range(100)])
+    first = frame.simulate(reroll={"batting_rating": True}, seed=7)
+    second = frame.simulate(reroll={"batting_rating": True}, seed=7)
+    assert first["moxie"].tolist() == second["moxie"].tolist()
+    assert ((first["moxie"] >= 0.01) & (first["moxie"] <= 0.99)).all()
+    assert first["coldness"].tolist() == frame["coldness"].tolist()
+
+
+def test_simulate_scenarios(players):
+    frame = PlayerFrame.from_players(players)
+    results = frame.simulate_scenarios(SCENARIOS)
+    assert results["hitting_rating"].shape == (len(SCENARIOS), len(players))
+    assert results["pitching_rating"][2].tolist() == pytest.approx(
+        frame.simulate(**SCENARIOS[2]).get_pitching_rating().tolist())
@@ -0,0 +1,84 @@
+"""
+Unit Tests for request metrics
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from blaseball_mike import metrics, session
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status = 500 if self.path.startswith("/error") else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.delenv("BLASEBALL_MIKE_NOCACHE", raising=False)
+    session.configure_cache(backend="memory")
+    metrics.reset()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    session.configure_cache(backend="memory")
+    metrics.reset()
+
+
+def test_request_metrics(server):
+    s = session.session(60)
+    with metrics.record_requests() as trace:
+        s.get(f"{server}/database/players?ids=a")
+        s.get(f"{server}/database/players?ids=a")
+        s.get(f"{server}/error")
+
+    assert [(x.endpoint, x.status, x.from_cache) for x in trace] == [
+        ("/database/players", 200, False),
+        ("/database/players", 200, True),
+        ("/error", 500, False),
+    ]
+    assert trace[0].size == len(b'{"ok": true}')
+
+    stats = metrics.snapshot()
+    host = server.split("//")[1]
+    players = stats[(host, "/database/players")]
+    assert players["requests"] == 2
+    assert players["cache_hits"] == 1
+    assert players["bytes"] == 2 * len(b'{"ok": true}')
+    assert sum(players["latency_buckets"].values()) == 2
+    assert stats[(host, "/error")]["errors"] == 1
+
+
+def test_request_metrics_connection_error(server):
+    calls = []
+    metrics.add_callback(calls.append)
+    try:
+        with pytest.raises(requests.ConnectionError):
+            session.session(0).get("http://127.0.0.1:1/database/team")
+    finally:
+        metrics.remove_callback(calls.append)
+    assert calls[0].status is None
+    assert calls[0].error == "ConnectionError"
+    assert metrics.snapshot()[("127.0.0.1:1", "/database/team")]["errors"] == 1
+
+
+def test_prometheus(server):
+    session.session(60).get(f"{server}/database/players")
+    text = metrics.to_prometheus()
+    assert "# TYPE blaseball_mike_request_duration_seconds histogram" in text
+    assert 'endpoint="/database/players",cache="miss"} 1' in text
+    assert 'endpoint="/database/players",le="+Inf"} 1' in text
+    assert 'blaseball_mike_request_duration_seconds_count{host="' in text
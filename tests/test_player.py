@@ -305,6 +305,19 @@ class TestPlayer(TestBase):
         player = Player(player_data)
         assert player.soulscream == scream
 
+    def test_soulscreams(self):
+        """Test bulk soulscreams match individual soulscreams, including undefined and collapsed souls"""
+        players = [Player.make_random(name=f"Screamer {i}", seed=i + 1) for i in range(5)]
+        players[0].soul = 400
+        players[1].soul = 0
+        screams = Player.get_soulscreams(players)
+        assert list(screams.keys()) == [p.id for p in players]
+        for p in players:
+            assert screams[p.id] == p.soulscream
+        assert screams[players[0].id].endswith("... (CONT. FOR 100 SOUL)")
+        assert screams[players[1].id] == ""
+        assert Player.get_soulscreams(players[:1], collapse=False)[players[0].id].endswith("undefined")
+
     def test_vibes_bounded(self, player_vibe):
         """Test that vibe equation produces correct results"""
         for day in range(1, 100):
@@ -0,0 +1,174 @@
+"""
+Unit Tests for client-side rate limiting
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from blaseball_mike import ratelimit, session
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active -= 1
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.delenv("BLASEBALL_MIKE_NOCACHE", raising=False)
+    session.configure_cache(backend="memory")
+    SlowHandler.peak = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    ratelimit.clear_rate_limits()
+    session.configure_cache(backend="memory")
+
+
+def test_rate_limit_lookup():
+    try:
+        ratelimit.configure_rate_limit("https://api.example", rate=5)
+        ratelimit.configure_rate_limit("https://api.example/v2", max_in_flight=2)
+        assert ratelimit.rate_limit_for("https://api.example/v2/entities").max_in_flight == 2
+        assert ratelimit.rate_limit_for("https://api.example/v1/players").rate == 5
+        assert ratelimit.rate_limit_for("https://other.example/") is None
+
+        ratelimit.configure_rate_limit("https://api.example")
+        assert ratelimit.rate_limit_for("https://api.example/v1/players") is None
+    finally:
+        ratelimit.clear_rate_limits()
+
+    with pytest.raises(ValueError):
+        ratelimit.RateLimit(rate=0)
+
+
+def test_token_bucket():
+    limit = ratelimit.RateLimit(rate=20, burst=2)
+    start = time.monotonic()
+    for _ in range(6):
+        with limit.limit():
+            pass
+    # Two requests from the burst, then one every 50ms
+    assert 0.18 < time.monotonic() - start < 0.5
+
+
+def test_token_bucket_lock_file(tmp_path):
+    path = str(tmp_path / "bucket.lock")
+    # Separate limiters sharing a lock file behave as one bucket, as separate processes would
+    limiters = [ratelimit.RateLimit(rate=20, burst=1, lock_file=path) for _ in range(2)]
+    start = time.monotonic()
+    for i in range(6):
+        limiters[i % 2].acquire()
+        limiters[i % 2].release()
+    assert 0.23 < time.monotonic() - start < 0.6
+
+
+def test_rate_limit_waiting_for_slot():
+    """
+    Callers waiting for an in-flight slot don't take tokens, so they can't all send at once when slots free up
+    """
+    limit = ratelimit.RateLimit(rate=10, burst=1, max_in_flight=1)
+    starts = []
+
+    def request(hold):
+        with limit.limit():
+            starts.append(time.monotonic())
+            time.sleep(hold)
+
+    threads = [threading.Thread(target=request, args=(0.3 if i == 0 else 0,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    assert all(b - a >= 0.09 for a, b in zip(starts, starts[1:]))
+
+
+def test_lock_file_async_does_not_block(tmp_path):
+    """
+    Waiting for another process to release the lock file doesn't block the event loop
+    """
+    fcntl = pytest.importorskip("fcntl")
+    path = str(tmp_path / "bucket.lock")
+    limit = ratelimit.RateLimit(rate=20, lock_file=path)
+
+    async def run():
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(tick())
+        async with limit.limit_async():
+            pass
+        ticker.cancel()
+        return ticks
+
+    with open(path, "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        timer = threading.Timer(0.2, fcntl.flock, (f, fcntl.LOCK_UN))
+        timer.start()
+        ticks = asyncio.run(run())
+        timer.join()
+    assert len(ticks) > 5
+
+
+def test_session_max_in_flight(server):
+    ratelimit.configure_rate_limit(server, max_in_flight=2)
+    s = session.session(0)
+    threads = [threading.Thread(target=s.get, args=(f"{server}/players?ids={i}",)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert SlowHandler.peak == 2
+
+
+def test_session_cache_hits_not_limited(server):
+    ratelimit.configure_rate_limit(server, rate=2, burst=1)
+    s = session.session(60)
+    s.get(f"{server}/players")
+    start = time.monotonic()
+    for _ in range(5):
+        assert s.get(f"{server}/players").from_cache
+    assert time.monotonic() - start < 0.3
+
+
+def test_aio_max_in_flight(server):
+    aio = pytest.importorskip("blaseball_mike.aio")
+    ratelimit.configure_rate_limit(server, max_in_flight=3)
+
+    async def run():
+        try:
+            await asyncio.gather(*(aio._fetch(f"{server}/players", {"ids": str(i)}) for i in range(9)))
+        finally:
+            await aio.close()
+
+    asyncio.run(run())
+    assert SlowHandler.peak == 3
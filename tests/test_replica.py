@@ -0,0 +1,102 @@
+"""
+Unit Tests for the local Chronicler replica
+"""
+
+import pytest
+import types
+from blaseball_mike.chronicler import replica, v2
+
+VERSIONS = [
+    {"entityId": "a", "hash": "a1", "validFrom": "2021-01-01T00:00:00Z", "validTo": None, "data": {"id": "a", "v": 1}},
+    {"entityId": "b", "hash": "b1", "validFrom": "2021-01-01T00:00:00.5Z", "validTo": None, "data": {"id": "b", "v": 1}},
+    {"entityId": "a", "hash": "a2", "validFrom": "2021-01-02T00:00:00.123456Z", "validTo": None, "data": {"id": "a", "v": 2}},
+    {"entityId": "a", "hash": "a3", "validFrom": "2021-01-03T00:00:00Z", "validTo": None, "data": {"id": "a", "v": 3}},
+]
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    """
+    Fake Chronicler that only knows about the first `available` versions
+    """
+    state = {"available": 3, "requests": []}
+
+    def get_versions(type_, after=None, **kwargs):
+        state["requests"].append(after)
+        visible = VERSIONS[:state["available"]]
+        if after is not None:
+            after = replica._normalize_timestamp(after)
+            visible = [v for v in visible if replica._normalize_timestamp(v["validFrom"]) > after]
+        return iter([dict(v) for v in visible])
+
+    monkeypatch.setattr(v2, "get_versions", get_versions)
+    return state
+
+
+@pytest.fixture
+def local(tmp_path):
+    with replica.Replica(str(tmp_path / "replica.sqlite")) as r:
+        yield r
+
+
+def test_incremental_sync(remote, local):
+    assert local.sync("player") == 3
+    assert local.types() == ["player"]
+
+    remote["available"] = 4
+    assert local.sync("player") == 1
+    assert remote["requests"] == [None, "2021-01-02T00:00:00.123455Z"]
+    assert local.sync("player") == 0
+
+
+def test_interrupted_sync(monkeypatch, local):
+    """
+    A sync that stops between versions sharing a timestamp picks up the rest next time
+    """
+    versions = VERSIONS[:2] + [
+        {"entityId": entity, "hash": entity, "validFrom": "2021-01-05T00:00:00Z", "validTo": None, "data": {}}
+        for entity in "cde"
+    ]
+
+    def get_versions(type_, after=None, **kwargs):
+        after = replica._normalize_timestamp(after) if after else ""
+        for version in versions:
+            if replica._normalize_timestamp(version["validFrom"]) > after:
+                if version["entityId"] == "d" and not after:
+                    raise ConnectionError("Interrupted")
+                yield dict(version)
+
+    monkeypatch.setattr(v2, "get_versions", get_versions)
+    with pytest.raises(ConnectionError):
+        local.sync("player", page_size=1)
+    assert [v["hash"] for v in local.get_versions("player")] == ["a1", "b1", "c"]
+
+    assert local.sync("player", page_size=1) == 2
+    assert [v["hash"] for v in local.get_versions("player")] == ["a1", "b1", "c", "d", "e"]
+
+
+def test_get_versions(remote, local):
+    remote["available"] = 4
+    local.sync("player")
+
+    versions = local.get_versions("player", id_="a")
+    assert isinstance(versions, types.GeneratorType)
+    versions = list(versions)
+    assert [v["hash"] for v in versions] == ["a1", "a2", "a3"]
+    assert versions[0]["validTo"] == "2021-01-02T00:00:00.123456Z"
+    assert versions[-1]["validTo"] is None
+    assert versions[1]["data"] == {"id": "a", "v": 2}
+
+    assert [v["hash"] for v in local.get_versions("player", order="desc", count=2)] == ["a3", "a2"]
+    assert [v["hash"] for v in local.get_versions("player", after="2021-01-01T00:00:00Z")] == ["b1", "a2", "a3"]
+
+
+def test_get_entities(remote, local):
+    remote["available"] = 4
+    local.sync("player")
+
+    assert [v["hash"] for v in local.get_entities("player")] == ["a3", "b1"]
+    assert [v["hash"] for v in local.get_entities("player", at="2021-01-02T12:00:00Z")] == ["a2", "b1"]
+    assert [v["hash"] for v in local.get_entities("player", at="2021-01-01T00:00:00.1Z")] == ["a1"]
+    assert [v["hash"] for v in local.get_entities("player", id_=["b"])] == ["b1"]
+    assert list(local.get_entities("team")) == []
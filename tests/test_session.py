@@ -0,0 +1,78 @@
+"""
+Unit Tests for the HTTP session layer
+"""
+
+import io
+import os
+import pytest
+import requests
+import urllib3
+from blaseball_mike import session
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("BLASEBALL_MIKE_NOCACHE", raising=False)
+    session.configure_cache(backend="sqlite", cache_dir=str(tmp_path))
+    yield tmp_path
+    session.configure_cache(backend="memory")
+
+
+def test_persistent_cache_namespaces(cache_dir):
+    """
+    Each cache lifetime is stored in its own persistent namespace
+    """
+    short = session.session(5)
+    forever = session.session(None)
+
+    assert short is not forever
+    assert short is session.session(5)
+    assert os.path.exists(cache_dir / "expiry_5.sqlite")
+    assert os.path.exists(cache_dir / "forever.sqlite")
+
+
+def test_zero_expiry_not_persisted(cache_dir):
+    """
+    Uncached sessions do not create a persistent cache
+    """
+    session.session(0)
+    assert not os.listdir(cache_dir)
+
+
+def test_configure_resets_sessions(cache_dir):
+    """
+    Changing the cache configuration discards existing sessions
+    """
+    old = session.session(5)
+    session.configure_cache(backend="memory")
+    assert session.session(5) is not old
+
+
+def test_configure_keeps_unpassed_settings(cache_dir):
+    session.configure_cache(max_entries=5)
+    session.configure_cache(backend="memory")
+    assert session._CACHE_CONFIG["max_entries"] == 5
+    session.configure_cache(max_entries=None)
+    assert session._CACHE_CONFIG["max_entries"] is None
+
+
+def test_cache_pruned_on_write(cache_dir, monkeypatch):
+    """
+    A long-lived session keeps its cache near `max_entries`
+    """
+    def send(adapter, request, **kwargs):
+        response = requests.models.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response.headers["Content-Type"] = "application/json"
+        response.raw = urllib3.HTTPResponse(io.BytesIO(b"[]"), status=200, preload_content=False)
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    session.configure_cache(max_entries=20)
+    s = session.session(5)
+    for i in range(50):
+        s.get(f"https://example.com/{i}")
+    assert len(s.cache.responses) <= 22
+    assert s.get("https://example.com/49").from_cache
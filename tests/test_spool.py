@@ -0,0 +1,64 @@
+"""
+Unit Tests for spooling Chronicler results to disk
+"""
+
+import gzip
+
+import pytest
+import requests
+import blaseball_mike.chronicler as chron
+from blaseball_mike.models import Player
+from .helpers import FakePagedSession, FakeResponse
+
+
+@pytest.mark.parametrize("filename", ("items.ndjson", "items.ndjson.gz"))
+def test_spool_roundtrip(tmp_path, filename):
+    path = tmp_path / filename
+    items = [{"id": i, "name": f"item {i}"} for i in range(1000)]
+    data = chron.paged_get_lazy("http://chronicler", {}, FakePagedSession(items), page_size=100)
+    assert chron.write_ndjson(path, data) == 1000
+    assert list(chron.read_ndjson(path)) == items
+
+    with open(path, "rb") as f:
+        assert (f.read(2) == b"\x1f\x8b") == filename.endswith(".gz")
+
+
+def test_spool_resume(tmp_path):
+    """
+    An interrupted query can be resumed with its cursor and appended to the same file
+    """
+    class FailingSession(FakePagedSession):
+        def get(self, url, params=None):
+            if params.get("page") == "300":
+                return FakeResponse(None, status_code=404)
+            return super().get(url, params)
+
+    path = tmp_path / "items.ndjson.gz"
+    items = list(range(1000))
+    cursor = chron.PageCursor()
+    with pytest.raises(requests.HTTPError):
+        chron.write_ndjson(path, chron.paged_get_lazy("http://chronicler", {}, FailingSession(items), page_size=100,
+                                                      cursor=cursor))
+    assert cursor.count == 300
+
+    rest = chron.paged_get_lazy("http://chronicler", {}, FakePagedSession(items), page_size=100, cursor=cursor)
+    assert chron.write_ndjson(path, rest, append=True) == 700
+    assert list(chron.read_ndjson(path)) == items
+
+    with gzip.open(path, "rt") as f:
+        assert len(f.readlines()) == 1000
+
+
+def test_spool_models(tmp_path):
+    path = tmp_path / "versions.ndjson"
+    versions = [
+        {"entityId": "abc", "validFrom": "2021-03-01T00:00:00.000000Z", "data": {"id": "abc", "name": "Test Player"}},
+        {"entityId": "abc", "validFrom": "2021-03-02T00:00:00.000000Z", "data": {"id": "abc", "name": "Renamed"}},
+    ]
+    chron.write_ndjson(path, versions)
+    players = list(chron.read_ndjson(path, model=Player))
+    assert [p.name for p in players] == ["Test Player", "Renamed"]
+    assert players[1].timestamp == "2021-03-02T00:00:00.000000Z"
+
+    chron.write_ndjson(path, [{"id": "abc", "name": "Bare"}])
+    assert next(chron.read_ndjson(path, model=Player)).name == "Bare"
@@ -0,0 +1,159 @@
+"""
+Unit Tests for incremental stream model updates
+"""
+
+import asyncio
+import copy
+
+import pytest
+from blaseball_mike import events
+from blaseball_mike.stream_model import StreamData, StreamState
+from .helpers import load_stream_value
+
+
+@pytest.fixture(scope="module")
+def stream_value():
+    return load_stream_value()
+
+
+@pytest.fixture
+def state(stream_value):
+    return StreamState(copy.deepcopy(stream_value))
+
+
+def assert_matches_rebuild(state):
+    """The incrementally updated model matches one built from scratch"""
+    rebuilt = StreamData(copy.deepcopy(state.data))
+    assert state.model.games.schedule.fields == rebuilt.games.schedule.fields
+    assert state.model.games.schedule.games == rebuilt.games.schedule.games
+    assert state.model.leagues.teams == rebuilt.leagues.teams
+    assert state.model.leagues.divisions == rebuilt.leagues.divisions
+    assert state.model.fights.boss_fights == rebuilt.fights.boss_fights
+    assert state.model.games.sim.json() == rebuilt.games.sim.json()
+
+
+def test_full_value(state, stream_value):
+    assert len(state.model.games.schedule.games) == len(stream_value["games"]["schedule"])
+    changes = state.apply_value(copy.deepcopy(stream_value))
+    assert changes.full
+    assert changes.games == {g["id"] for g in stream_value["games"]["schedule"]}
+    assert_matches_rebuild(state)
+
+
+def test_game_update(state):
+    games = dict(state.model.games.schedule.games)
+    game_id = state.data["games"]["schedule"][3]["id"]
+    changes = state.apply_patch([
+        {"op": "replace", "path": "/games/schedule/3/homeScore", "value": 99},
+        {"op": "replace", "path": "/games/schedule/3/lastUpdate", "value": "Home run!"},
+    ])
+    assert changes.games == {game_id}
+    assert not changes.teams and not changes.sections and not changes.full
+
+    updated = state.model.games.schedule.games
+    assert updated[game_id].home_score == 99
+    assert updated[game_id].last_update == "Home run!"
+    assert all(updated[id_] is game for id_, game in games.items() if id_ != game_id)
+    assert_matches_rebuild(state)
+
+
+def test_schedule_changes(state):
+    games = dict(state.model.games.schedule.games)
+    schedule = state.data["games"]["schedule"]
+    removed, moved = schedule[0]["id"], schedule[5]["id"]
+    added = dict(copy.deepcopy(schedule[1]), id="new-game")
+    changes = state.apply_patch([
+        {"op": "replace", "path": "/games/schedule/5/inning", "value": 7},
+        {"op": "remove", "path": "/games/schedule/0"},
+        {"op": "add", "path": "/games/schedule/1", "value": added},
+    ])
+    assert changes.games == {removed, moved, "new-game"}
+    assert state.model.games.schedule.fields[1] == "new-game"
+    assert state.model.games.schedule.games[moved].json()["inning"] == 7
+    assert all(state.model.games.schedule.games[id_] is games[id_] for id_ in games.keys() - changes.games)
+    assert_matches_rebuild(state)
+
+
+def test_sections(state):
+    team_id = state.data["leagues"]["teams"][2]["id"]
+    changes = state.apply_patch([
+        {"op": "replace", "path": "/games/sim/day", "value": 12},
+        {"op": "replace", "path": "/leagues/teams/2/nickname", "value": "Testers"},
+        {"op": "add", "path": "/temporal/doc/zeta", "value": "hello"},
+    ])
+    assert changes.teams == {team_id}
+    assert changes.sections == {"games/sim", "temporal"}
+    assert state.model.games.sim.day == 12
+    assert state.model.leagues.teams[team_id].nickname == "Testers"
+    assert state.model.temporal["doc"]["zeta"] == "hello"
+
+    changes = state.apply_patch([{"op": "replace", "path": "/leagues/stats/communityChest/progress", "value": "0.50"}])
+    assert changes.sections == {"leagues"}
+    assert changes.teams == set(state.model.leagues.teams)
+    assert_matches_rebuild(state)
+
+
+def test_unmodeled_games_sections(state, monkeypatch):
+    """
+    Parts of the games section without models don't rebuild the schedule, and the sim is built once per frame
+    """
+    from blaseball_mike import stream_model
+    games = dict(state.model.games.schedule.games)
+    sims = []
+    monkeypatch.setattr(stream_model, "Sim", lambda *args: sims.append(args) or stream_model.StreamComponent(*args))
+
+    changes = state.apply_patch([
+        {"op": "replace", "path": "/games/tomorrowSchedule/0/homeOdds", "value": 0.5},
+        {"op": "replace", "path": "/games/standings/id", "value": "new-standings"},
+        {"op": "replace", "path": "/games/sim/day", "value": 12},
+        {"op": "replace", "path": "/games/sim/phase", "value": 2},
+    ])
+    assert changes.games == set()
+    assert changes.sections == {"games/tomorrowSchedule", "games/standings", "games/sim"}
+    assert all(state.model.games.schedule.games[id_] is game for id_, game in games.items())
+    assert len(sims) == 1
+    assert state.model.games.sim.day == 12
+
+
+def test_move_from_item(state):
+    """
+    The source of a move is found by its index before the move, even if the move removes that index
+    """
+    schedule = state.data["games"]["schedule"]
+    last = len(schedule) - 1
+    kept = copy.deepcopy(schedule[:2])
+    schedule[last]["replays"] = kept
+    changes = state.apply_patch([{"op": "move", "from": f"/games/schedule/{last}/replays", "path": "/games/schedule"}])
+    assert state.model.games.schedule.fields == [g["id"] for g in kept]
+    assert schedule[last]["id"] in changes.games
+    assert_matches_rebuild(state)
+
+
+def test_stream_events_state(monkeypatch, stream_value):
+    frames = [
+        {"value": copy.deepcopy(stream_value)},
+        {"delta": [{"op": "replace", "path": "/games/schedule/0/homeScore", "value": 4}]},
+        {"delta": [{"op": "replace", "path": "/games/schedule/0/homeScore", "value": 4}]},
+        {"delta": [{"op": "replace", "path": "/games/sim/day", "value": 3}]},
+    ]
+
+    async def fake_frames(*args, **kwargs):
+        for frame in frames:
+            yield frame
+
+    monkeypatch.setattr(events, "stream_frames", fake_frames)
+
+    async def run():
+        state = StreamState()
+        results = []
+        async for changes in events.stream_events(state=state):
+            results.append(changes)
+            if len(results) == 3:
+                break
+        return state, results
+
+    state, results = asyncio.run(run())
+    assert results[0].full
+    assert results[1].games == {stream_value["games"]["schedule"][0]["id"]}
+    assert results[2].sections == {"games/sim"}
+    assert state.model.games.sim.day == 3
@@ -0,0 +1,64 @@
+"""
+Unit Tests for the Chronicler version interval index
+"""
+
+import pytest
+from datetime import datetime, timezone
+from blaseball_mike.chronicler import v2
+from blaseball_mike.chronicler.version_index import VersionIndex
+from blaseball_mike.models import Player, Team
+
+VERSIONS = [
+    {"entityId": "a", "validFrom": "2021-01-02T00:00:00Z", "validTo": "2021-01-03T00:00:00Z", "data": {"id": "a", "v": 2}},
+    {"entityId": "a", "validFrom": "2021-01-01T00:00:00Z", "validTo": "2021-01-02T00:00:00Z", "data": {"id": "a", "v": 1}},
+    {"entityId": "b", "validFrom": "2021-01-01T12:00:00Z", "validTo": None, "data": {"id": "b", "v": 1}},
+]
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    requests = []
+
+    def get_versions(type_, **kwargs):
+        requests.append(dict(kwargs, type_=type_))
+        return iter(VERSIONS)
+
+    monkeypatch.setattr(v2, "get_versions", get_versions)
+    return requests
+
+
+def test_at():
+    index = VersionIndex(VERSIONS)
+    assert len(index) == 2
+    assert index.at("a", "2020-12-31T00:00:00Z") is None
+    assert index.at("a", "2021-01-01T00:00:00Z")["data"]["v"] == 1
+    assert index.at("a", "2021-01-02T00:00:00Z")["data"]["v"] == 2
+    assert index.at("a", datetime(2021, 1, 2, 12))["data"]["v"] == 2
+    assert index.at("a", "2021-01-03T00:00:00Z") is None  # Version ended
+    assert index.at("b", "2030-01-01T00:00:00Z")["data"]["v"] == 1
+    assert index.at("c", "2021-01-01T00:00:00Z") is None
+
+
+def test_entities_at():
+    index = VersionIndex(VERSIONS)
+    assert index.entities_at("2021-01-01T06:00:00Z").keys() == {"a"}
+    assert index.entities_at("2021-01-02T06:00:00Z").keys() == {"a", "b"}
+    assert index.entities_at("2021-01-02T06:00:00Z", ids=["b"]).keys() == {"b"}
+
+
+def test_player_load_at_times(remote):
+    times = ["2021-01-01T06:00:00Z", datetime(2021, 1, 2, 6, tzinfo=timezone.utc)]
+    result = Player.load_at_times(["a", "b"], times)
+
+    assert len(remote) == 1
+    assert remote[0]["type_"] == "player"
+    assert list(result.keys()) == times
+    assert result[times[0]].keys() == {"a"}
+    assert result[times[1]]["a"].v == 2
+    assert result[times[1]]["b"].timestamp == times[1]
+
+
+def test_team_load_at_times(remote):
+    result = Team.load_at_times(None, ["2021-01-02T06:00:00Z"])
+    assert remote[0]["type_"] == "team"
+    assert result["2021-01-02T06:00:00Z"].keys() == {"a", "b"}